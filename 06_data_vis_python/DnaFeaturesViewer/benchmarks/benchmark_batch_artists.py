@@ -0,0 +1,65 @@
+"""Compare plot(batch_artists=False) and plot(batch_artists=True): time to
+plot and save the figure, and size of the exported files.
+
+Run from the project's root with ``python benchmarks/benchmark_batch_artists.py``.
+"""
+
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from synthetic_records import random_record
+
+SIZES = [500, 2000, 5000]
+FORMATS = ["png", "svg", "pdf"]
+
+
+def render(record, fmt, batch_artists):
+    t0 = time.perf_counter()
+    ax, _ = record.plot(figure_width=15, batch_artists=batch_artists)
+    target = io.BytesIO()
+    ax.figure.savefig(target, format=fmt)
+    plt.close(ax.figure)
+    return time.perf_counter() - t0, len(target.getvalue())
+
+
+if __name__ == "__main__":
+    print(
+        "%9s %6s %15s %15s %15s %15s"
+        % (
+            "features",
+            "format",
+            "time (s)",
+            "batch time (s)",
+            "size (kB)",
+            "batch size (kB)",
+        )
+    )
+    for size in SIZES:
+        record = random_record(size)
+        for i, feature in enumerate(record.features):
+            if i % 50:  # only label a few features, this benchmarks arrows
+                feature.label = None
+        for fmt in FORMATS:
+            duration, file_size = render(record, fmt, batch_artists=False)
+            batch_duration, batch_file_size = render(record, fmt, batch_artists=True)
+            print(
+                "%9d %6s %15.2f %15.2f %15.1f %15.1f"
+                % (
+                    size,
+                    fmt,
+                    duration,
+                    batch_duration,
+                    file_size / 1000,
+                    batch_file_size / 1000,
+                )
+            )
@@ -0,0 +1,57 @@
+"""Compare the time to render many GenBank files with one fresh Python
+process per file (paying the Matplotlib/Biopython imports every time) and
+with ``render_records_files``, then re-run the batch to measure the skipping
+of unchanged files.
+
+Run from the project's root with ``python benchmarks/benchmark_batch_rendering.py``.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dna_features_viewer import render_records_files
+from synthetic_records import write_random_genbank
+
+N_FILES = 20
+WORKERS = max(2, os.cpu_count() or 1)
+SCRIPT = """
+import sys
+from dna_features_viewer import BiopythonTranslator
+import matplotlib.pyplot as plt
+ax, _ = BiopythonTranslator().translate_record(sys.argv[1]).plot(figure_width=10)
+ax.figure.savefig(sys.argv[2], bbox_inches="tight")
+"""
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        records_dir = os.path.join(directory, "records")
+        os.mkdir(records_dir)
+        for i in range(N_FILES):
+            path = os.path.join(records_dir, "record_%d.gb" % i)
+            write_random_genbank(path, 1, 30, 20000, seed=i)
+        env = dict(os.environ, PYTHONPATH=ROOT, MPLBACKEND="Agg")
+        t0 = time.perf_counter()
+        for name in os.listdir(records_dir):
+            target = os.path.join(directory, name + ".png")
+            command = [sys.executable, "-c", SCRIPT]
+            command += [os.path.join(records_dir, name), target]
+            subprocess.run(command, check=True, env=env)
+        loop_time = time.perf_counter() - t0
+        target_dir = os.path.join(directory, "plots")
+        report = render_records_files(records_dir, target_dir, workers=WORKERS)
+        rerun_report = render_records_files(records_dir, target_dir)
+    print("%d files" % N_FILES)
+    print("one process per file:   %6.2fs" % loop_time)
+    print(
+        "batch (%d workers):      %6.2fs (%.1f files/s)"
+        % (WORKERS, report["total_time"], report["throughput"])
+    )
+    print("batch, unchanged files: %6.2fs" % rerun_report["total_time"])
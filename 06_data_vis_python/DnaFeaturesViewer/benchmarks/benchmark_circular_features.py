@@ -0,0 +1,55 @@
+"""Compare the plotting of the features of a circular genome map with one
+ArrowWedge patch per feature (``plot_feature``) and as a single
+PathCollection of vectorized paths (``plot_features_batch``).
+
+Run from the project's root with
+``python benchmarks/benchmark_circular_features.py``.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from dna_features_viewer import CircularGraphicRecord
+from synthetic_records import random_features
+
+SIZES = [1000, 5000, 20000]
+
+
+def timed(record, features_levels, batch):
+    fig, ax = plt.subplots(1, figsize=(10, 10))
+    record.initialize_ax(ax, draw_line=True, with_ruler=False)
+    t0 = time.perf_counter()
+    if batch:
+        record.plot_features_batch(ax, features_levels)
+    else:
+        for feature, level in features_levels:
+            record.plot_feature(ax, feature, level)
+    plot_time = time.perf_counter() - t0
+    fig.canvas.draw()
+    total_time = time.perf_counter() - t0
+    plt.close(fig)
+    return plot_time, total_time
+
+
+if __name__ == "__main__":
+    print(
+        "%9s %14s %14s %14s %14s"
+        % ("features", "patches plot", "+ draw", "batch plot", "+ draw")
+    )
+    for size in SIZES:
+        features = random_features(size)
+        sequence_length = max(f.end for f in features)
+        record = CircularGraphicRecord(sequence_length, features)
+        features_levels = [(f, i % 10) for i, f in enumerate(features)]
+        times = timed(record, features_levels, batch=False)
+        times += timed(record, features_levels, batch=True)
+        print("%9d %13.3fs %13.3fs %13.3fs %13.3fs" % ((size,) + times))
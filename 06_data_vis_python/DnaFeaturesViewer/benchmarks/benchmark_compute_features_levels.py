@@ -0,0 +1,58 @@
+"""Benchmark compute_features_levels on records of increasing size.
+
+The quadratic edges builder previously used (all pairs of features tested with
+``overlaps_with``) is also timed, on the smaller records only.
+
+Run from the project's root with ``python benchmarks/benchmark_compute_features_levels.py``.
+"""
+
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dna_features_viewer.compute_features_levels import (
+    compute_features_levels,
+    find_overlapping_pairs,
+)
+from synthetic_records import random_features
+
+SIZES = [1000, 10000, 100000]
+REFERENCE_MAX_SIZE = 10000
+
+
+def quadratic_overlapping_pairs(features):
+    return [
+        (f1, f2)
+        for f1, f2 in itertools.combinations(features, 2)
+        if f1.overlaps_with(f2)
+    ]
+
+
+def timed(function, *args):
+    t0 = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    print(
+        "%9s %10s %12s %12s %14s"
+        % ("features", "overlaps", "sweep (s)", "levels (s)", "quadratic (s)")
+    )
+    for size in SIZES:
+        features = random_features(size)
+        pairs, sweep_time = timed(find_overlapping_pairs, features)
+        _, levels_time = timed(compute_features_levels, features)
+        quadratic_time = "-"
+        if size <= REFERENCE_MAX_SIZE:
+            reference, duration = timed(quadratic_overlapping_pairs, features)
+            assert len(reference) == len(pairs)
+            quadratic_time = "%.3f" % duration
+        print(
+            "%9d %10d %12.3f %12.3f %14s"
+            % (size, len(pairs), sweep_time, levels_time, quadratic_time)
+        )
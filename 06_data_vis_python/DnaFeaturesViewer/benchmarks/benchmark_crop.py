@@ -0,0 +1,63 @@
+"""Compare the throughput of GraphicRecord.crop when features are copied with
+deepcopy (previous behaviour) and with GraphicFeature.clone.
+
+Every feature carries Biopython-like qualifiers and a parent feature in its
+data, and one feature in a hundred also carries a Matplotlib Text, like the
+pseudo-features created for the annotations in ``plot()``.
+
+Run from the project's root with ``python benchmarks/benchmark_crop.py``.
+"""
+
+import os
+import sys
+import time
+from copy import deepcopy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from dna_features_viewer import GraphicFeature
+from synthetic_records import random_record
+
+N_FEATURES = 10000
+N_WINDOWS = 20
+
+
+class DeepcopiedFeature(GraphicFeature):
+    def clone(self):
+        return deepcopy(self)
+
+
+def crop_throughput(record):
+    """Return the number of features cropped per second."""
+    window_size = record.sequence_length // N_WINDOWS
+    n_cropped = 0
+    t0 = time.perf_counter()
+    for start in range(0, record.sequence_length - window_size, window_size):
+        n_cropped += len(record.crop((start, start + window_size)).features)
+    return n_cropped / (time.perf_counter() - t0)
+
+
+if __name__ == "__main__":
+    fig, ax = plt.subplots(1)
+    record = random_record(N_FEATURES, max_feature_length=50000)
+    for i, feature in enumerate(record.features):
+        feature.data.update(
+            qualifiers={"label": [feature.label], "note": 10 * ["some note"]},
+            feature=GraphicFeature(start=feature.start, end=feature.end),
+        )
+        if i % 100 == 0:
+            feature.data["text"] = ax.text(0, 0, feature.label)
+    clone_throughput = crop_throughput(record)
+    for feature in record.features:
+        feature.__class__ = DeepcopiedFeature
+    deepcopy_throughput = crop_throughput(record)
+    print("%d features, %d windows" % (N_FEATURES, N_WINDOWS))
+    print("deepcopy: %10.0f features cropped per second" % deepcopy_throughput)
+    print("clone:    %10.0f features cropped per second" % clone_throughput)
+    print("speedup:  %10.1fx" % (clone_throughput / deepcopy_throughput))
@@ -0,0 +1,77 @@
+"""Benchmark compute_features_levels on read pileups (dense overlapping
+features), against the previous level assignment, which tested all the
+neighbors of a feature at every candidate level.
+
+Run from the project's root with
+``python benchmarks/benchmark_features_levels_pileup.py``.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dna_features_viewer.compute_features_levels import (
+    compute_features_levels,
+    find_overlapping_pairs,
+    Graph,
+)
+from synthetic_records import random_pileup
+
+SIZES = [1000, 3000, 6000]
+
+
+def previous_compute_features_levels(features):
+    graph = Graph(features, find_overlapping_pairs(features))
+    levels = {n: n.data.get("fixed_level", None) for n in graph.nodes}
+
+    def collision(node, level):
+        nlines = node.data.get("nlines", 1)
+        for neighbor in graph.neighbors[node]:
+            neighbor_level = levels[neighbor]
+            if neighbor_level is None:
+                continue
+            neighbor_lines = neighbor.data.get("nlines", 1)
+            if abs(level - neighbor_level) < 0.5 * (nlines + neighbor_lines):
+                return True
+        return False
+
+    for node in sorted(graph.nodes, key=lambda f: -f.length):
+        if levels[node] is None:
+            level = 0
+            while collision(node, level):
+                level += 0.5
+            levels[node] = level
+    return levels
+
+
+def timed(function, *args):
+    t0 = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    print(
+        "%8s %10s %12s %12s %9s"
+        % ("features", "max level", "previous", "new", "speedup")
+    )
+    for size in SIZES:
+        features = random_pileup(size)
+        previous_levels, previous_time = timed(
+            previous_compute_features_levels, features
+        )
+        levels, new_time = timed(compute_features_levels, features)
+        assert levels == previous_levels
+        print(
+            "%8d %10.1f %11.3fs %11.3fs %8.1fx"
+            % (
+                size,
+                max(levels.values()),
+                previous_time,
+                new_time,
+                previous_time / new_time,
+            )
+        )
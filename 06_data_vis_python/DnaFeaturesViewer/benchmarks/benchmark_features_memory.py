@@ -0,0 +1,108 @@
+"""Compare the memory used by a list of GraphicFeatures and by a
+GraphicFeatureArray holding the same features, and the time taken by
+GraphicRecord.crop in both cases.
+
+The memory is measured after building the features, and again after a full
+``record.plot()`` (without level of detail, the figure being then closed), to
+check that plotting doesn't leave one GraphicFeature per row alive. The
+labels of the features narrower than LABEL_PIXEL_THRESHOLD pixels (here, all
+features) are not drawn, so that the plot doesn't take minutes.
+
+Run from the project's root with ``python benchmarks/benchmark_features_memory.py``.
+"""
+
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from dna_features_viewer import GraphicFeature, GraphicFeatureArray, GraphicRecord
+
+N_FEATURES = 100000
+SEQUENCE_LENGTH = 5000000
+COLORS = ["#ffd700", "#ffcccc", "#cffccc", "#ccccff"]
+LABEL_PIXEL_THRESHOLD = 50
+
+
+def random_columns(n_features, seed=123):
+    rng = random.Random(seed)
+    starts = [rng.randint(0, SEQUENCE_LENGTH - 1000) for _ in range(n_features)]
+    return dict(
+        starts=starts,
+        ends=[start + rng.randint(1, 1000) for start in starts],
+        strands=[rng.choice([-1, 1]) for _ in range(n_features)],
+        labels=["variant %d" % (i % 1000) for i in range(n_features)],
+        colors=[rng.choice(COLORS) for _ in range(n_features)],
+    )
+
+
+def build_list(columns):
+    return [
+        GraphicFeature(start=start, end=end, strand=strand, label=label, color=color)
+        for start, end, strand, label, color in zip(
+            columns["starts"],
+            columns["ends"],
+            columns["strands"],
+            columns["labels"],
+            columns["colors"],
+        )
+    ]
+
+
+def build_array(columns):
+    return GraphicFeatureArray(**columns)
+
+
+def measure(builder, columns):
+    plt.figure()  # imports and sets up pyplot before measuring the memory
+    plt.close("all")
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    features = builder(columns)
+    build_time = time.perf_counter() - t0
+    memory, _ = tracemalloc.get_traced_memory()
+    record = GraphicRecord(sequence_length=SEQUENCE_LENGTH, features=features)
+    t0 = time.perf_counter()
+    for start in range(0, SEQUENCE_LENGTH, SEQUENCE_LENGTH // 50):
+        record.crop((start, start + SEQUENCE_LENGTH // 50))
+    crop_time = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    ax, _ = record.plot(
+        figure_width=10,
+        batch_artists=True,
+        label_pixel_threshold=LABEL_PIXEL_THRESHOLD,
+    )
+    plot_time = time.perf_counter() - t0
+    plt.close(ax.figure)
+    del ax, _
+    gc.collect()
+    memory_after_plot, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return memory, memory_after_plot, build_time, crop_time, plot_time
+
+
+if __name__ == "__main__":
+    columns = random_columns(N_FEATURES)
+    print("%d features" % N_FEATURES)
+    headers = (
+        "memory (MB)", "after plot (MB)", "build (s)", "50 crops (s)", "plot (s)"
+    )
+    print("%22s %12s %18s %10s %13s %9s" % (("",) + headers))
+    for name, builder in [
+        ("list of features", build_list),
+        ("GraphicFeatureArray", build_array),
+    ]:
+        memory, memory_after_plot, *times = measure(builder, columns)
+        print(
+            "%22s %12.1f %18.1f %10.3f %13.3f %9.1f"
+            % ((name, memory / 1e6, memory_after_plot / 1e6) + tuple(times))
+        )
@@ -0,0 +1,110 @@
+"""Measure the time saved by sharing an AxGeometry between the steps of a plot,
+rather than querying the ax's window extent (and the canvas renderer) for
+every feature and label.
+
+For each record size, the features are plotted one by one with
+``plot_feature`` and the labels are placed with ``place_annotation``, first
+without geometry (each call computes the geometry from the ax), then with a
+shared AxGeometry, whose ``stats`` give the number of geometry queries and of
+actual computations. As these timings are dominated by the creation of the
+Matplotlib artists, the time spent in the geometry queries alone is also
+given for both methods. The full ``plot()`` time is given for reference.
+
+Run from the project's root with
+``python benchmarks/benchmark_geometry_context.py``.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from dna_features_viewer import AxGeometry, PlotGeometry
+from synthetic_records import random_record
+
+SIZES = [200, 1000, 3000]
+
+
+def plot_features_and_labels(record, features_levels, shared_geometry):
+    """Return the time spent plotting the features and labels, and the
+    geometry (None if not shared)."""
+    fig, ax = plt.subplots(1, figsize=(10, 3))
+    record.initialize_ax(ax, draw_line=True, with_ruler=True)
+    geometry = AxGeometry(ax) if shared_geometry else None
+    t0 = time.perf_counter()
+    for feature, level in features_levels:
+        record.plot_feature(ax, feature, level, geometry=geometry)
+        record.place_annotation(
+            feature,
+            ax,
+            level,
+            annotate_inline=True,
+            max_line_length=30,
+            max_label_length=50,
+            geometry=geometry,
+        )
+    duration = time.perf_counter() - t0
+    plt.close(fig)
+    return duration, geometry
+
+
+def geometry_queries_time(n_queries, shared_geometry):
+    """Return the time spent in ``n_queries`` queries of the ax's width."""
+    fig, ax = plt.subplots(1, figsize=(10, 3))
+    geometry = AxGeometry(ax)
+    t0 = time.perf_counter()
+    for _ in range(n_queries):
+        if shared_geometry:
+            geometry.ax_width
+        else:
+            PlotGeometry.from_ax(ax).ax_width
+    duration = time.perf_counter() - t0
+    plt.close(fig)
+    return duration
+
+
+if __name__ == "__main__":
+    print(
+        "%9s %10s %10s %9s %9s %10s %10s %10s"
+        % (
+            "features",
+            "per-call",
+            "shared",
+            "queries",
+            "updates",
+            "q.per-call",
+            "q.shared",
+            "plot()",
+        )
+    )
+    for size in SIZES:
+        record = random_record(size)
+        features_levels = [(f, i % 10) for i, f in enumerate(record.features)]
+        plot_features_and_labels(record, features_levels, True)  # warms caches
+        old_time, _ = plot_features_and_labels(record, features_levels, False)
+        new_time, geometry = plot_features_and_labels(record, features_levels, True)
+        n_queries = geometry.stats["queries"]
+        t0 = time.perf_counter()
+        ax, _ = record.plot(figure_width=10)
+        plot_time = time.perf_counter() - t0
+        plt.close(ax.figure)
+        print(
+            "%9d %9.3fs %9.3fs %9d %9d %9.3fs %9.3fs %9.3fs"
+            % (
+                size,
+                old_time,
+                new_time,
+                n_queries,
+                geometry.stats["updates"],
+                geometry_queries_time(n_queries, shared_geometry=False),
+                geometry_queries_time(n_queries, shared_geometry=True),
+                plot_time,
+            )
+        )
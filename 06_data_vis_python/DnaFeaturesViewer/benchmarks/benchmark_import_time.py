@@ -0,0 +1,74 @@
+"""Measure the time of ``import dna_features_viewer`` in fresh processes, and
+list the slowest modules it imports (from ``python -X importtime``).
+
+The heavy dependencies (Bokeh, Biopython, bcbio-gff, matplotlib.pyplot and
+matplotlib.figure, the PDF backend) are only imported when used, so they
+should not appear in the list. With ``--max-time SECONDS``, the script exits
+with an error if the median import time is above the threshold, which can be
+used to catch import-time regressions.
+
+Run from the project's root with ``python benchmarks/benchmark_import_time.py``.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+N_RUNS = 7
+LAZY_MODULES = [
+    "bokeh",
+    "pandas",
+    "Bio",
+    "BCBio",
+    "matplotlib.pyplot",
+    "matplotlib.figure",
+    "matplotlib.backends.backend_pdf",
+]
+SCRIPT = """
+import sys, time
+t0 = time.perf_counter()
+import dna_features_viewer
+print(time.perf_counter() - t0)
+print(",".join(m for m in %s if m in sys.modules))
+""" % (LAZY_MODULES,)
+
+
+def import_time():
+    """Return the import time in a fresh process, and the lazy modules which
+    were imported anyway."""
+    output = subprocess.check_output([sys.executable, "-c", SCRIPT], cwd=PROJECT_ROOT)
+    duration, modules = output.decode().split("\n")[:2]
+    return float(duration), [m for m in modules.split(",") if m]
+
+
+def slowest_imports(n=8):
+    """Return the (cumulative time, name) of the top-level packages (numpy,
+    matplotlib...) which take the most time to import with the package."""
+    command = [sys.executable, "-X", "importtime", "-c", "import dna_features_viewer"]
+    process = subprocess.run(command, cwd=PROJECT_ROOT, stderr=subprocess.PIPE)
+    times = []
+    for line in process.stderr.decode().splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        if "." not in name and not name.startswith("_"):
+            times.append((int(cumulative) / 1e6, name))
+    return sorted(times, reverse=True)[:n]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--max-time", type=float, default=None)
+    args = parser.parse_args()
+    durations, modules = zip(*[import_time() for _ in range(N_RUNS)])
+    median = statistics.median(durations)
+    print("import dna_features_viewer: %.3fs (median of %d)" % (median, N_RUNS))
+    print("slowest packages:")
+    for duration, name in slowest_imports():
+        print("  %7.3fs  %s" % (duration, name))
+    if modules[0]:
+        print("imported but should be lazy: %s" % ", ".join(modules[0]))
+    if modules[0] or (args.max_time is not None and median > args.max_time):
+        sys.exit(1)
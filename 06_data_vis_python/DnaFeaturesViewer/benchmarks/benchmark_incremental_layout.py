@@ -0,0 +1,48 @@
+"""Compare the time to update the features levels of a record after adding
+or removing one feature, by recomputing all levels with
+compute_features_levels and with an IncrementalLayout.
+
+Run from the project's root with ``python benchmarks/benchmark_incremental_layout.py``.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dna_features_viewer.compute_features_levels import (
+    compute_features_levels,
+    IncrementalLayout,
+)
+from synthetic_records import random_features
+
+SIZES = [1000, 10000, 50000]
+N_EDITS = 20
+
+
+if __name__ == "__main__":
+    print(
+        "%8s %14s %14s %9s" % ("features", "full (s/edit)", "incr. (s/edit)", "speedup")
+    )
+    for size in SIZES:
+        features = random_features(size)
+        edits = random_features(N_EDITS, sequence_length=500 * size, seed=1)
+        layout = IncrementalLayout(features)
+        t0 = time.perf_counter()
+        for feature in edits:
+            features.append(feature)
+            compute_features_levels(features)
+            features.remove(feature)
+            compute_features_levels(features)
+        full_time = (time.perf_counter() - t0) / (2 * N_EDITS)
+        t0 = time.perf_counter()
+        for feature in edits:
+            layout.add_feature(feature)
+            layout.remove_feature(feature)
+        incremental_time = (time.perf_counter() - t0) / (2 * N_EDITS)
+        print(
+            "%8d %14.5f %14.5f %8.0fx"
+            % (size, full_time, incremental_time, full_time / incremental_time)
+        )
@@ -0,0 +1,62 @@
+"""Compare the time to plot and save records of increasing sizes in full
+detail and with ``plot(level_of_detail=True)``, for which the time should be
+bounded by the figure's resolution rather than by the number of features.
+
+Run from the project's root with
+``python benchmarks/benchmark_level_of_detail.py``.
+"""
+
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from dna_features_viewer import CircularGraphicRecord
+from synthetic_records import random_record
+
+SIZES = [1000, 10000, 100000]
+FULL_DETAIL_MAX_SIZE = 1000
+
+
+def render(record, **plot_params):
+    t0 = time.perf_counter()
+    ax, _ = record.plot(figure_width=15, **plot_params)
+    ax.figure.savefig(io.BytesIO(), format="png")
+    plt.close(ax.figure)
+    return time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    print(
+        "%9s %9s %15s %15s %15s"
+        % ("features", "record", "full (s)", "lod (s)", "lod zoomed (s)")
+    )
+    for size in SIZES:
+        linear_record = random_record(size, sequence_length=5000 * size)
+        circular_record = CircularGraphicRecord(
+            linear_record.sequence_length, linear_record.features
+        )
+        for name, record in [("linear", linear_record), ("circular", circular_record)]:
+            if size <= FULL_DETAIL_MAX_SIZE:
+                full_duration = "%15.2f" % render(record)
+            else:
+                full_duration = "%15s" % "-"
+            lod_duration = render(record, level_of_detail=True)
+            if name == "linear":
+                window = (0, 50000)
+                zoom_duration = render(record, level_of_detail=True, x_lim=window)
+                zoom_duration = "%15.2f" % zoom_duration
+            else:
+                zoom_duration = "%15s" % "-"
+            print(
+                "%9d %9s %s %15.2f %s"
+                % (size, name, full_duration, lod_duration, zoom_duration)
+            )
@@ -0,0 +1,76 @@
+"""Compare plot_on_multiple_lines with the previous two-pass approach, where
+every line was first plotted in a throwaway figure to measure its height,
+then plotted again in the final figure.
+
+Run from the project's root with
+``python benchmarks/benchmark_multiline_layout.py``.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from synthetic_records import random_record
+
+N_LINES = 50
+NUCL_PER_LINE = 2000
+N_FEATURES = 500
+
+
+def two_passes_plot_on_multiple_lines(record, nucl_per_line, figure_width=10):
+    """Reimplementation of the previous plot_on_multiple_lines."""
+    n_lines = record.sequence_length // nucl_per_line
+    lines = []
+    for line_index in range(n_lines):
+        line_start = line_index * nucl_per_line
+        line_end = line_start + nucl_per_line
+        lines.append((record.crop((line_start, line_end)), (line_start, line_end)))
+    figures_heights = []
+    for line_record, x_lim in lines:
+        ax, _ = line_record.plot(figure_width=figure_width, x_lim=x_lim)
+        figures_heights.append(ax.figure.get_figheight())
+        plt.close(ax.figure)
+    fig, axes = plt.subplots(
+        n_lines,
+        1,
+        gridspec_kw={"height_ratios": figures_heights},
+        figsize=(figure_width, 0.9 * sum(figures_heights)),
+    )
+    for (line_record, x_lim), ax in zip(lines, axes):
+        line_record.plot(figure_width=figure_width, x_lim=x_lim, ax=ax)
+    fig.tight_layout()
+    return fig, axes
+
+
+def timed(function, *args, **kwargs):
+    t0 = time.perf_counter()
+    fig, axes = function(*args, **kwargs)
+    duration = time.perf_counter() - t0
+    plt.close(fig)
+    return duration
+
+
+if __name__ == "__main__":
+    record = random_record(N_FEATURES, sequence_length=N_LINES * NUCL_PER_LINE)
+    # Warm up the text measurement caches for a fair comparison
+    record.plot_on_multiple_lines(nucl_per_line=NUCL_PER_LINE)
+    plt.close("all")
+    two_passes_duration = timed(
+        two_passes_plot_on_multiple_lines, record, nucl_per_line=NUCL_PER_LINE
+    )
+    record.features = list(record.features)  # resets the lines heights cache
+    single_pass_duration = timed(
+        record.plot_on_multiple_lines, nucl_per_line=NUCL_PER_LINE
+    )
+    print("%d lines, %d features" % (N_LINES, N_FEATURES))
+    print("two passes:  %.2fs" % two_passes_duration)
+    print("single pass: %.2fs" % single_pass_duration)
+    print("speedup:     %.2fx" % (two_passes_duration / single_pass_duration))
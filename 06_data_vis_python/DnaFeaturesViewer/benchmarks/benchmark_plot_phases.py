@@ -0,0 +1,58 @@
+"""Print the time spent in each phase of ``plot()``, ``plot_on_multiple_lines``
+and ``plot_with_bokeh`` (as recorded by a PlotProfiler) for synthetic records
+of different sizes, and the overhead of the profiling on ``plot()``.
+
+Run from the project's root with ``python benchmarks/benchmark_plot_phases.py``.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from dna_features_viewer import PlotProfiler
+from synthetic_records import random_record
+
+SIZES = [100, 1000]
+REPEATS = 3
+
+
+def plot_time(record, profiler=None):
+    t0 = time.perf_counter()
+    ax, _ = record.plot(figure_width=10, profiler=profiler)
+    duration = time.perf_counter() - t0
+    plt.close(ax.figure)
+    return duration
+
+
+if __name__ == "__main__":
+    for size in SIZES:
+        record = random_record(size)
+        plot_time(record)  # warm up the caches
+        without_profiler = min(plot_time(record) for _ in range(REPEATS))
+        with_profiler = min(plot_time(record, PlotProfiler()) for _ in range(REPEATS))
+        print("\n=== %d features ===" % size)
+        print(
+            "plot(): %.3fs without profiler, %.3fs with profiler"
+            % (without_profiler, with_profiler)
+        )
+
+        profiler = PlotProfiler()
+        plot_time(record, profiler)
+        print("\nplot()\n" + str(profiler))
+
+        profiler = PlotProfiler()
+        fig, _ = record.plot_on_multiple_lines(n_lines=5, profiler=profiler)
+        plt.close(fig)
+        print("\nplot_on_multiple_lines(n_lines=5)\n" + str(profiler))
+
+        profiler = PlotProfiler()
+        record.plot_with_bokeh(profiler=profiler)
+        print("\nplot_with_bokeh()\n" + str(profiler))
@@ -0,0 +1,50 @@
+"""Compare the time to load one record from a multi-record GenBank file by
+parsing the records until the right one is found, and with the offsets
+index of ``load_record(path, record_id=...)``.
+
+Run from the project's root with ``python benchmarks/benchmark_records_index.py``.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from Bio import SeqIO
+
+from dna_features_viewer import load_record
+from synthetic_records import write_random_genbank
+
+N_RECORDS = 200
+N_FEATURES = 50
+SEQUENCE_LENGTH = 20000
+
+
+def load_by_parsing(path, record_id):
+    for record in SeqIO.parse(path, "genbank"):
+        if record.id == record_id:
+            return record
+
+
+def timed(function, *args, **kwargs):
+    t0 = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "records.gb")
+        write_random_genbank(path, N_RECORDS, N_FEATURES, SEQUENCE_LENGTH)
+        record_id = "record_%d" % (N_RECORDS - 1)
+        parsing_time = timed(load_by_parsing, path, record_id)
+        first_time = timed(load_record, path, record_id=record_id)
+        cached_time = timed(load_record, path, record_id=record_id)
+    print("%d records of %d bp" % (N_RECORDS, SEQUENCE_LENGTH))
+    print("parse until found:       %7.3fs" % parsing_time)
+    print("index (first, building): %7.3fs" % first_time)
+    print("index (cached):          %7.3fs" % cached_time)
+    print("speedup (cached):        %7.1fx" % (parsing_time / cached_time))
@@ -0,0 +1,61 @@
+"""Compare the time to render the same record repeatedly as a PNG without
+cache, and with a RenderCache (memory and disk tiers, filled before the
+timing), each call using a freshly generated record as a web service would.
+
+Run from the project's root with ``python benchmarks/benchmark_render_cache.py``.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from dna_features_viewer import RenderCache
+from synthetic_records import random_record
+
+N_FEATURES = 200
+N_CALLS = 20
+
+
+def render_without_cache(record):
+    ax, _ = record.plot(figure_width=10)
+    buffer = BytesIO()
+    ax.figure.savefig(buffer, format="png", bbox_inches="tight")
+    plt.close(ax.figure)
+    return buffer.getvalue()
+
+
+def time_per_call(render):
+    t0 = time.perf_counter()
+    for _ in range(N_CALLS):
+        render(random_record(N_FEATURES, max_feature_length=5000))
+    return (time.perf_counter() - t0) / N_CALLS
+
+
+if __name__ == "__main__":
+    no_cache_time = time_per_call(render_without_cache)
+    memory_cache = RenderCache()
+    memory_cache.render(
+        random_record(N_FEATURES, max_feature_length=5000), figure_width=10
+    )
+    memory_time = time_per_call(lambda r: memory_cache.render(r, figure_width=10))
+    with tempfile.TemporaryDirectory() as directory:
+        RenderCache(cache_dir=directory).render(
+            random_record(N_FEATURES, max_feature_length=5000), figure_width=10
+        )
+        disk_time = time_per_call(
+            lambda r: RenderCache(cache_dir=directory).render(r, figure_width=10)
+        )
+    print("%d features, %d calls" % (N_FEATURES, N_CALLS))
+    print("no cache:    %8.4fs per call" % no_cache_time)
+    print("memory tier: %8.4fs per call" % memory_time)
+    print("disk tier:   %8.4fs per call" % disk_time)
@@ -0,0 +1,76 @@
+"""Compare the throughput (images per second) of rendering records to PNG
+bytes with pyplot (``plot()``, ``savefig()``, ``plt.close()``), with
+``render()`` in the current thread, and with ``render()`` in a pool of
+threads.
+
+Matplotlib's Agg renderer releases the GIL during part of the rasterization,
+so the gain of the threads depends on the number of CPU cores.
+
+Run from the project's root with
+``python benchmarks/benchmark_render_threads.py``.
+"""
+
+import gc
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from synthetic_records import random_record
+
+N_RECORDS = 20
+N_FEATURES = 50
+THREADS = [2, 4, 8]
+REPEATS = 3  # the best throughput of the repeats is reported
+
+
+def render_with_pyplot(record):
+    ax, _ = record.plot(figure_width=10)
+    target = io.BytesIO()
+    ax.figure.savefig(target, format="png", bbox_inches="tight")
+    plt.close(ax.figure)
+    return target.getvalue()
+
+
+def render(record):
+    return record.render("png", figure_width=10)
+
+
+def throughput(records, function, threads=None):
+    """Return the number of images rendered per second, and the images."""
+    t0 = time.perf_counter()
+    if threads is None:
+        images = [function(record) for record in records]
+    else:
+        with ThreadPoolExecutor(threads) as pool:
+            images = list(pool.map(function, records))
+    return len(images) / (time.perf_counter() - t0), images
+
+
+if __name__ == "__main__":
+    records = [random_record(N_FEATURES, seed=i) for i in range(N_RECORDS)]
+    render(records[0])  # warm up fonts and caches
+    print(
+        "%d records of %d features, %d CPUs" % (N_RECORDS, N_FEATURES, os.cpu_count())
+    )
+    methods = [("pyplot", render_with_pyplot, None), ("render()", render, None)]
+    methods += [("render(), %d threads" % n, render, n) for n in THREADS]
+    best_rates = {name: 0 for name, _, _ in methods}
+    expected = [render_with_pyplot(record) for record in records]
+    for _ in range(REPEATS):  # interleaved, as the machine's speed may vary
+        for name, function, threads in methods:
+            gc.collect()
+            rate, images = throughput(records, function, threads=threads)
+            assert images == expected
+            best_rates[name] = max(best_rates[name], rate)
+    for name, rate in best_rates.items():
+        print("%-22s %6.1f images/s" % (name, rate))
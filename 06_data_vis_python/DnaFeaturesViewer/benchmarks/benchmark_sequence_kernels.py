@@ -0,0 +1,80 @@
+"""Compare the complement, reverse-complement and translation functions of
+biotools with the Biopython-backed functions they replace, on megabase
+sequences, checking that the results are identical.
+
+Run from the project's root with ``python benchmarks/benchmark_sequence_kernels.py``.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Bio.Seq import Seq
+
+from dna_features_viewer.biotools import (
+    aa_short_to_long_form_dict,
+    complement,
+    reverse_complement,
+    translate,
+    translate_six_frames,
+)
+
+SEQUENCE_LENGTH = 3000000
+
+
+def biopython_complement(sequence):
+    return str(Seq(sequence).complement())
+
+
+def biopython_reverse_complement(sequence):
+    return biopython_complement(sequence)[::-1]
+
+
+def biopython_translate(sequence, long_form=False):
+    result = str(Seq(sequence).translate())
+    if long_form:
+        result = [aa_short_to_long_form_dict[aa] for aa in result]
+    return result
+
+
+def biopython_six_frames(sequence):
+    reverse = biopython_reverse_complement(sequence)
+    translations = {}
+    for strand, strand_sequence in [(1, sequence), (-1, reverse)]:
+        for shift in range(3):
+            end = shift + 3 * ((len(sequence) - shift) // 3)
+            translations[strand * (shift + 1)] = biopython_translate(
+                strand_sequence[shift:end]
+            )
+    return translations
+
+
+def timed(function, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    rng = random.Random(123)
+    sequence = "".join(rng.choice("ATGC") for _ in range(SEQUENCE_LENGTH))
+    cases = [
+        ("complement", biopython_complement, complement, {}),
+        ("reverse complement", biopython_reverse_complement, reverse_complement, {}),
+        ("translate", biopython_translate, translate, {}),
+        ("translate (long form)", biopython_translate, translate, {"long_form": 1}),
+        ("six frames", biopython_six_frames, translate_six_frames, {}),
+    ]
+    print("Sequence of %d bp" % SEQUENCE_LENGTH)
+    print("%-22s %12s %12s %9s" % ("", "Biopython", "biotools", "speedup"))
+    for name, reference_function, function, kwargs in cases:
+        expected, reference_time = timed(reference_function, sequence, **kwargs)
+        result, new_time = timed(function, sequence, **kwargs)
+        assert result == expected
+        print(
+            "%-22s %11.3fs %11.3fs %8.1fx"
+            % (name, reference_time, new_time, reference_time / new_time)
+        )
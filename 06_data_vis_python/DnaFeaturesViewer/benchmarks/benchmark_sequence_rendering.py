@@ -0,0 +1,83 @@
+"""Time the plotting (and drawing) of the sequence and translation of a 2kb
+window of a record, with one text and one axvline per nucleotide/codon (as
+in previous versions), with the guides as a single LineCollection and the
+unreadable texts skipped, and with one monospaced text artist per line.
+
+Run from the project's root with
+``python benchmarks/benchmark_sequence_rendering.py``.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from dna_features_viewer import GraphicRecord
+from dna_features_viewer.biotools import extract_graphical_translation
+
+WINDOW = 2000
+FIGURE_WIDTHS = [10, 150]  # nucleotides unreadable, then readable
+
+
+def previous_plot_sequence_and_translation(record, ax):
+    start, end = record.span
+    for i, nucleotide in enumerate(record.sequence):
+        ax.text(start + i, -0.7, nucleotide, ha="center", va="center", size=11)
+        ax.axvline(start + i - 0.5, linewidth=0.1, color=(0, 0, 0, 0.2))
+    translation = extract_graphical_translation(
+        record.sequence, (0, 3 * ((end - start) // 3)), long_form=True
+    )
+    for i, aa in enumerate(translation):
+        ax.text(start + 3 * i + 1, -1.4, aa, ha="center", va="center", size=11)
+        ax.axvline(start + 3 * i - 0.5, linewidth=0.1, color=(0, 0, 0, 0.5))
+
+
+def new_plot_sequence_and_translation(record, ax, **params):
+    record.plot_sequence(ax, guides_intensity=0.2, **params)
+    start, end = record.span
+    record.plot_translation(ax, (start, 3 * ((end - start) // 3)), **params)
+
+
+def timed(plot_function, record, figure_width, **params):
+    t0 = time.perf_counter()
+    ax, _ = record.plot(figure_width=figure_width, with_ruler=False)
+    plot_function(record, ax, **params)
+    ax.figure.canvas.draw()
+    plt.close(ax.figure)
+    return time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    rng = random.Random(123)
+    sequence = "".join(rng.choice("ATGC") for _ in range(WINDOW))
+    record = GraphicRecord(sequence=sequence, features=[])
+    methods = [
+        (
+            "previous (text + axvline per glyph)",
+            previous_plot_sequence_and_translation,
+            {},
+        ),
+        ("LineCollection guides", new_plot_sequence_and_translation, {}),
+        (
+            "  + skip unreadable texts",
+            new_plot_sequence_and_translation,
+            {"skip_unreadable": True},
+        ),
+        (
+            "  + monospaced text per line",
+            new_plot_sequence_and_translation,
+            {"monospaced_text": True},
+        ),
+    ]
+    for figure_width in FIGURE_WIDTHS:
+        print("%d nucleotides, figure width %d inches" % (WINDOW, figure_width))
+        for name, function, params in methods:
+            duration = timed(function, record, figure_width, **params)
+            print("  %-36s %7.3fs" % (name, duration))
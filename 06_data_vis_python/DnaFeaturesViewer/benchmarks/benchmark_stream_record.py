@@ -0,0 +1,56 @@
+"""Compare the time and peak memory needed to get a GraphicRecord of a
+window of a large GFF3 file with ``load_record`` (which parses the whole
+record with BCBio-GFF) and with ``stream_record(region=...)``.
+
+Run from the project's root with
+``python benchmarks/benchmark_stream_record.py``.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dna_features_viewer import BiopythonTranslator, load_record, stream_record
+from synthetic_records import write_random_gff
+
+N_FEATURES = 20000
+SEQUENCE_LENGTH = 5000000
+WINDOW = (1000000, 1050000)
+
+
+def measure(function):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    graphic_record = function()
+    duration = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return graphic_record, duration, peak / 1e6
+
+
+if __name__ == "__main__":
+    translator = BiopythonTranslator()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "genome.gff")
+        write_random_gff(path, N_FEATURES, SEQUENCE_LENGTH)
+
+        def full_load():
+            graphic_record = translator.translate_record(load_record(path))
+            return graphic_record.crop(WINDOW)
+
+        def streamed_load():
+            record = stream_record(path, region=WINDOW)
+            return translator.translate_record(record).crop(WINDOW)
+
+        print("%d features, %d bp" % (N_FEATURES, SEQUENCE_LENGTH))
+        for name, function in [("load_record", full_load), ("stream", streamed_load)]:
+            graphic_record, duration, peak = measure(function)
+            print(
+                "%12s: %6.2fs, peak memory %7.1f MB, %d features in window"
+                % (name, duration, peak, len(graphic_record.features))
+            )
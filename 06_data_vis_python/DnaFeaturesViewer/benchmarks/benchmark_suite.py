@@ -0,0 +1,304 @@
+"""Benchmark suite of the library's main entry points, to catch performance
+regressions between commits.
+
+The benchmarks are classes following the conventions of airspeed velocity
+(asv): ``params`` and ``param_names`` class attributes, a ``setup(*params)``
+method preparing the synthetic records (not measured), and ``time_*(*params)``
+methods. For every combination of parameters, this script measures the time
+of each method (best of ``--repeat`` runs, after a warm-up run which fills
+the library's caches) and its peak memory (the largest amount of memory
+allocated through Python during one run, as measured by ``tracemalloc``; the
+memory allocated by Matplotlib's C++ renderer is not counted).
+
+Run from the project's root:
+
+- ``python benchmarks/benchmark_suite.py --output results.json`` to run all
+  benchmarks and save the results, with the commit, machine and versions.
+- ``python benchmarks/benchmark_suite.py --filter Plot --quick`` to only run
+  the benchmarks whose name contains "Plot", with the smallest parameters.
+- ``python benchmarks/benchmark_suite.py --compare before.json after.json`` to
+  compare the results of two runs (e.g. of two commits, on the same machine).
+  The script exits with an error if a time or peak memory increased by more
+  than ``--threshold`` (default 1.25, i.e. +25%).
+
+CircularGraphicRecord only supports the plotting and layout entry points, so
+the crop, multi-page and Bokeh benchmarks are only run on linear records.
+"""
+
+import argparse
+import datetime
+import gc
+import io
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from dna_features_viewer import (
+    CircularGraphicRecord,
+    GraphicRecord,
+    PlotGeometry,
+    __version__,
+)
+from dna_features_viewer.compute_features_levels import compute_features_levels
+from synthetic_records import random_features, random_record
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RECORD_CLASSES = {"linear": GraphicRecord, "circular": CircularGraphicRecord}
+MIN_RUN_TIME = 0.2  # seconds
+
+
+class ComputeFeaturesLevels:
+    params = ([1000, 10000], [1, 10])
+    param_names = ["n_features", "overlap_density"]
+
+    def setup(self, n_features, overlap_density):
+        self.features = random_features(n_features, overlap_density=overlap_density)
+
+    def time_compute_features_levels(self, n_features, overlap_density):
+        compute_features_levels(self.features)
+
+
+class ComputeLayout:
+    params = (["linear", "circular"], [100, 1000], [10, 40])
+    param_names = ["record", "n_features", "label_length"]
+
+    def setup(self, record, n_features, label_length):
+        self.record = random_record(
+            n_features,
+            record_class=RECORD_CLASSES[record],
+            label_length=label_length,
+        )
+        fig, ax = plt.subplots(1, figsize=(10, 3))
+        self.record.initialize_ax(ax, draw_line=True, with_ruler=True)
+        self.geometry = PlotGeometry.from_ax(ax)
+        plt.close(fig)
+
+    def time_compute_layout(self, record, n_features, label_length):
+        self.record.compute_layout(self.geometry)
+
+
+class Crop:
+    params = ([1000, 100000], [10000, 1000000])
+    param_names = ["n_features", "sequence_length"]
+
+    def setup(self, n_features, sequence_length):
+        self.record = random_record(n_features, sequence_length=sequence_length)
+
+    def time_crop(self, n_features, sequence_length):
+        length = self.record.sequence_length
+        self.record.crop((length // 4, length // 2))
+
+
+class Plot:
+    params = (["linear", "circular"], [100, 1000], [10, 40])
+    param_names = ["record", "n_features", "label_length"]
+
+    def setup(self, record, n_features, label_length):
+        self.record = random_record(
+            n_features,
+            record_class=RECORD_CLASSES[record],
+            label_length=label_length,
+        )
+
+    def time_plot(self, record, n_features, label_length):
+        ax, _ = self.record.plot(figure_width=10)
+        plt.close(ax.figure)
+
+    def time_plot_and_draw(self, record, n_features, label_length):
+        ax, _ = self.record.plot(figure_width=10)
+        ax.figure.canvas.draw()
+        plt.close(ax.figure)
+
+
+class PlotOnMultiplePages:
+    params = ([100, 1000], [50000, 200000])
+    param_names = ["n_features", "sequence_length"]
+
+    def setup(self, n_features, sequence_length):
+        self.record = random_record(n_features, sequence_length=sequence_length)
+
+    def time_plot_on_multiple_pages(self, n_features, sequence_length):
+        self.record.plot_on_multiple_pages(
+            io.BytesIO(), nucl_per_line=5000, lines_per_page=5
+        )
+
+
+class PlotWithBokeh:
+    params = ([100, 1000], [10, 40])
+    param_names = ["n_features", "label_length"]
+
+    def setup(self, n_features, label_length):
+        self.record = random_record(n_features, label_length=label_length)
+        self.record.plot_with_bokeh()  # Bokeh's import is not measured
+
+    def time_plot_with_bokeh(self, n_features, label_length):
+        self.record.plot_with_bokeh(figure_width=10)
+
+
+BENCHMARKS = [
+    ComputeFeaturesLevels,
+    ComputeLayout,
+    Crop,
+    Plot,
+    PlotOnMultiplePages,
+    PlotWithBokeh,
+]
+
+
+def measure(function, repeat):
+    """Return the best time of ``repeat`` runs of the function, and the peak
+    memory allocated during one run, in bytes.
+
+    As in asv, fast functions are called several times per run (so each run
+    lasts at least ``MIN_RUN_TIME``) and the time per call is returned.
+    """
+    gc.collect()
+    t0 = time.perf_counter()
+    function()
+    first_time = time.perf_counter() - t0
+    number = max(1, min(1000, int(MIN_RUN_TIME / max(first_time, 1e-6))))
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        for _ in range(number):
+            function()
+        times.append((time.perf_counter() - t0) / number)
+    gc.collect()
+    tracemalloc.start()
+    function()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(times), peak_memory
+
+
+def run_benchmarks(name_filter=None, repeat=3, quick=False, logger=print):
+    """Run the benchmarks and return a dict of results, with keys of the form
+    "Plot.time_plot(record=linear, n_features=100, label_length=10)"."""
+    results = {}
+    for benchmark_class in BENCHMARKS:
+        methods = sorted(m for m in dir(benchmark_class) if m.startswith("time_"))
+        params = benchmark_class.params
+        if quick:
+            params = [values[:1] for values in params]
+        for values in itertools.product(*params):
+            parameters = dict(zip(benchmark_class.param_names, values))
+            description = ", ".join("%s=%s" % item for item in parameters.items())
+            keys = [
+                (method, "%s.%s(%s)" % (benchmark_class.__name__, method, description))
+                for method in methods
+            ]
+            keys = [(m, key) for (m, key) in keys if (name_filter or "") in key]
+            if len(keys) == 0:
+                continue
+            benchmark = benchmark_class()
+            benchmark.setup(*values)
+            for method, key in keys:
+                function = getattr(benchmark, method)
+                duration, peak_memory = measure(lambda: function(*values), repeat)
+                results[key] = dict(
+                    benchmark=benchmark_class.__name__,
+                    method=method,
+                    params=parameters,
+                    time=duration,
+                    peak_memory=peak_memory,
+                )
+                logger("%-90s %9.4fs %9.1f MB" % (key, duration, peak_memory / 1e6))
+    return results
+
+
+def environment_description():
+    """Return the commit, date, machine and versions of the run."""
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=PROJECT_ROOT, stderr=subprocess.DEVNULL
+        )
+        commit = commit.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    import numpy
+
+    return dict(
+        commit=commit,
+        date=datetime.datetime.now().isoformat(timespec="seconds"),
+        machine=platform.node(),
+        platform=platform.platform(),
+        cpu_count=os.cpu_count(),
+        python=platform.python_version(),
+        dna_features_viewer=__version__,
+        matplotlib=matplotlib.__version__,
+        numpy=numpy.__version__,
+    )
+
+
+def compare_results(before, after, threshold=1.25):
+    """Print the ratios (after / before) of the times and peak memories of
+    the benchmarks found in both results. Return the list of regressions
+    (benchmark key, measure, ratio) with a ratio above the threshold."""
+    regressions = []
+    print("%-90s %8s %8s" % ("benchmark", "time", "memory"))
+    for key, result in after["results"].items():
+        if key not in before["results"]:
+            continue
+        ratios = {}
+        for measure_name in ("time", "peak_memory"):
+            old = before["results"][key][measure_name]
+            new = result[measure_name]
+            ratios[measure_name] = new / old if old else 1.0
+            if ratios[measure_name] > threshold:
+                regressions.append((key, measure_name, ratios[measure_name]))
+        flag = " <-" if max(ratios.values()) > threshold else ""
+        print(
+            "%-90s %7.2fx %7.2fx%s" % (key, ratios["time"], ratios["peak_memory"], flag)
+        )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--output", help="JSON file where to save the results.")
+    parser.add_argument("--filter", help="Only run benchmarks containing this.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            before = json.load(f)
+        with open(args.compare[1]) as f:
+            after = json.load(f)
+        print("before: %s" % before["environment"]["commit"])
+        print("after:  %s" % after["environment"]["commit"])
+        regressions = compare_results(before, after, threshold=args.threshold)
+        if regressions:
+            print("%d regressions above %.2fx" % (len(regressions), args.threshold))
+            sys.exit(1)
+    else:
+        environment = environment_description()
+        print("commit %s, %s" % (environment["commit"], environment["platform"]))
+        results = run_benchmarks(
+            name_filter=args.filter, repeat=args.repeat, quick=args.quick
+        )
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(
+                    dict(environment=environment, results=results),
+                    f,
+                    indent=1,
+                    sort_keys=True,
+                )
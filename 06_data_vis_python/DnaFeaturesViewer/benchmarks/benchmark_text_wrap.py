@@ -0,0 +1,88 @@
+"""Compare find_narrowest_text_wrap with the previous implementation (one
+``textwrap.wrap`` per line length from ``max_line_length`` down), on a
+corpus of feature labels like those of a plasmid collection, where the
+same labels (restriction sites, common genes...) appear many times.
+
+Run from the project's root with ``python benchmarks/benchmark_text_wrap.py``.
+"""
+
+import os
+import random
+import sys
+import textwrap
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dna_features_viewer.biotools import find_narrowest_text_wrap
+
+N_LABELS = 20000
+MAX_LINE_LENGTH = 30
+COMMON_LABELS = [
+    "AarI site",
+    "BamHI site",
+    "EcoRI site",
+    "BsaI site",
+    "Chloramphenicol resistance marker",
+    "Ampicillin resistance gene (bla)",
+    "pUC origin of replication",
+    "lacZ-alpha fragment for blue-white screening",
+    "T7 promoter",
+    "CMV enhancer and promoter",
+    "SV40 polyadenylation signal",
+    "Kanamycin/Neomycin resistance (nptII)",
+]
+WORDS = ["putative", "hypothetical", "protein", "transcriptional", "regulator"]
+WORDS += ["ABC-transporter", "binding", "domain", "subunit", "kinase", "family"]
+
+
+def previous_find_narrowest_text_wrap(text, max_line_length):
+    narrowest_wrap = textwrap.wrap(text, max_line_length)
+    narrowest_width = max([len(l) for l in narrowest_wrap])
+    for line_length in range(max_line_length - 1, 0, -1):
+        wrap = textwrap.wrap(text, line_length)
+        if len(wrap) <= len(narrowest_wrap):
+            width = max([len(l) for l in wrap])
+            if width < narrowest_width:
+                narrowest_wrap = wrap
+                narrowest_width = width
+        else:
+            break
+    return "\n".join(narrowest_wrap)
+
+
+def labels_corpus():
+    """Return labels longer than MAX_LINE_LENGTH (the only ones wrapped):
+    80% of common labels, 20% of random gene product names."""
+    rng = random.Random(123)
+    labels = []
+    while len(labels) < N_LABELS:
+        if rng.random() < 0.8:
+            label = rng.choice(COMMON_LABELS)
+        else:
+            label = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 7)))
+        if len(label) > MAX_LINE_LENGTH:
+            labels.append(label)
+    return labels
+
+
+def timed(function, labels):
+    t0 = time.perf_counter()
+    results = [function(label, MAX_LINE_LENGTH) for label in labels]
+    return results, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    labels = labels_corpus()
+    expected, previous_time = timed(previous_find_narrowest_text_wrap, labels)
+    uncached = find_narrowest_text_wrap.__wrapped__
+    results, uncached_time = timed(uncached, labels)
+    assert results == expected
+    find_narrowest_text_wrap.cache_clear()
+    results, cached_time = timed(find_narrowest_text_wrap, labels)
+    assert results == expected
+    print("%d labels (%d distinct)" % (len(labels), len(set(labels))))
+    print("previous:             %7.3fs" % previous_time)
+    print("skipping line widths: %7.3fs" % uncached_time)
+    print("  + memoization:      %7.3fs" % cached_time)
+    print("speedup:              %7.1fx" % (previous_time / cached_time))
@@ -0,0 +1,149 @@
+"""Generators of random GraphicFeatures and GraphicRecords for benchmarks."""
+
+import random
+
+from dna_features_viewer import GraphicFeature, GraphicRecord
+
+
+def random_features(
+    n_features,
+    sequence_length=None,
+    max_feature_length=2000,
+    seed=123,
+    overlap_density=2,
+    label_length=None,
+):
+    """Return a list of random GraphicFeatures.
+
+    Parameters
+    ----------
+
+    n_features
+      Number of features to generate.
+
+    sequence_length
+      Length of the sequence on which the features are spread. Leave to None
+      for a sequence length proportional to the number of features, computed
+      from the ``overlap_density``.
+
+    max_feature_length
+      Maximal length of a feature, in nucleotides.
+
+    seed
+      Seed of the random generator, for reproducible benchmarks.
+
+    overlap_density
+      Average number of features covering a nucleotide, used to compute the
+      sequence length when it is not provided. Higher densities give more
+      levels of features and labels.
+
+    label_length
+      Length of the labels. Leave to None for short labels "feature 1",
+      "feature 2"... Otherwise the labels are random words, which can be
+      wrapped on several lines.
+    """
+    rng = random.Random(seed)
+    if sequence_length is None:
+        mean_feature_length = max_feature_length / 2.0
+        sequence_length = int(n_features * mean_feature_length / overlap_density)
+    features = []
+    for i in range(n_features):
+        start = rng.randint(0, sequence_length - 1)
+        end = min(sequence_length, start + rng.randint(1, max_feature_length))
+        strand = rng.choice([-1, 1])
+        if label_length is None:
+            label = "feature %d" % i
+        else:
+            label = random_label(rng, label_length)
+        features.append(
+            GraphicFeature(start=start, end=end, strand=strand, label=label)
+        )
+    return features
+
+
+def random_label(rng, length):
+    """Return a random label of the given length, made of words of 2 to 9
+    letters."""
+    words = []
+    while sum(len(word) + 1 for word in words) < length:
+        word_length = rng.randint(2, 9)
+        words.append("".join(rng.choice("acdegilmnoprstu") for _ in range(word_length)))
+    return " ".join(words)[:length].strip()
+
+
+def random_pileup(n_features, region_length=2000, read_length=100, seed=123):
+    """Return a list of GraphicFeatures piled up like sequencing reads (all
+    between ``read_length / 2`` and ``read_length`` long, in a small region),
+    some of them spanning several lines of labels or at fixed levels."""
+    rng = random.Random(seed)
+    features = []
+    for i in range(n_features):
+        start = rng.randint(0, region_length)
+        end = start + rng.randint(read_length // 2, read_length)
+        feature = GraphicFeature(start=start, end=end, strand=1)
+        if rng.random() < 0.2:
+            feature.data["nlines"] = rng.choice([1, 2, 3])
+        if rng.random() < 0.02:
+            feature.data["fixed_level"] = rng.choice([0, 1.5, 7])
+        features.append(feature)
+    return features
+
+
+def random_record(
+    n_features, sequence_length=None, record_class=GraphicRecord, **kwargs
+):
+    """Return a GraphicRecord (or other ``record_class``, e.g.
+    CircularGraphicRecord) with ``n_features`` random features. The other
+    parameters are the ones of ``random_features``."""
+    features = random_features(n_features, sequence_length, **kwargs)
+    sequence_length = max(f.end for f in features)
+    return record_class(sequence_length=sequence_length, features=features)
+
+
+def write_random_gff(path, n_features, sequence_length, seed=123):
+    """Write a GFF3 file with ``n_features`` random features and a random
+    sequence of length ``sequence_length`` (in a ##FASTA section)."""
+    rng = random.Random(seed)
+    features = random_features(n_features, sequence_length, seed=seed)
+    with open(path, "w") as f:
+        f.write("##gff-version 3\n")
+        f.write("##sequence-region chr1 1 %d\n" % sequence_length)
+        for i, feature in enumerate(features):
+            strand = "+" if feature.strand == 1 else "-"
+            f.write(
+                "chr1\tsynthetic\tCDS\t%d\t%d\t.\t%s\t.\tID=cds%d;Name=%s\n"
+                % (feature.start + 1, feature.end, strand, i, feature.label)
+            )
+        f.write("##FASTA\n>chr1\n")
+        for start in range(0, sequence_length, 60):
+            line_length = min(60, sequence_length - start)
+            f.write("".join(rng.choice("ATGC") for _ in range(line_length)) + "\n")
+
+
+def write_random_genbank(path, n_records, n_features, sequence_length, seed=123):
+    """Write a multi-record GenBank file of ``n_records`` records named
+    ``record_0``, ``record_1``..., each with ``n_features`` random features
+    and a random sequence of length ``sequence_length``."""
+    from Bio import SeqIO
+    from Bio.Seq import Seq
+    from Bio.SeqFeature import SeqFeature, SimpleLocation
+    from Bio.SeqRecord import SeqRecord
+
+    rng = random.Random(seed)
+    records = []
+    for i in range(n_records):
+        sequence = "".join(rng.choice("ATGC") for _ in range(sequence_length))
+        features = [
+            SeqFeature(
+                SimpleLocation(f.start, f.end, f.strand),
+                type="CDS",
+                qualifiers={"label": [f.label]},
+            )
+            for f in random_features(n_features, sequence_length, seed=seed + i)
+        ]
+        record = SeqRecord(
+            Seq(sequence), id="record_%d" % i, name="record_%d" % i, features=features
+        )
+        record.annotations["molecule_type"] = "DNA"
+        records.append(record)
+    SeqIO.write(records, path, "genbank")
@@ -2,6 +2,7 @@ from ..biotools import load_record
 from ..GraphicRecord import GraphicRecord
 from ..CircularGraphicRecord import CircularGraphicRecord
 from ..GraphicFeature import GraphicFeature
+from ..StreamedRecord import LazySequence
 
 
 class BiopythonTranslatorBase:
@@ -55,14 +56,19 @@ class BiopythonTranslatorBase:
             **properties
         )
 
-    def translate_record(self, record, record_class=None, filetype=None):
+    def translate_record(
+        self, record, record_class=None, filetype=None, record_id=None
+    ):
         """Create a new GraphicRecord from a BioPython Record object.
 
         Parameters
         ----------
 
         record
-          A BioPython Record object or the path to a Genbank or a GFF file.
+          A BioPython Record object, the path to a Genbank or a GFF file, or
+          a StreamedRecord (see ``stream_record``), in which case the features
+          are translated as they are parsed and the sequence is only read
+          from the file when needed.
 
         record_class
           The graphic record class to use, e.g. GraphicRecord (default) or
@@ -72,6 +78,10 @@ class BiopythonTranslatorBase:
         filetype
           Used only when a Genbank or a GFF file is provided; one of "genbank"
           or "gff" to be used. Default None infers from file extension.
+
+        record_id
+          Used only when a Genbank or a GFF file is provided; ID of the record
+          to translate, for multi-record files (see ``load_record``).
         """
         classes = {
             "linear": GraphicRecord,
@@ -82,16 +92,25 @@ class BiopythonTranslatorBase:
             record_class = classes[record_class]
 
         if isinstance(record, str) or hasattr(record, "read"):
-            record = load_record(record, filetype=filetype)
+            record = load_record(record, filetype=filetype, record_id=record_id)
         filtered_features = self.compute_filtered_features(record.features)
+        # The features are translated first, as a StreamedRecord only knows
+        # its sequence once all features have been parsed.
+        features = [
+            self.translate_feature(feature)
+            for feature in filtered_features
+            if feature.location is not None
+        ]
+        sequence = record.seq
+        if (sequence is not None) and not isinstance(sequence, LazySequence):
+            try:
+                sequence = str(sequence)
+            except ValueError:  # Undefined sequence, e.g. GFF without FASTA
+                sequence = None
         return record_class(
             sequence_length=len(record),
-            sequence=str(record.seq),
-            features=[
-                self.translate_feature(feature)
-                for feature in filtered_features
-                if feature.location is not None
-            ],
+            sequence=sequence,
+            features=features,
             **self.graphic_record_parameters
         )
 
@@ -2,6 +2,9 @@
 
 This is a plain arrow curved alongside a protion of circle, like you would
 expect a circular genetic feature to look.
+
+The ``arrow_wedges_paths`` function computes the paths of many arrow-wedges at
+once, to draw them as a single collection.
 """
 import numpy as np
 import matplotlib.patches as mpatches
@@ -96,3 +99,138 @@ class ArrowWedge(mpatches.Wedge):
         path_vertices *= self.r
         path_vertices += np.asarray(self.center)
         self._path = mpatches.Path(path_vertices, path_codes)
+
+
+def _arcs_radian_bounds(thetas1, thetas2):
+    """Return the start and end angles (in radians) of arcs between angles
+    (in degrees), normalized as in ``Path.arc``."""
+    eta2 = thetas2 - 360 * np.floor((thetas2 - thetas1) / 360)
+    eta2 = np.where((thetas2 != thetas1) & (eta2 <= thetas1), eta2 + 360, eta2)
+    return np.deg2rad(thetas1), np.deg2rad(eta2)
+
+
+def _unit_arcs_vertices(thetas1, thetas2, n):
+    """Return the (len(thetas1), 3 * n + 1, 2) array of the vertices of the
+    unit circle arcs between the angles, as ``Path.arc(theta1, theta2, n)``
+    (``n`` Bezier curves per arc)."""
+    eta1, eta2 = _arcs_radian_bounds(thetas1, thetas2)
+    eta1, eta2 = eta1[:, None], eta2[:, None]
+    deta = (eta2 - eta1) / n
+    t = np.tan(0.5 * deta)
+    alpha = np.sin(deta) * (np.sqrt(4.0 + 3.0 * t * t) - 1) / 3.0
+    steps = eta1 + deta * np.arange(n + 1)
+    steps[:, -1] = eta2[:, 0]
+    cos, sin = np.cos(steps), np.sin(steps)
+    vertices = np.empty((len(thetas1), 3 * n + 1, 2))
+    vertices[:, 0] = np.stack([cos[:, 0], sin[:, 0]], axis=-1)
+    vertices[:, 1::3, 0] = cos[:, :-1] - alpha * sin[:, :-1]
+    vertices[:, 1::3, 1] = sin[:, :-1] + alpha * cos[:, :-1]
+    vertices[:, 2::3, 0] = cos[:, 1:] + alpha * sin[:, 1:]
+    vertices[:, 2::3, 1] = sin[:, 1:] - alpha * cos[:, 1:]
+    vertices[:, 3::3, 0] = cos[:, 1:]
+    vertices[:, 3::3, 1] = sin[:, 1:]
+    return vertices
+
+
+def _arcs_segments_numbers(thetas1, thetas2):
+    """Return the number of Bezier curves used by ``Path.arc`` for each arc
+    (1, 2, 4, 8 or 16 depending on the arc's span)."""
+    eta1, eta2 = _arcs_radian_bounds(thetas1, thetas2)
+    return (2 ** np.ceil((eta2 - eta1) / (0.5 * np.pi))).astype(int)
+
+
+def _arc_codes(n):
+    codes = np.full(3 * n + 1, mpatches.Path.CURVE4, dtype=mpatches.Path.code_type)
+    codes[0] = mpatches.Path.MOVETO
+    return codes
+
+
+def arrow_wedges_paths(center, radii, thetas1, thetas2, widths, directions):
+    """Return the Matplotlib paths of many ArrowWedges at once.
+
+    The paths are the same as those of ``ArrowWedge(center, radius, theta1,
+    theta2, width, direction)._path`` for each arrow-wedge, but the arcs'
+    geometry is computed with vectorized NumPy for all the arrow-wedges with
+    the same kind of path at once.
+
+    Parameters
+    ----------
+
+    center
+      Center (x, y) of the circle around which the arrow-wedges are drawn.
+
+    radii, thetas1, thetas2, widths, directions
+      Arrays of the radii, start and end angles (with theta1 < theta2),
+      widths, and directions of the arrow-wedges (see ``ArrowWedge``).
+    """
+    radii, widths = np.asarray(radii, float), np.asarray(widths, float)
+    thetas1, thetas2 = np.asarray(thetas1, float), np.asarray(thetas2, float)
+    directions = np.asarray(directions)
+    directions = np.where(np.isin(directions, [-1, 1]), directions, 0)
+    arrow_angles = np.minimum(5, np.abs(thetas2 - thetas1) / 2)
+    # Angles of the outer arc of each path
+    is_full_circle = np.abs((thetas2 - thetas1) - 360) <= 1e-12
+    arcs_starts = np.where(directions == 1, thetas1 + arrow_angles, thetas1)
+    arcs_starts[(directions == 0) & is_full_circle] = 0
+    arcs_ends = np.where(directions == -1, thetas2 - arrow_angles, thetas2)
+    arcs_ends[(directions == 0) & is_full_circle] = 360
+    arcs_ns = _arcs_segments_numbers(arcs_starts, arcs_ends)
+
+    paths = [None] * len(radii)
+    groups = set(zip(directions, arcs_ns, is_full_circle & (directions == 0)))
+    for direction, n, full_circle in groups:
+        indices = np.flatnonzero(
+            (directions == direction)
+            & (arcs_ns == n)
+            & ((is_full_circle & (directions == 0)) == full_circle)
+        )
+        arcs = _unit_arcs_vertices(arcs_starts[indices], arcs_ends[indices], n)
+        arc_codes = _arc_codes(n)
+        r = radii[indices, None, None]
+        if direction == 0:
+            # Same path as a Matplotlib Wedge
+            connector = mpatches.Path.MOVETO if full_circle else mpatches.Path.LINETO
+            inner_arcs = arcs[:, ::-1] * (r - widths[indices, None, None]) / r
+            vertices = np.concatenate(
+                [arcs, inner_arcs, np.zeros_like(arcs[:, :1])], axis=1
+            )
+            codes = np.hstack(
+                [arc_codes, connector, arc_codes[1:], mpatches.Path.CLOSEPOLY]
+            )
+        else:
+            normalized_arrow_widths = widths[indices, None, None] / 2.0 / r
+            if direction == 1:
+                outer_arcs = arcs[:, ::-1] * (1 + normalized_arrow_widths)
+                inner_arcs = arcs * (1 - normalized_arrow_widths)
+                tips_angles = np.deg2rad(thetas1[indices])
+            else:
+                outer_arcs = arcs * (1 + normalized_arrow_widths)
+                inner_arcs = arcs[:, ::-1] * (1 - normalized_arrow_widths)
+                tips_angles = np.deg2rad(thetas2[indices])
+            tips = np.stack([np.cos(tips_angles), np.sin(tips_angles)], axis=-1)
+            vertices = np.concatenate(
+                [
+                    outer_arcs,
+                    outer_arcs[:, -1:],
+                    tips[:, None],
+                    inner_arcs[:, :1],
+                    inner_arcs,
+                    inner_arcs[:, -1:],
+                    np.zeros_like(arcs[:, :1]),
+                ],
+                axis=1,
+            )
+            codes = np.hstack(
+                [
+                    arc_codes,
+                    4 * [mpatches.Path.LINETO],
+                    arc_codes[1:],
+                    mpatches.Path.LINETO,
+                    mpatches.Path.CLOSEPOLY,
+                ]
+            )
+        # Shift and scale the wedges to their final location.
+        vertices = vertices * r + np.asarray(center)
+        for index, path_vertices in zip(indices, vertices):
+            paths[index] = mpatches.Path(path_vertices, codes)
+    return paths
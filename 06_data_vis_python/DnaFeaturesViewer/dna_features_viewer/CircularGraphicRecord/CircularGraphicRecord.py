@@ -3,9 +3,11 @@
 
 import matplotlib.patches as mpatches
 import numpy as np
+from matplotlib.collections import PathCollection
 
 from ..GraphicRecord import GraphicRecord
-from .ArrowWedge import ArrowWedge
+from ..GraphicRecord.PlotGeometry import PlotGeometry
+from .ArrowWedge import ArrowWedge, arrow_wedges_paths
 
 
 class CircularGraphicRecord(GraphicRecord):
@@ -41,6 +43,13 @@ class CircularGraphicRecord(GraphicRecord):
     default_elevate_outline_annotations = True
     min_y_height_of_text_line = 0.1
 
+    @property
+    def default_batch_artists(self):
+        """Circular records batch their features by default, unless a
+        subclass overrides ``plot_feature`` (which is not called when the
+        features are batched)."""
+        return type(self).plot_feature is CircularGraphicRecord.plot_feature
+
     def __init__(
         self,
         sequence_length,
@@ -110,11 +119,12 @@ class CircularGraphicRecord(GraphicRecord):
             figure_width = ax.figure.get_size_inches()[0]
             ax.figure.set_size_inches(figure_width, figure_width * ratio)
 
-    def plot_feature(self, ax, feature, level):
+    def plot_feature(self, ax, feature, level, geometry=None):
         """Plot an ArrowWedge representing the feature at the given height
         level.
 
-
+        The wedges don't depend on the ax's width, so the ``geometry`` is not
+        used (it is accepted for compatibility with ``GraphicRecord``).
         """
         a_start = self.position_to_angle(feature.start)
         a_end = self.position_to_angle(feature.end)
@@ -134,14 +144,113 @@ class CircularGraphicRecord(GraphicRecord):
         )
         ax.add_patch(patch)
 
+    def plot_features_batch(self, ax, features_levels, geometry=None):
+        """Plot all features as a single collection of arrow-wedges.
+
+        This gives the same result as calling ``plot_feature`` for every
+        feature, but the wedges' paths are computed with vectorized NumPy (see
+        ``arrow_wedges_paths``) and drawn as a single Matplotlib artist.
+
+        Parameters
+        ----------
+
+        ax
+          The Matplotlib ax on which to plot the features.
+
+        features_levels
+          List of ``(feature, level)`` in the order in which they should be
+          drawn.
+
+        geometry
+          Not used, see ``plot_feature``.
+        """
+        if len(features_levels) == 0:
+            return None
+        features = [feature for feature, level in features_levels]
+        levels = np.array([level for feature, level in features_levels])
+        starts = np.array([f.start for f in features], dtype=float)
+        ends = np.array([f.end for f in features], dtype=float)
+        strands = np.array([0 if f.strand is None else f.strand for f in features])
+        angles = self.position_to_angle(np.array([starts, ends]))
+        paths = arrow_wedges_paths(
+            center=(0, -self.radius),
+            radii=self.radius + levels * self.feature_level_height,
+            thetas1=angles.min(axis=0),
+            thetas2=angles.max(axis=0),
+            widths=np.full(len(features), 0.7 * self.feature_level_height),
+            directions=strands,
+        )
+        collection = PathCollection(
+            paths,
+            facecolors=[f.color for f in features],
+            edgecolors=[f.linecolor for f in features],
+            linewidths=[f.linewidth for f in features],
+            joinstyle="miter",
+            zorder=1,
+        )
+        ax.add_collection(collection)
+        return collection
+
+    def _pixels_per_basepair(self, geometry):
+        """Return the length in pixels of one nucleotide on the circle."""
+        pixels_per_unit = 1.0 / geometry.data_per_pixel
+        return 2 * np.pi * self.radius * pixels_per_unit / self.sequence_length
+
+    def _visible_sequence_window(self, geometry):
+        """Return the (start, end) sequence segment visible in the ax, i.e.
+        the full sequence, whatever the ``top_position``."""
+        return 0, self.sequence_length
+
+    def plot_features_density(
+        self, ax, features, color=None, max_height=0.4, geometry=None
+    ):
+        """Plot the density of a set of features as a ring inside the circle.
+
+        See ``GraphicRecord.plot_features_density`` for the parameters.
+        """
+        if len(features) == 0:
+            return
+        if geometry is None:
+            geometry = PlotGeometry.from_ax(ax)
+        start, end = self._visible_sequence_window(geometry)
+        n_bins = int(self._pixels_per_basepair(geometry) * self.sequence_length)
+        n_bins = max(1, n_bins)
+        density = self._compute_features_density(features, start, end, n_bins)
+        # Features wrapping around the origin are counted at both ends
+        length = self.sequence_length
+        density += self._compute_features_density(
+            features, start + length, end + length, n_bins
+        )
+        heights = max_height * self.feature_level_height * density / density.max()
+        positions = np.linspace(start, end, n_bins + 1)
+        angles = np.deg2rad(self.position_to_angle(positions))
+        inner_radii = self.radius - np.append(heights, heights[0])
+        outer_radii = np.full(n_bins + 1, self.radius)
+        radii = np.concatenate([outer_radii, inner_radii[::-1]])
+        angles = np.concatenate([angles, angles[::-1]])
+        ax.fill(
+            radii * np.cos(angles),
+            radii * np.sin(angles) - self.radius,
+            facecolor=color or self.default_density_color,
+            linewidth=0,
+            zorder=-100,
+        )
+
     def position_to_angle(self, position):
-        """Convert a sequence position into an angle in the figure."""
+        """Convert a sequence position into an angle in the figure.
+
+        The position can also be a NumPy array of positions, in which case an
+        array of angles is returned."""
         a = 360.0 * (position - self.top_position) / self.sequence_length
         return 90 - a
 
     def coordinates_in_plot(self, position, level):
         """Convert a sequence position and height level to (x, y) coordinates.
+
+        The position and level can also be NumPy arrays, in which case the
+        result is the (2, N) array of the x and y coordinates.
         """
+        position, level = np.asarray(position), np.asarray(level)
         r = self.radius + level * self.feature_level_height
         angle = self.position_to_angle(position)
         rad_angle = np.deg2rad(angle)
@@ -156,8 +265,6 @@ class CircularGraphicRecord(GraphicRecord):
         """
         return min(0.25, 3.0 * self.radius / (1.0 + max_annotations_level))
 
-    def compute_padding(self, ax):
+    def compute_padding(self, geometry):
         ""
-        ax_width = ax.get_window_extent(ax.figure.canvas.get_renderer()).width
-        xmin, xmax = ax.get_xlim()
-        return 3 * self.labels_spacing * (xmax - xmin) / (1.0 * ax_width)
+        return 3 * self.labels_spacing * geometry.data_per_pixel
@@ -0,0 +1,73 @@
+"""Implements an index of features for fast windowed queries."""
+
+from bisect import bisect_left, bisect_right
+
+
+class FeaturesIndex:
+    """Static interval index over a list of features.
+
+    The features are sorted by start, and the running maximum of their ends
+    is kept, so that the features overlapping a window are found with two
+    binary searches followed by a scan of the candidates only.
+
+    Parameters
+    ----------
+
+    features
+      A list of objects with ``start`` and ``end`` attributes, for instance
+      GraphicFeatures.
+    """
+
+    def __init__(self, features):
+        self.features = list(features)
+        self.bounds = [(f.start, f.end) for f in self.features]
+        self.order = sorted(range(len(features)), key=lambda i: features[i].start)
+        self.starts = [features[i].start for i in self.order]
+        self.max_ends = []
+        max_end = None
+        for i in self.order:
+            end = features[i].end
+            max_end = end if (max_end is None) else max(max_end, end)
+            self.max_ends.append(max_end)
+
+    def __len__(self):
+        return len(self.features)
+
+    def is_up_to_date(self, features):
+        """Return whether the index still describes the given features list,
+        i.e. the list holds the same features, with the same start and end,
+        as when the index was built.
+
+        This check is linear (much cheaper than rebuilding the index, but
+        much more expensive than a query), so it should be done once before a
+        series of queries, not before each query. It catches the in-place
+        edits of the list (``features[0] = ...``) or of the features
+        (``feature.start = ...``).
+        """
+        if len(features) != len(self.features):
+            return False
+        return all(
+            (f is indexed) and (f.start, f.end) == bounds
+            for f, indexed, bounds in zip(features, self.features, self.bounds)
+        )
+
+    def indices_in(self, start, end):
+        """Return the indices (in the features list) of all features
+        overlapping the (start, end) window, in increasing order.
+
+        A feature overlaps the window if it has at least one position in
+        common with it, as in ``GraphicFeature.crop``.
+        """
+        # All features before `first` end before the window's start, and all
+        # features after `last` start after the window's end.
+        first = bisect_left(self.max_ends, start)
+        last = bisect_right(self.starts, end)
+        features = self.features
+        return sorted(
+            i for i in self.order[first:last] if features[i].end >= start
+        )
+
+    def features_in(self, start, end):
+        """Return the features overlapping the (start, end) window, in the
+        order of the features list."""
+        return [self.features[i] for i in self.indices_in(start, end)]
@@ -1,6 +1,3 @@
-from copy import deepcopy
-
-
 class GraphicFeature:
     """Genetic Feature to be plotted.
 
@@ -101,10 +98,25 @@ class GraphicFeature:
         self.open_right = open_right
         self.legend_text = legend_text
 
+    def clone(self):
+        """Return a cheap copy of the feature.
+
+        Nothing is deep-copied: the clone shares its styling and the values
+        of its ``data`` with the original feature. Only the ``data`` and
+        ``fontdict`` dictionaries themselves are copied, so that setting
+        entries on the clone (as ``plot()`` does with data) doesn't affect the
+        original feature.
+        """
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone.data = dict(self.data)
+        clone.fontdict = dict(self.fontdict)
+        return clone
+
     def split_in_two(self, x_coord=0):
         """Return two features by cutting this feature at x_coord."""
-        copy1 = deepcopy(self)
-        copy2 = deepcopy(self)
+        copy1 = self.clone()
+        copy2 = self.clone()
         copy1.end = x_coord
         copy2.start = x_coord + 1
         return copy1, copy2
@@ -118,7 +130,7 @@ class GraphicFeature:
         s, e = window
         if (s > self.end) or (e < self.start):
             return None
-        copy = deepcopy(self)
+        copy = self.clone()
         if s > self.start:
             copy.start = s
             copy.open_left = True
@@ -0,0 +1,269 @@
+"""Implements the GraphicFeatureArray class, a compact storage for records
+with many features."""
+
+import weakref
+
+import numpy as np
+
+from .GraphicFeature import GraphicFeature
+from .compute_features_levels import compute_intervals_levels
+
+
+def _is_single_value(value):
+    """Return whether a value is a single label/color rather than a column."""
+    if isinstance(value, tuple):
+        return all(isinstance(e, (int, float)) for e in value)
+    return (value is None) or isinstance(value, str)
+
+
+def _factorize(values, n_rows):
+    """Return (unique_values, indices) for a column of hashable values.
+
+    ``values`` can also be a single value shared by all rows. Rows with value
+    None get index -1.
+    """
+    if _is_single_value(values):
+        values = n_rows * [values]
+    uniques, positions, indices = [], {}, np.empty(n_rows, dtype="int32")
+    for row, value in enumerate(values):
+        if value is None:
+            indices[row] = -1
+            continue
+        if value not in positions:
+            positions[value] = len(uniques)
+            uniques.append(value)
+        indices[row] = positions[value]
+    return uniques, indices
+
+
+class GraphicFeatureArray:
+    """Columnar storage of features, to be used in place of a list of
+    GraphicFeatures in a GraphicRecord with a very large number of features.
+
+    The coordinates are stored in NumPy arrays, the colors and labels are
+    stored as indices in lists of unique values, and all other properties
+    (thickness, linewidth, fontdict, etc.) are shared by all the features.
+
+    Indexing the array with an integer returns a GraphicFeature view of the
+    row. Views are only weakly cached: the same GraphicFeature is returned
+    as long as it is referenced somewhere (e.g. in the ``{feature: level}``
+    dict of a layout), and is then garbage-collected, so a full pass over the
+    features doesn't keep one GraphicFeature per row alive. Indexing with a
+    slice, a boolean mask or an array of indices returns a new
+    GraphicFeatureArray.
+
+    Parameters
+    ----------
+
+    starts, ends
+      Sequences of the features coordinates.
+
+    strands
+      Sequence of the features strands (+1, -1, or 0/None for no direction).
+      Leave to None for no direction on all features. None values are stored
+      as 0.
+
+    labels
+      Sequence of the features labels (None for no label), or a single label
+      for all features.
+
+    colors
+      Sequence of the features colors, or a single color for all features.
+      Colors must be hashable (e.g. "#ffd700" or (1, 0.5, 0)).
+
+    levels
+      Sequence of fixed levels for the features, with NaN (or None) for
+      features whose level must be computed at plot time. These levels end up
+      in the ``data["fixed_level"]`` of the GraphicFeature views.
+
+    open_left, open_right
+      Sequences of booleans, indicating cropped ends of the features.
+
+    **feature_properties
+      Any other GraphicFeature parameter (thickness, linewidth, fontdict,
+      box_color...) which will be shared by all features.
+
+    Examples
+    --------
+
+    >>> features = GraphicFeatureArray(
+    >>>     starts=[5, 20, 400], ends=[20, 500, 700], strands=[1, 1, -1],
+    >>>     labels=["a", "b", None], colors="#ffcccc"
+    >>> )
+    >>> record = GraphicRecord(sequence_length=1000, features=features)
+    """
+
+    def __init__(
+        self,
+        starts,
+        ends,
+        strands=None,
+        labels=None,
+        colors="#000080",
+        levels=None,
+        open_left=None,
+        open_right=None,
+        **feature_properties
+    ):
+        starts = np.asarray(starts, dtype="int64")
+        n_rows = len(starts)
+        if strands is None:
+            strands = np.zeros(n_rows, dtype="int8")
+        else:
+            strands = [0 if s is None else s for s in strands]
+        if levels is None:
+            levels = np.full(n_rows, np.nan)
+        else:
+            levels = [np.nan if l is None else l for l in levels]
+        if open_left is None:
+            open_left = np.zeros(n_rows, dtype=bool)
+        if open_right is None:
+            open_right = np.zeros(n_rows, dtype=bool)
+        self.labels, label_indices = _factorize(labels, n_rows)
+        self.colors, color_indices = _factorize(colors, n_rows)
+        self.feature_properties = feature_properties
+        self._set_columns(
+            starts=starts,
+            ends=np.asarray(ends, dtype="int64"),
+            strands=np.asarray(strands, dtype="int8"),
+            levels=np.asarray(levels, dtype="float64"),
+            label_indices=label_indices,
+            color_indices=color_indices,
+            open_left=np.asarray(open_left, dtype=bool),
+            open_right=np.asarray(open_right, dtype=bool),
+        )
+
+    def _set_columns(self, **columns):
+        for name, column in columns.items():
+            setattr(self, name, column)
+        self._views = weakref.WeakValueDictionary()
+
+    def _new_with_columns(self, **columns):
+        """Return a new array sharing the labels, colors and properties of
+        this array, with new columns."""
+        new_array = self.__class__.__new__(self.__class__)
+        new_array.labels = self.labels
+        new_array.colors = self.colors
+        new_array.feature_properties = self.feature_properties
+        new_array._set_columns(**columns)
+        return new_array
+
+    def _columns(self):
+        return dict(
+            starts=self.starts,
+            ends=self.ends,
+            strands=self.strands,
+            levels=self.levels,
+            label_indices=self.label_indices,
+            color_indices=self.color_indices,
+            open_left=self.open_left,
+            open_right=self.open_right,
+        )
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += len(self)
+            view = self._views.get(key)
+            if view is None:
+                view = self._views[key] = self._feature_view(key)
+            return view
+        columns = {name: col[key] for name, col in self._columns().items()}
+        return self._new_with_columns(**columns)
+
+    def _feature_view(self, i):
+        """Create the GraphicFeature corresponding to row i."""
+        label_index, color_index = self.label_indices[i], self.color_indices[i]
+        level = self.levels[i]
+        properties = dict(self.feature_properties)
+        if not np.isnan(level):
+            properties["fixed_level"] = float(level)
+        return GraphicFeature(
+            start=int(self.starts[i]),
+            end=int(self.ends[i]),
+            strand=int(self.strands[i]),
+            label=None if label_index < 0 else self.labels[label_index],
+            color=None if color_index < 0 else self.colors[color_index],
+            open_left=bool(self.open_left[i]),
+            open_right=bool(self.open_right[i]),
+            **properties
+        )
+
+    def indices_in(self, start, end):
+        """Return the indices of all features overlapping the (start, end)
+        window, in increasing order (same semantics as
+        ``FeaturesIndex.indices_in``)."""
+        mask = (self.starts <= end) & (self.ends >= start)
+        return np.flatnonzero(mask)
+
+    def features_in(self, start, end):
+        """Return the list of (views of) features overlapping the window."""
+        return [self[int(i)] for i in self.indices_in(start, end)]
+
+    def compute_levels(self):
+        """Return the levels of all features (see ``compute_features_levels``)
+        as a list, computed from the coordinates and fixed levels columns,
+        without creating the features' views."""
+        shared_level = self.feature_properties.get("fixed_level", None)
+        fixed_levels = [
+            shared_level if np.isnan(level) else level
+            for level in self.levels.tolist()
+        ]
+        nlines = len(self) * [self.feature_properties.get("nlines", 1)]
+        return compute_intervals_levels(
+            self.starts.tolist(),
+            self.ends.tolist(),
+            fixed_levels=fixed_levels,
+            nlines=nlines,
+        )
+
+    def split_overflowing(self, sequence_length):
+        """Return a new GraphicFeatureArray where the features overflowing
+        over the origin of a circular sequence are split in two (see
+        ``GraphicRecord.split_overflowing_features_circularly``)."""
+        starts, ends = self.starts, self.ends
+        left = (starts < 0) & (0 < ends)
+        right = ~left & (starts < sequence_length) & (sequence_length < ends)
+        rows = np.repeat(np.arange(len(self)), np.where(left | right, 2, 1))
+        split = self[rows]
+        second_half = np.zeros(len(rows), dtype=bool)
+        second_half[1:] = rows[1:] == rows[:-1]
+        left, right = left[rows], right[rows]
+        starts, ends = split.starts, split.ends
+        # Features over the origin: [start + L, L - 1] and [0, end]
+        first_left = left & ~second_half
+        starts[first_left] += sequence_length
+        ends[first_left] = sequence_length - 1
+        starts[left & second_half] = 0
+        # Features over the end: [start, L - 1] and [0, end - L]
+        ends[right & ~second_half] = sequence_length - 1
+        starts[right & second_half] = 0
+        ends[right & second_half] -= sequence_length
+        return split
+
+    def crop(self, window):
+        """Return a new GraphicFeatureArray with the fragments of the features
+        that are in the window (see ``GraphicFeature.crop``)."""
+        start, end = window
+        cropped = self[self.indices_in(start, end)]
+        open_left = cropped.open_left | (cropped.starts < start)
+        open_right = cropped.open_right | (cropped.ends > end)
+        cropped._set_columns(
+            **dict(
+                cropped._columns(),
+                starts=np.maximum(cropped.starts, start),
+                ends=np.minimum(cropped.ends, end),
+                open_left=open_left,
+                open_right=open_right,
+            )
+        )
+        return cropped
+
+    def __repr__(self):
+        return "GraphicFeatureArray(%d features)" % len(self)
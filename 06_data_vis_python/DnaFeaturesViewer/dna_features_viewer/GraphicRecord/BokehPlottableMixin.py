@@ -1,22 +1,7 @@
-try:
-    import bokeh
-    from bokeh.plotting import figure, ColumnDataSource
-    from bokeh.models import Range1d, HoverTool
-    from bokeh.core.properties import value
+import numpy as np
 
-    BOKEH_AVAILABLE = True
-except ImportError:
-    BOKEH_AVAILABLE = False
-
-try:
-    import pandas as pd
-
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
-
-from packaging import version
-import matplotlib.pyplot as plt
+from ..PlotProfiler import profile_phase
+from .PlotGeometry import PlotGeometry
 
 
 class BokehPlottableMixin:
@@ -56,9 +41,64 @@ class BokehPlottableMixin:
         result.update(kwargs)
         return result
 
-    def plot_with_bokeh(self, figure_width=5, figure_height="auto", tools="auto"):
+    def bokeh_features_patches(
+        self,
+        starts,
+        ends,
+        strands,
+        levels,
+        figure_width=5,
+        width=0.4,
+        arrow_width_inches=0.05,
+    ):
+        """Return the points coordinates of many Bokeh Feature arrows at once.
+
+        This is a vectorized version of ``bokeh_feature_patch``.
+
+        Parameters
+        ----------
+
+        starts, ends, strands, levels
+          Arrays of the features' coordinates, strands (+1, -1 or 0) and
+          levels.
+
+        Returns
+        -------
+
+        xs, ys
+          Two arrays of shape (n_features, 6) with the coordinates of the
+          arrows' points.
+        """
+        starts, ends = np.asarray(starts), np.asarray(ends)
+        strands, levels = np.asarray(strands), np.asarray(levels)
+        hw = width / 2.0
+        x1 = np.where(strands >= 0, starts, ends)
+        x2 = np.where(strands >= 0, ends, starts)
+        bp_per_width = figure_width / self.sequence_length
+        delta = arrow_width_inches / bp_per_width
+        head_base = np.where(
+            strands > 0,
+            np.maximum(x1, x2 - delta),
+            np.where(strands < 0, np.minimum(x1, x2 + delta), x2),
+        )
+        xs = np.column_stack([x1, x1, head_base, x2, head_base, x1])
+        ys = levels[:, None] + np.array([-hw, hw, hw, 0, -hw, -hw])
+        return xs, ys
+
+    def plot_with_bokeh(
+        self, figure_width=5, figure_height="auto", tools="auto", profiler=None
+    ):
         """Plot the graphic record using Bokeh.
 
+        Parameters
+        ----------
+
+        profiler
+          A PlotProfiler recording the phases of the plot: "plot_with_bokeh"
+          (the whole plot), "import_bokeh", "compute_layout" (see
+          ``compute_layout``), "plot_features" and "plot_labels". The artists
+          counted are the Bokeh renderers.
+
         Examples
         --------
 
@@ -66,29 +106,53 @@ class BokehPlottableMixin:
 
 
         """
-        if not BOKEH_AVAILABLE:
-            raise ImportError("``plot_with_bokeh`` requires Bokeh installed.")
-        if not PANDAS_AVAILABLE:
-            raise ImportError("``plot_with_bokeh`` requires Pandas installed.")
+        with profile_phase(profiler, "plot_with_bokeh"):
+            return self._plot_with_bokeh(
+                figure_width=figure_width,
+                figure_height=figure_height,
+                tools=tools,
+                profiler=profiler,
+            )
+
+    def _plot_with_bokeh(self, figure_width, figure_height, tools, profiler):
+        """Plot the graphic record using Bokeh (see ``plot_with_bokeh``)."""
+        # Bokeh is only imported here, as it is slow to import
+        with profile_phase(profiler, "import_bokeh"):
+            try:
+                import bokeh
+                from bokeh.plotting import figure, ColumnDataSource
+                from bokeh.models import Range1d, HoverTool
+                from bokeh.core.properties import value
+            except ImportError:
+                raise ImportError("``plot_with_bokeh`` requires Bokeh installed.")
+            from packaging import version
 
         # Set up default tools
         if tools == "auto":
             tools = [HoverTool(tooltips="@hover_html"), "xpan,xwheel_zoom,reset,tap"]
 
-        # FIRST PLOT WITH MATPLOTLIB AND GATHER INFOS ON THE PLOT
-        ax, (features_levels, plot_data) = self.plot(figure_width=figure_width)
-        width, height = [int(100 * e) for e in ax.figure.get_size_inches()]
-        plt.close(ax.figure)
+        # COMPUTE THE LAYOUT OF THE PLOT (WITHOUT PLOTTING WITH MATPLOTLIB)
+        start, end = self.span
+        x_lim = (start - 0.8, end - 0.2)
+        geometry = PlotGeometry.from_figure_width(figure_width, x_lim)
+        with profile_phase(profiler, "compute_layout"):
+            layout = self.compute_layout(geometry, profiler=profiler)
+        features_levels = layout["features_levels"]
+        annotations = layout["outline_annotations"]
+        width = int(100 * figure_width)
         if figure_height == "auto":
-            height = int(0.5 * height)
+            ymax = self._compute_natural_ymax(
+                features_levels=max([1] + list(features_levels.values())),
+                annotations_max_level=layout["max_annotations_level"],
+                annotations_are_elevated=layout["annotations_are_elevated"],
+            )
+            height = int(0.5 * int(100 * self._auto_figure_height(ymax)))
         else:
             height = 100 * figure_height
         height = max(height, 185)  # Minimal height to see all icons
 
-        max_y = max(
-            [data["annotation_y"] for f, data in plot_data.items()]
-            + list(features_levels.values())
-        )
+        annotations_y = [annotation["link"][0][1] for annotation in annotations]
+        max_y = max(annotations_y + list(features_levels.values()))
 
         # BUILD THE PLOT ()
         plot = figure(
@@ -98,83 +162,84 @@ class BokehPlottableMixin:
             x_range=Range1d(0, self.sequence_length),
             y_range=Range1d(-1, max_y + 1),
         )
-        plot.patches(
-            xs="xs",
-            ys="ys",
-            color="color",
-            line_color="#000000",
-            source=ColumnDataSource(
-                pd.DataFrame.from_records(
-                    [
-                        self.bokeh_feature_patch(
-                            feature.start,
-                            feature.end,
-                            feature.strand,
-                            figure_width=figure_width,
-                            level=level,
-                            color=feature.color,
-                            label=feature.label,
-                            hover_html=(
-                                feature.html
-                                if feature.html is not None
-                                else feature.label
-                            ),
-                        )
-                        for feature, level in features_levels.items()
-                    ]
-                )
-            ),
-        )
 
-        if plot_data != {}:
-            if version.parse(bokeh.__version__) < version.parse("2.3"):
-                value_arial = "arial"
-            else:  # >= 2.3
-                value_arial = value("arial")
-            plot.text(
-                x="x",
-                y="y",
-                text="text",
-                text_align="center",
-                text_font_size="12px",
-                text_font=value_arial,
-                text_font_style="normal",
-                source=ColumnDataSource(
-                    pd.DataFrame.from_records(
-                        [
-                            dict(
-                                x=feature.x_center,
-                                y=pdata["annotation_y"],
-                                text=feature.label,
-                                color=feature.color,
-                            )
-                            for feature, pdata in plot_data.items()
-                        ]
-                    )
-                ),
+        def count_artists():
+            return len(plot.renderers)
+
+        with profile_phase(profiler, "plot_features", count_artists):
+            features = list(features_levels)
+            n_features = len(features)
+            xs, ys = self.bokeh_features_patches(
+                starts=np.fromiter((f.start for f in features), float, n_features),
+                ends=np.fromiter((f.end for f in features), float, n_features),
+                strands=np.fromiter((f.strand or 0 for f in features), int, n_features),
+                levels=np.fromiter(features_levels.values(), float, n_features),
+                figure_width=figure_width,
             )
-            plot.segment(
-                x0="x0",
-                x1="x1",
-                y0="y0",
-                y1="y1",
-                line_width=0.5,
-                color="#000000",
+            plot.patches(
+                xs="xs",
+                ys="ys",
+                color="color",
+                line_color="#000000",
                 source=ColumnDataSource(
-                    pd.DataFrame.from_records(
-                        [
-                            dict(
-                                x0=feature.x_center,
-                                x1=feature.x_center,
-                                y0=pdata["annotation_y"],
-                                y1=pdata["feature_y"],
-                            )
-                            for feature, pdata in plot_data.items()
-                        ]
+                    dict(
+                        xs=list(xs),
+                        ys=list(ys),
+                        color=[f.color for f in features],
+                        label=[f.label for f in features],
+                        hover_html=[
+                            f.label if f.html is None else f.html for f in features
+                        ],
                     )
                 ),
             )
 
+        with profile_phase(profiler, "plot_labels", count_artists):
+            if len(annotations):
+                if version.parse(bokeh.__version__) < version.parse("2.3"):
+                    value_arial = "arial"
+                else:  # >= 2.3
+                    value_arial = value("arial")
+                annotated_features = [
+                    annotation["feature"] for annotation in annotations
+                ]
+                x_centers = [feature.x_center for feature in annotated_features]
+                plot.text(
+                    x="x",
+                    y="y",
+                    text="text",
+                    text_align="center",
+                    text_font_size="12px",
+                    text_font=value_arial,
+                    text_font_style="normal",
+                    source=ColumnDataSource(
+                        dict(
+                            x=x_centers,
+                            y=annotations_y,
+                            text=[feature.label for feature in annotated_features],
+                            color=[feature.color for feature in annotated_features],
+                        )
+                    ),
+                )
+                plot.segment(
+                    x0="x0",
+                    x1="x1",
+                    y0="y0",
+                    y1="y1",
+                    line_width=0.5,
+                    color="#000000",
+                    source=ColumnDataSource(
+                        dict(
+                            x0=x_centers,
+                            x1=x_centers,
+                            y0=annotations_y,
+                            y1=[
+                                annotation["link"][1][1] for annotation in annotations
+                            ],
+                        )
+                    ),
+                )
+
         plot.yaxis.visible = False
         plot.outline_line_color = None
         plot.grid.grid_line_color = None
@@ -0,0 +1,87 @@
+"""Implements a Matplotlib collection drawing many feature arrows at once."""
+
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.transforms import IdentityTransform
+
+
+class FeatureArrowsCollection(PolyCollection):
+    """Collection of straight arrows drawn like the FancyArrowPatches of
+    ``GraphicRecord.plot_feature`` (``ArrowStyle.Simple``).
+
+    As for FancyArrowPatches, the arrows' extremities are in data coordinates
+    while their thickness and head length are in points, so the polygons are
+    recomputed (with vectorized NumPy) in display coordinates at draw time.
+
+    Parameters
+    ----------
+
+    x1, x2
+      Arrays of the x-coordinates of the arrows' tails and heads, in data
+      coordinates.
+
+    y
+      Array of the y-coordinates of the arrows, in data coordinates.
+
+    thicknesses
+      Array of the thicknesses of the arrows (head and tail), in points.
+
+    head_lengths
+      Array of the lengths of the arrows' heads, in points.
+
+    **kwargs
+      Other PolyCollection properties (facecolors, edgecolors, linewidths,
+      zorder...).
+    """
+
+    def __init__(self, x1, x2, y, thicknesses, head_lengths, **kwargs):
+        kwargs.setdefault("joinstyle", "round")
+        kwargs.setdefault("capstyle", "round")
+        PolyCollection.__init__(self, [], **kwargs)
+        self.x1, self.x2, self.y = x1, x2, y
+        self.thicknesses = thicknesses
+        self.head_lengths = head_lengths
+
+    def _compute_polygons(self, points_to_pixels):
+        """Return the (n_arrows, 7, 2) array of the arrows' polygons, in
+        display coordinates."""
+        transform = self.axes.transData
+        tails = transform.transform(np.column_stack([self.x1, self.y]))
+        heads = transform.transform(np.column_stack([self.x2, self.y]))
+        half_widths = (0.5 * points_to_pixels * self.thicknesses)[:, None]
+        head_lengths = points_to_pixels * self.head_lengths
+        deltas = heads - tails
+        lengths = np.hypot(deltas[:, 0], deltas[:, 1])
+        directions = np.array([1.0, 0.0]) * np.ones_like(deltas)
+        nonzero = lengths > 0
+        directions[nonzero] = deltas[nonzero] / lengths[nonzero, None]
+        normals = np.column_stack([-directions[:, 1], directions[:, 0]])
+        head_bases = heads - directions * head_lengths[:, None]
+        # Arrows shorter than their head have no tail (as in ArrowStyle.Simple)
+        tails = np.where((head_lengths < lengths)[:, None], tails, head_bases)
+        offsets = normals * half_widths
+        return np.stack(
+            [
+                tails + offsets,
+                head_bases + offsets,
+                heads,
+                head_bases - offsets,
+                tails - offsets,
+            ],
+            axis=1,
+        )
+
+    def update_ax_datalim(self):
+        """Update the ax's data limits with the current extent of the arrows,
+        as ``ax.add_patch`` does for every FancyArrowPatch."""
+        points_to_pixels = self.figure.dpi / 72.0
+        polygons = self._compute_polygons(points_to_pixels)
+        points = self.axes.transData.inverted().transform(polygons.reshape(-1, 2))
+        self.axes.update_datalim(points)
+        self.axes.autoscale_view(scalex=False)
+
+    def draw(self, renderer):
+        polygons = self._compute_polygons(renderer.points_to_pixels(1.0))
+        self.set_verts(polygons)
+        self.set_transform(IdentityTransform())
+        PolyCollection.draw(self, renderer)
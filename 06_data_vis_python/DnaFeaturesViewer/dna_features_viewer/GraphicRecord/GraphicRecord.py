@@ -1,18 +1,10 @@
 # -*- coding: utf-8 -*-
-from ..biotools import find_narrowest_text_wrap
-
-from Bio.Seq import Seq
-from Bio.SeqRecord import SeqRecord
-from Bio.SeqFeature import FeatureLocation, SeqFeature
+from collections import OrderedDict
 
-try:
-    # Biopython <1.78
-    from Bio.Alphabet import DNAAlphabet
-
-    has_dna_alphabet = True
-except ImportError:
-    # Biopython >=1.78
-    has_dna_alphabet = False
+from ..biotools import find_narrowest_text_wrap
+from ..FeaturesIndex import FeaturesIndex
+from ..compute_features_levels import IncrementalLayout
+from ..GraphicFeatureArray import GraphicFeatureArray
 
 from .MatplotlibPlottableMixin import MatplotlibPlottableMixin
 from .BokehPlottableMixin import BokehPlottableMixin
@@ -28,7 +20,8 @@ class GraphicRecord(MatplotlibPlottableMixin, BokehPlottableMixin):
       Length of the DNA sequence, in number of nucleotides.
 
     features
-      list of GraphicalFeature objects.
+      list of GraphicalFeature objects, or a GraphicFeatureArray for records
+      with a very large number of features.
 
     feature_level_height
       Width in inches of one "level" for feature arrows.
@@ -74,6 +67,22 @@ class GraphicRecord(MatplotlibPlottableMixin, BokehPlottableMixin):
         Value to use for elevate_outline_annotations when no specific value is
         given at ``graphic_record.plot(...)`` time. Set to true to have all
         text annotations appears above all features, or false else.
+
+      default_level_of_detail
+        Value to use for level_of_detail when no specific value is given at
+        ``graphic_record.plot(...)`` time (None for full detail).
+
+      default_label_pixel_threshold
+        Value to use for label_pixel_threshold when no specific value is given
+        at ``graphic_record.plot(...)`` time.
+
+      default_density_color
+        Color of the density strip representing the features too small to be
+        drawn in level-of-detail mode.
+
+      default_batch_artists
+        Value to use for batch_artists when no specific value is given at
+        ``graphic_record.plot(...)`` time.
     """
 
     default_font_family = None
@@ -103,6 +112,112 @@ class GraphicRecord(MatplotlibPlottableMixin, BokehPlottableMixin):
         self.labels_spacing = labels_spacing
         self.ticks_resolution = ticks_resolution
 
+    @property
+    def features(self):
+        """List of the record's GraphicFeatures.
+
+        Reassigning the features (``record.features = new_features``) resets
+        the index used by ``features_in`` and ``crop``, the cached line
+        heights of ``plot_on_multiple_lines``, and the incremental layout.
+        After editing the list or the features' locations in place, call
+        ``invalidate_features_index()`` before using ``features_in`` or
+        ``crop``.
+        """
+        return self._features
+
+    @features.setter
+    def features(self, features):
+        self._features = features
+        self._incremental_layout = None
+        self._reset_features_caches()
+
+    def _reset_features_caches(self):
+        self._features_index = None
+        self._lines_heights_cache = OrderedDict()
+
+    def invalidate_features_index(self):
+        """Reset the index used by ``features_in`` and ``crop``.
+
+        This is done automatically when the features are reassigned or
+        changed with ``add_feature`` and ``remove_feature``, but must be done
+        by hand after replacing items of ``record.features`` or changing the
+        start or end of a feature in place.
+        """
+        self._features_index = None
+
+    def _validate_features_index(self):
+        """Reset the features index if the features were edited in place
+        since it was built. This check is linear in the number of features,
+        so it is done once per multi-window operation (such as
+        ``plot_on_multiple_lines``), not at every ``features_in`` query."""
+        index = self._features_index
+        if (index is not None) and not index.is_up_to_date(self.features):
+            self.invalidate_features_index()
+
+    @property
+    def incremental_layout(self):
+        """IncrementalLayout of the record's features, created at the first
+        access.
+
+        Once created, the levels of the features are kept up to date by
+        ``add_feature`` and ``remove_feature`` (which only recompute the
+        levels of the features overlapping the added or removed feature,
+        directly or indirectly), and are used by ``plot()`` instead of
+        recomputing the levels of all features. If the features list or the
+        features are edited in place, ``plot()`` drops the incremental layout
+        and recomputes all levels.
+        """
+        if self._incremental_layout is None:
+            if isinstance(self.features, GraphicFeatureArray):
+                raise TypeError("Not available for GraphicFeatureArray features.")
+            self._incremental_layout = IncrementalLayout(self.features)
+        return self._incremental_layout
+
+    def add_feature(self, feature):
+        """Add a GraphicFeature to the record (at the end of the features).
+
+        Returns the dict {feature: new level} of the features whose level
+        changed, if the record has an ``incremental_layout``, else None.
+        """
+        if isinstance(self.features, GraphicFeatureArray):
+            raise TypeError("Can't add features to a GraphicFeatureArray.")
+        self._features = list(self._features) + [feature]
+        self._reset_features_caches()
+        if self._incremental_layout is not None:
+            return self._incremental_layout.add_feature(feature)
+
+    def remove_feature(self, feature):
+        """Remove a GraphicFeature from the record.
+
+        Returns the dict {feature: new level} of the features whose level
+        changed, if the record has an ``incremental_layout``, else None.
+        """
+        if isinstance(self.features, GraphicFeatureArray):
+            raise TypeError("Can't remove features from a GraphicFeatureArray.")
+        if not any(f is feature for f in self._features):
+            raise ValueError("The feature is not in the record.")
+        self._features = [f for f in self._features if f is not feature]
+        self._reset_features_caches()
+        if self._incremental_layout is not None:
+            return self._incremental_layout.remove_feature(feature)
+
+    def features_in(self, start, end):
+        """Return the features overlapping the (start, end) window.
+
+        The features are returned in the same order as in ``self.features``.
+        The interval index used for the query is built at the first call and
+        cached until the features are reassigned or changed with
+        ``add_feature``/``remove_feature``, or the number of features
+        changes. After editing features in place, call
+        ``invalidate_features_index()``.
+        """
+        if isinstance(self.features, GraphicFeatureArray):
+            return self.features.features_in(start, end)
+        index = self._features_index
+        if (index is None) or (len(index) != len(self.features)):
+            index = self._features_index = FeaturesIndex(self.features)
+        return index.features_in(start, end)
+
     @property
     def last_index(self):
         return self.first_index + self.sequence_length
@@ -123,6 +238,19 @@ class GraphicRecord(MatplotlibPlottableMixin, BokehPlottableMixin):
         with open("example.gb", "w+") as f:
             SeqIO.write(record, f, "genbank")
         """
+        from Bio.Seq import Seq
+        from Bio.SeqRecord import SeqRecord
+        from Bio.SeqFeature import FeatureLocation, SeqFeature
+
+        try:
+            # Biopython <1.78
+            from Bio.Alphabet import DNAAlphabet
+
+            has_dna_alphabet = True
+        except ImportError:
+            # Biopython >=1.78
+            has_dna_alphabet = False
+
         features = [
             SeqFeature(
                 FeatureLocation(f.start, f.end, f.strand),
@@ -147,11 +275,14 @@ class GraphicRecord(MatplotlibPlottableMixin, BokehPlottableMixin):
         first_index = self.first_index
         if (start < first_index) or (end > self.last_index):
             raise ValueError("out-of-bound cropping")
-        new_features = []
-        for f in self.features:
-            cropped_feature = f.crop(window)
-            if cropped_feature is not None:  # = has ovelap with the window
-                new_features.append(cropped_feature)
+        if isinstance(self.features, GraphicFeatureArray):
+            new_features = self.features.crop(window)
+        else:
+            new_features = []
+            for f in self.features_in(start, end):
+                cropped_feature = f.crop(window)
+                if cropped_feature is not None:  # = has ovelap with the window
+                    new_features.append(cropped_feature)
 
         return GraphicRecord(
             sequence=self.sequence[start - first_index : end - first_index]
@@ -182,6 +313,9 @@ class GraphicRecord(MatplotlibPlottableMixin, BokehPlottableMixin):
     def split_overflowing_features_circularly(self):
         """Split the features that overflow over the edge for circular
         constructs (inplace)."""
+        if isinstance(self.features, GraphicFeatureArray):
+            self.features = self.features.split_overflowing(self.sequence_length)
+            return
         new_features = []
         for f in self.features:
             if f.start < 0 < f.end:
@@ -209,7 +343,7 @@ class GraphicRecord(MatplotlibPlottableMixin, BokehPlottableMixin):
             label = find_narrowest_text_wrap(label, max_line_length)
         return label
 
-    def compute_padding(self, ax):
-        ax_width = ax.get_window_extent(ax.figure.canvas.get_renderer()).width
-        xmin, xmax = ax.get_xlim()
-        return self.labels_spacing * (xmax - xmin) / (1.0 * ax_width)
+    def compute_padding(self, geometry):
+        """Return the labels' padding in data coordinates, for a plot with
+        the given PlotGeometry."""
+        return self.labels_spacing * geometry.data_per_pixel
@@ -1,24 +1,51 @@
 """Useful functions for the library"""
 
 import colorsys
+import threading
+from functools import lru_cache
+from io import BytesIO
 
-import matplotlib.pyplot as plt
+import numpy as np
+
+from matplotlib import rcParams
+from matplotlib.collections import LineCollection
+from matplotlib.text import Text
 import matplotlib.patches as mpatches
 from matplotlib.patches import Patch
 import matplotlib.ticker as ticker
 
 from ..compute_features_levels import compute_features_levels
 from ..GraphicFeature import GraphicFeature
+from ..GraphicFeatureArray import GraphicFeatureArray
+from ..PlotProfiler import profile_phase
 from matplotlib.colors import colorConverter
+from .FeatureArrowsCollection import FeatureArrowsCollection
 from .MultilinePlottableMixin import MultilinePlottableMixin
+from .PlotGeometry import PlotGeometry, AxGeometry
 from .SequenceAndTranslationMixin import SequenceAndTranslationMixin
 
 
+LAYOUT_PARAMETERS = (
+    "annotate_inline",
+    "max_label_length",
+    "max_line_length",
+    "level_offset",
+    "strand_in_label_threshold",
+    "elevate_outline_annotations",
+    "level_of_detail",
+    "label_pixel_threshold",
+)
+
+
 class MatplotlibPlottableMixin(MultilinePlottableMixin, SequenceAndTranslationMixin):
     """Class mixin for matplotlib-related methods."""
 
     default_elevate_outline_annotations = False
     default_strand_in_label_threshold = None
+    default_level_of_detail = None
+    default_label_pixel_threshold = None
+    default_batch_artists = False
+    default_density_color = "#7245dc"
 
     def initialize_ax(self, ax, draw_line, with_ruler, ruler_color=None):
         """Initialize the ax: remove axis, draw a horizontal line, etc.
@@ -50,8 +77,7 @@ class MatplotlibPlottableMixin(MultilinePlottableMixin, SequenceAndTranslationMi
         ax.set_xlim(plot_start, plot_end)
         if self.first_index != 0:
             ax.ticklabel_format(useOffset=False, style="plain")
-        fmt = lambda x, p: "{:,}".format(int(x))
-        ax.xaxis.set_major_formatter(ticker.FuncFormatter(fmt))
+        ax.xaxis.set_major_formatter(ticker.FuncFormatter(_format_tick))
         if self.ticks_resolution == "auto":
             ax.xaxis.set_major_locator(ticker.MaxNLocator(integer=True))
         else:
@@ -92,14 +118,9 @@ class MatplotlibPlottableMixin(MultilinePlottableMixin, SequenceAndTranslationMi
           all constraints fit.
         """
 
-        # Compute the "natural" ymax
-        annotation_height = self.determine_annotation_height(None)
-        features_ymax = self.feature_level_height * (features_levels + 1)
-        annotations_ymax = annotation_height * annotations_max_level
-        if annotations_are_elevated:
-            ymax = features_ymax + annotations_ymax
-        else:
-            ymax = max(features_ymax, annotations_ymax) + 1
+        ymax = self._compute_natural_ymax(
+            features_levels, annotations_max_level, annotations_are_elevated
+        )
         ymin = min(ax.get_ylim()[0], -0.5)
 
         # ymax could be even bigger if a "ideal_yspan" has been set.
@@ -108,7 +129,7 @@ class MatplotlibPlottableMixin(MultilinePlottableMixin, SequenceAndTranslationMi
         ax.set_ylim(ymin, ymax)
         if auto_figure_height:
             figure_width = ax.figure.get_size_inches()[0]
-            ax.figure.set_size_inches(figure_width, 1 + 0.4 * ymax)
+            ax.figure.set_size_inches(figure_width, self._auto_figure_height(ymax))
         ax.set_xticks(
             [
                 t
@@ -120,6 +141,23 @@ class MatplotlibPlottableMixin(MultilinePlottableMixin, SequenceAndTranslationMi
             ax.set_xticklabels([int(i + 1) for i in ax.get_xticks()])
         return ideal_yspan / (ymax - ymin)
 
+    def _compute_natural_ymax(
+        self, features_levels, annotations_max_level, annotations_are_elevated
+    ):
+        """Return the ymax fitting all features and annotations."""
+        annotation_height = self.determine_annotation_height(None)
+        features_ymax = self.feature_level_height * (features_levels + 1)
+        annotations_ymax = annotation_height * annotations_max_level
+        if annotations_are_elevated:
+            return features_ymax + annotations_ymax
+        else:
+            return max(features_ymax, annotations_ymax) + 1
+
+    @staticmethod
+    def _auto_figure_height(ymax):
+        """Return the figure height counting ~0.4 inch per level."""
+        return 1 + 0.4 * ymax
+
     @staticmethod
     def _get_ax_width(ax, unit="inch"):
         """Return the ax's width in 'inches' or 'pixel'."""
@@ -130,7 +168,110 @@ class MatplotlibPlottableMixin(MultilinePlottableMixin, SequenceAndTranslationMi
             width *= ax.figure.dpi
         return width
 
-    def plot_feature(self, ax, feature, level, linewidth=1.0):
+    def _pixels_per_basepair(self, geometry):
+        """Return the width in pixels of one nucleotide in the plot."""
+        return 1.0 / geometry.data_per_pixel
+
+    def _visible_sequence_window(self, geometry):
+        """Return the (start, end) sequence segment visible in the plot."""
+        return sorted(geometry.x_lim)
+
+    def _split_features_by_detail(self, geometry, min_pixels):
+        """Return the features to be plotted in full detail (a list) and the
+        features narrower than ``min_pixels`` pixels (a list, or a
+        GraphicFeatureArray if the record's features are stored in one).
+
+        Features completely outside of the visible window are left out.
+        """
+        pixels_per_basepair = self._pixels_per_basepair(geometry)
+        xmin, xmax = self._visible_sequence_window(geometry)
+        features = self.features
+        if isinstance(features, GraphicFeatureArray):
+            starts = np.minimum(features.starts, features.ends)
+            ends = np.maximum(features.starts, features.ends)
+            visible = (ends >= xmin) & (starts <= xmax)
+            narrow = (ends - starts) * pixels_per_basepair < min_pixels
+            detailed = np.flatnonzero(visible & ~narrow)
+            detailed_features = [features[int(i)] for i in detailed]
+            return detailed_features, features[visible & narrow]
+        detailed_features, aggregated_features = [], []
+        for feature in features:
+            if (max(feature.start, feature.end) < xmin) or (
+                min(feature.start, feature.end) > xmax
+            ):
+                continue
+            if feature.length * pixels_per_basepair < min_pixels:
+                aggregated_features.append(feature)
+            else:
+                detailed_features.append(feature)
+        return detailed_features, aggregated_features
+
+    @staticmethod
+    def _compute_features_density(features, start, end, n_bins):
+        """Return the number of features covering each of the ``n_bins`` bins
+        spanning the (start, end) segment."""
+        if isinstance(features, GraphicFeatureArray):
+            starts, ends = features.starts, features.ends
+        else:
+            starts = np.array([f.start for f in features])
+            ends = np.array([f.end for f in features])
+        starts, ends = np.minimum(starts, ends), np.maximum(starts, ends)
+        bin_size = 1.0 * (end - start) / n_bins
+        first_bins = ((starts - start) // bin_size).astype(int)
+        last_bins = ((ends - start) // bin_size).astype(int)
+        increments = np.zeros(n_bins + 1)
+        np.add.at(increments, np.clip(first_bins, 0, n_bins), 1)
+        np.add.at(increments, np.clip(last_bins + 1, 0, n_bins), -1)
+        return np.cumsum(increments[:-1])
+
+    def plot_features_density(
+        self, ax, features, color=None, max_height=0.4, geometry=None
+    ):
+        """Plot the density of a set of features as a strip under the line.
+
+        The strip has one bin per pixel of the ax, so the plotting time
+        doesn't depend on the number of features. This is used by ``plot()``
+        in level-of-detail mode to represent the features too narrow to be
+        drawn individually.
+
+        Parameters
+        ----------
+
+        ax
+          The Matplotlib ax on which to plot the density.
+
+        features
+          List (or GraphicFeatureArray) of GraphicFeatures.
+
+        color
+          Color of the strip. Defaults to the class' ``default_density_color``.
+
+        max_height
+          Height of the strip where the density is maximal, in levels.
+
+        geometry
+          The geometry of the ax (e.g. the AxGeometry of the plot), computed
+          from the ax if not provided.
+        """
+        if len(features) == 0:
+            return
+        if geometry is None:
+            geometry = PlotGeometry.from_ax(ax)
+        xmin, xmax = self._visible_sequence_window(geometry)
+        n_bins = max(1, int(geometry.ax_width))
+        density = self._compute_features_density(features, xmin, xmax, n_bins)
+        heights = max_height * self.feature_level_height * density / density.max()
+        ax.fill_between(
+            np.linspace(xmin, xmax, n_bins + 1),
+            0,
+            -np.append(heights, heights[-1]),
+            step="post",
+            facecolor=color or self.default_density_color,
+            linewidth=0,
+            zorder=-100,
+        )
+
+    def plot_feature(self, ax, feature, level, linewidth=1.0, geometry=None):
         """Create an Arrow Matplotlib patch with the feature's coordinates.
 
         The Arrow points in the direction of the feature's strand.
@@ -139,6 +280,10 @@ class MatplotlibPlottableMixin(MultilinePlottableMixin, SequenceAndTranslationMi
 
         The x-coordinates of the patch are determined by the feature's
         `start` and `end` while the y-coordinates are determined by the `level`.
+
+        The arrow head's length depends on the width of the ax in pixels,
+        taken from the ``geometry`` if provided (``plot()`` provides the
+        AxGeometry of the plot so it is not recomputed for every feature).
         """
         x1, x2 = feature.start, feature.end
         if feature.open_left:
@@ -156,7 +301,9 @@ class MatplotlibPlottableMixin(MultilinePlottableMixin, SequenceAndTranslationMi
         if is_undirected or head_is_cut:
             head_length = 0.001
         else:
-            width_pixel = self._get_ax_width(ax, unit="pixel")
+            if geometry is None:
+                geometry = PlotGeometry.from_ax(ax)
+            width_pixel = geometry.ax_width
             head_length = 0.5 * width_pixel * feature.length / self.sequence_length
             head_length = min(head_length, 0.6 * feature.thickness)
 
@@ -180,6 +327,66 @@ class MatplotlibPlottableMixin(MultilinePlottableMixin, SequenceAndTranslationMi
         ax.add_patch(patch)
         return patch
 
+    def plot_features_batch(self, ax, features_levels, geometry=None):
+        """Plot all features as a single collection of arrows.
+
+        This gives the same result as calling ``plot_feature`` for every
+        feature, but with a single Matplotlib artist, which is much faster to
+        draw and gives much smaller SVG/PDF files for records with many
+        features.
+
+        Parameters
+        ----------
+
+        ax
+          The Matplotlib ax on which to plot the features.
+
+        features_levels
+          List of ``(feature, level)`` in the order in which they should be
+          drawn.
+
+        geometry
+          The geometry of the ax, see ``plot_feature``.
+        """
+        if len(features_levels) == 0:
+            return None
+        features = [feature for feature, level in features_levels]
+        levels = np.array([level for feature, level in features_levels])
+        starts = np.array([f.start for f in features], dtype=float)
+        ends = np.array([f.end for f in features], dtype=float)
+        strands = np.array([0 if f.strand is None else f.strand for f in features])
+        open_left = np.array([f.open_left for f in features], dtype=bool)
+        open_right = np.array([f.open_right for f in features], dtype=bool)
+        thicknesses = np.array([f.thickness for f in features], dtype=float)
+
+        # Same coordinates and head lengths as in plot_feature
+        lefts, rights = starts - open_left, ends + open_right
+        x1 = np.where(strands == -1, rights, lefts) - 0.5
+        x2 = np.where(strands == -1, lefts, rights) - 0.5
+        is_undirected = (strands != -1) & (strands != 1)
+        head_is_cut = ((strands == 1) & open_right) | ((strands == -1) & open_left)
+        if geometry is None:
+            geometry = PlotGeometry.from_ax(ax)
+        width_pixel = geometry.ax_width
+        head_lengths = 0.5 * width_pixel * np.abs(ends - starts) / self.sequence_length
+        head_lengths = np.minimum(head_lengths, 0.6 * thicknesses)
+        head_lengths[is_undirected | head_is_cut] = 0.001
+
+        collection = FeatureArrowsCollection(
+            x1=x1,
+            x2=x2,
+            y=self.feature_level_height * levels,
+            thicknesses=thicknesses,
+            head_lengths=head_lengths,
+            facecolors=[f.color for f in features],
+            edgecolors=[f.linecolor for f in features],
+            linewidths=[f.linewidth for f in features],
+            zorder=0,
+        )
+        ax.add_collection(collection, autolim=False)
+        collection.update_ax_datalim()
+        return collection
+
     def autoselect_label_color(self, background_color):
         """Autselect a color for the label font.
 
@@ -190,30 +397,20 @@ class MatplotlibPlottableMixin(MultilinePlottableMixin, SequenceAndTranslationMi
         luminosity = 0.299 * r + 0.587 * g + 0.114 * b
         return "black" if (luminosity >= 0.5) else "white"
 
-    def annotate_feature(
+    def compute_annotation_text_params(
         self,
-        ax,
         feature,
         level,
         inline=False,
         max_label_length=50,
         max_line_length=30,
-        padding=0,
         indicate_strand_in_label=False,
     ):
-        """Create a Matplotlib Text with the feature's label.
-
-        The x-coordinates of the text are determined by the feature's
-        `x_center` while the y-coordinates are determined by the `level`.
-
-        The text is horizontally and vertically centered.
-
-        The Arrow points in the direction of the feature's strand.
-        If the feature has no direction (strand==0), the returned patch will
-        simply be a rectangle.
+        """Return the parameters of the Matplotlib Text of a feature's label.
 
-        The x-coordinates of the patch are determined by the feature's
-        `start` and `end` while the y-coordinates are determined by the `level`.
+        The result is a dict of keyword arguments for ``ax.text()``. The text
+        is horizontally and vertically centered on the feature's `x_center`
+        at the height of the given `level`.
         """
         x, y = self.coordinates_in_plot(feature.x_center, level)
         label = feature.label
@@ -229,7 +426,6 @@ class MatplotlibPlottableMixin(MultilinePlottableMixin, SequenceAndTranslationMi
                 max_label_length=max_label_length,
                 max_line_length=max_line_length,
             )
-        nlines = len(label.split("\n"))
         fontdict = dict(**feature.fontdict)
         if "family" not in fontdict and (self.default_font_family is not None):
             fontdict["family"] = self.default_font_family
@@ -248,21 +444,144 @@ class MatplotlibPlottableMixin(MultilinePlottableMixin, SequenceAndTranslationMi
                 ec="0.5",
                 lw=feature.box_linewidth,
             )
-        text = ax.text(
-            x,
-            y,
-            label,
+        return dict(
+            x=x,
+            y=y,
+            s=label,
             horizontalalignment="center",
             verticalalignment="center",
             bbox=bbox,
             fontdict=fontdict,
             zorder=2,
         )
-        x1, y1, x2, y2 = get_text_box(text)
-        x1 -= padding
-        x2 += padding
+
+    def measure_annotation(
+        self,
+        geometry,
+        feature,
+        level,
+        inline=False,
+        max_label_length=50,
+        max_line_length=30,
+        padding=0,
+        indicate_strand_in_label=False,
+    ):
+        """Compute the text of a feature's label and its extent in the plot,
+        without drawing anything.
+
+        The text dimensions are obtained from ``measure_text`` (cached font
+        metrics) rather than from the canvas renderer, and converted to data
+        coordinates using the plot's ``geometry`` (a PlotGeometry).
+
+        Returns
+        -------
+
+        text_params, overflowing, nlines, (x1, x2), height
+          Where ``text_params`` are the keyword arguments of ``ax.text()``
+          to draw the label, ``overflowing`` indicates whether the label
+          (padded horizontally by `padding`) overflows from the feature,
+          ``(x1, x2)`` is the padded horizontal span of the label in data
+          coordinates and ``height`` is the label's height in pixels.
+        """
+        text_params = self.compute_annotation_text_params(
+            feature=feature,
+            level=level,
+            inline=inline,
+            max_label_length=max_label_length,
+            max_line_length=max_line_length,
+            indicate_strand_in_label=indicate_strand_in_label,
+        )
+        label = text_params["s"]
+        nlines = len(label.split("\n"))
+        width, height = measure_text(label, text_params["fontdict"], geometry.dpi)
+        half_width = 0.5 * width * geometry.data_per_pixel
+        x1 = text_params["x"] - half_width - padding
+        x2 = text_params["x"] + half_width + padding
         overflowing = (x1 < feature.start) or (x2 > feature.end)
-        return text, overflowing, nlines, (x1, x2), (y2 - y1)
+        return text_params, overflowing, nlines, (x1, x2), height
+
+    def annotate_feature(
+        self,
+        ax,
+        feature,
+        level,
+        inline=False,
+        max_label_length=50,
+        max_line_length=30,
+        padding=0,
+        indicate_strand_in_label=False,
+        geometry=None,
+    ):
+        """Create a Matplotlib Text with the feature's label.
+
+        The x-coordinates of the text are determined by the feature's
+        `x_center` while the y-coordinates are determined by the `level`.
+
+        The text is horizontally and vertically centered.
+
+        Returns ``text, overflowing, nlines, (x1, x2), height``, see
+        ``measure_annotation`` for details. The ``geometry`` of the ax is
+        computed from the ax if not provided.
+        """
+        if geometry is None:
+            geometry = PlotGeometry.from_ax(ax)
+        text_params, overflowing, nlines, (x1, x2), height = self.measure_annotation(
+            geometry=geometry,
+            feature=feature,
+            level=level,
+            inline=inline,
+            max_label_length=max_label_length,
+            max_line_length=max_line_length,
+            padding=padding,
+            indicate_strand_in_label=indicate_strand_in_label,
+        )
+        text = ax.text(**text_params)
+        return text, overflowing, nlines, (x1, x2), height
+
+    def plan_annotation(
+        self,
+        feature,
+        geometry,
+        level,
+        annotate_inline,
+        max_line_length,
+        max_label_length,
+        indicate_strand_in_label=False,
+        padding=None,
+    ):
+        """Decide on inline vs. outline annotation, without drawing anything.
+
+        Parameters are the same as for ``place_annotation``, except for the
+        ax which is replaced by its PlotGeometry. The labels' ``padding`` is
+        computed with ``compute_padding`` if not provided. The returned
+        result is the one of ``measure_annotation`` for the selected
+        inline/outline annotation, where ``overflowing`` indicates that the
+        annotation must be placed outline.
+        """
+        if padding is None:
+            padding = self.compute_padding(geometry)
+        params = dict(
+            geometry=geometry,
+            feature=feature,
+            level=level,
+            padding=padding,
+            max_label_length=max_label_length,
+            max_line_length=max_line_length,
+            indicate_strand_in_label=indicate_strand_in_label,
+        )
+        if annotate_inline:
+            # FIRST ATTEMPT TO ANNOTATE INSIDE THE FEATURE. CHECK FOR OVERFLOW
+            annotation = self.measure_annotation(inline=True, **params)
+            overflowing = annotation[1]
+
+            # IF OVERFLOW, PLACE THE ANNOTATION OUTLINE INSTEAD.
+            if overflowing:
+                annotation = self.measure_annotation(inline=False, **params)
+                text_params, _, lines, (x1, x2), height = annotation
+                return text_params, overflowing, lines, (x1, x2), height
+            return annotation
+        else:
+            return self.measure_annotation(inline=False, **params)
 
     def place_annotation(
         self,
@@ -273,6 +592,7 @@ class MatplotlibPlottableMixin(MultilinePlottableMixin, SequenceAndTranslationMi
         max_line_length,
         max_label_length,
         indicate_strand_in_label=False,
+        geometry=None,
     ):
         """"Place an annotation in the figure. Decide on inline vs. outline.
 
@@ -303,39 +623,273 @@ class MatplotlibPlottableMixin(MultilinePlottableMixin, SequenceAndTranslationMi
         indicate_strand_in_label
           If True, then the label will be represented as "<= label" or
           "label =>" with an arrow representing the strand.
+
+        geometry
+          The geometry of the ax (e.g. an AxGeometry shared by successive
+          calls), computed from the ax if not provided.
         """
-        padding = self.compute_padding(ax)
-        if annotate_inline:
-            # FIRST ATTEMPT TO ANNOTATE INSIDE THE FEATURE. CHECK FOR OVERFLOW
-            text, overflowing, lines, (x1, x2), height = self.annotate_feature(
-                ax=ax,
-                feature=feature,
-                level=level,
-                inline=True,
-                padding=padding,
-                max_label_length=max_label_length,
-                max_line_length=max_line_length,
-                indicate_strand_in_label=indicate_strand_in_label,
+        if geometry is None:
+            geometry = PlotGeometry.from_ax(ax)
+        text_params, overflowing, lines, (x1, x2), height = self.plan_annotation(
+            feature=feature,
+            geometry=geometry,
+            level=level,
+            annotate_inline=annotate_inline,
+            max_line_length=max_line_length,
+            max_label_length=max_label_length,
+            indicate_strand_in_label=indicate_strand_in_label,
+        )
+        text = ax.text(**text_params)
+        return text, overflowing, lines, (x1, x2), height
+
+    def compute_layout(
+        self,
+        geometry,
+        annotate_inline=True,
+        max_label_length=50,
+        max_line_length=30,
+        level_offset=0,
+        strand_in_label_threshold="default",
+        elevate_outline_annotations="default",
+        level_of_detail="default",
+        label_pixel_threshold="default",
+        profiler=None,
+    ):
+        """Compute the levels and positions of the features and annotations
+        of a plot, without creating or drawing on any Matplotlib figure.
+
+        Parameters
+        ----------
+
+        geometry
+          A PlotGeometry, giving the horizontal limits, width and resolution
+          of the ax the record will be plotted on.
+
+        annotate_inline, max_label_length, max_line_length, level_offset,
+        strand_in_label_threshold, elevate_outline_annotations,
+        level_of_detail, label_pixel_threshold
+          See ``plot()``.
+
+        profiler
+          A PlotProfiler recording the time of the layout's phases
+          ("compute_features_levels", "measure_labels" and
+          "compute_annotations_levels").
+
+        Returns
+        -------
+
+        layout
+          A dict with the following entries:
+          ``features_levels`` ({feature: level} for the features to plot),
+          ``aggregated_features`` (features too small to be plotted, see
+          ``level_of_detail``), ``max_level``, ``inline_annotations`` (list
+          of ``ax.text()`` parameters), ``outline_annotations`` (list of dicts
+          with the ``feature``, the ``text_params`` of its label, the
+          ``link`` ((x, y), (feature_x, feature_y)) between the label and the
+          feature, and the ``link_color``), ``max_annotations_level``,
+          ``annotations_are_elevated``, and ``min_text_line_height`` (height
+          in pixels of the smallest line of text, or None if there are no
+          labels).
+        """
+        if elevate_outline_annotations == "default":
+            default = self.default_elevate_outline_annotations
+            elevate_outline_annotations = default
+        if strand_in_label_threshold == "default":
+            default = self.default_strand_in_label_threshold
+            strand_in_label_threshold = default
+        if level_of_detail == "default":
+            level_of_detail = self.default_level_of_detail
+        if level_of_detail is True:
+            level_of_detail = 1
+        if label_pixel_threshold == "default":
+            label_pixel_threshold = self.default_label_pixel_threshold
+
+        def strand_in_label(f):
+            """Anything under 0.1 inches in the figure."""
+            if strand_in_label_threshold is None:
+                return False
+            width_pixel = geometry.ax_width
+            f_pixels = 1.0 * width_pixel * f.length / self.sequence_length
+            return f_pixels < strand_in_label_threshold
+
+        pixels_per_basepair = self._pixels_per_basepair(geometry)
+        padding = self.compute_padding(geometry)
+
+        with profile_phase(profiler, "compute_features_levels"):
+            features, aggregated_features = self.features, []
+            if level_of_detail:
+                features, aggregated_features = self._split_features_by_detail(
+                    geometry, min_pixels=level_of_detail
+                )
+            incremental_layout = self._incremental_layout
+            use_incremental = (incremental_layout is not None) and (
+                features is self.features
             )
+            if use_incremental and not incremental_layout.is_up_to_date(features):
+                # The features were edited in place: the layout is dropped
+                self._incremental_layout = None
+                use_incremental = False
+            if use_incremental:
+                levels = incremental_layout.levels
+                features_levels = {f: levels[f] for f in features}
+            elif isinstance(features, GraphicFeatureArray):
+                features_levels = dict(zip(features, features.compute_levels()))
+            else:
+                features_levels = compute_features_levels(features)
 
-            # IF OVERFLOW, REMOVE THE TEXT AND PLACE IT AGAIN, OUTLINE.
-            if overflowing:
-                text.remove()
-                text, _, lines, (x1, x2), height = self.annotate_feature(
-                    ax=ax,
+            for f in features_levels:
+                features_levels[f] += level_offset
+            max_level = (
+                1 if (features_levels == {}) else max(1, max(features_levels.values()))
+            )
+
+        with profile_phase(profiler, "measure_labels"):
+            inline_annotations = []
+            overflowing_annotations = []
+            text_lines_heights = []
+            sorted_features_levels = sorted(
+                features_levels.items(), key=lambda o: -o[0].length
+            )
+            for feature, level in sorted_features_levels:
+                if feature.label is None:
+                    continue
+                if label_pixel_threshold and (
+                    feature.length * pixels_per_basepair < label_pixel_threshold
+                ):
+                    continue
+                annotation = self.plan_annotation(
                     feature=feature,
+                    geometry=geometry,
                     level=level,
-                    inline=False,
-                    padding=padding,
-                    max_label_length=max_label_length,
+                    annotate_inline=annotate_inline,
                     max_line_length=max_line_length,
-                    indicate_strand_in_label=indicate_strand_in_label,
+                    max_label_length=max_label_length,
+                    indicate_strand_in_label=strand_in_label(feature),
+                    padding=padding,
                 )
-            return text, overflowing, lines, (x1, x2), height
-        else:
-            return self.annotate_feature(
-                ax=ax, feature=feature, level=level, padding=padding
-            )
+                text_params, overflowing, nlines, (x1, x2), height = annotation
+                text_lines_heights.append(height / nlines)
+                if annotate_inline and not overflowing:
+                    inline_annotations.append(text_params)
+                else:
+                    # trick here: we are representing text annotations as
+                    # GraphicFeatures so we can place them using
+                    # compute_features_levels().
+                    # We are also storing all the info necessary for label plotting
+                    # in these pseudo-graphic-features. The text will only be drawn
+                    # once its final position is known.
+                    overflowing_annotations.append(
+                        GraphicFeature(
+                            start=x1,
+                            end=x2,
+                            feature=feature,
+                            text_params=text_params,
+                            feature_level=level,
+                            nlines=nlines,
+                            color=feature.color,
+                            label_link_color=feature.label_link_color,
+                        )
+                    )
+
+        with profile_phase(profiler, "compute_annotations_levels"):
+            # There are two ways to plot annotations: evelated, all above all the
+            # graphic feature. Or at the same levels as the graphic features (
+            # every annotation above its respective feature, but some annotations
+            # can be below some features).
+            if elevate_outline_annotations:
+
+                base_feature = GraphicFeature(
+                    start=-self.sequence_length,
+                    end=self.sequence_length,
+                    fixed_level=0,
+                    nlines=1,
+                    is_base=True,
+                )
+                overflowing_annotations.append(base_feature)
+                annotations_levels = compute_features_levels(overflowing_annotations)
+            else:
+                # The features are pinned at their levels on clones, so that the
+                # record's features are left unchanged by the layout.
+                pinned_features = []
+                for f in features:
+                    pinned_feature = f.clone()
+                    pinned_feature.data.update(nlines=1, fixed_level=features_levels[f])
+                    pinned_features.append(pinned_feature)
+                annotations_levels = compute_features_levels(
+                    overflowing_annotations + pinned_features
+                )
+                annotations_levels = {
+                    f: annotations_levels[f] for f in overflowing_annotations
+                }
+
+            max_annotations_level = max([0] + list(annotations_levels.values()))
+            annotation_height = self.determine_annotation_height(max_level)
+            annotation_height = max(self.min_y_height_of_text_line, annotation_height)
+            outline_annotations = []
+            for feature, level in annotations_levels.items():
+                if "is_base" in feature.data:
+                    continue
+                text_params = feature.data["text_params"]
+                x = text_params["x"]
+                if elevate_outline_annotations:
+                    new_y = (max_level) * self.feature_level_height + (
+                        level
+                    ) * annotation_height
+                else:
+                    new_y = annotation_height * level
+                fx, fy = self.coordinates_in_plot(
+                    feature.data["feature"].x_center, feature.data["feature_level"]
+                )
+                link_color = feature.label_link_color
+                if link_color == "auto":
+                    link_color = change_luminosity(feature.color, luminosity=0.2)
+                outline_annotations.append(
+                    dict(
+                        feature=feature.data["feature"],
+                        text_params=dict(text_params, y=new_y),
+                        link=((x, new_y), (fx, fy)),
+                        link_color=link_color,
+                    )
+                )
+        return dict(
+            features_levels=features_levels,
+            aggregated_features=aggregated_features,
+            max_level=max_level,
+            inline_annotations=inline_annotations,
+            outline_annotations=outline_annotations,
+            max_annotations_level=max_annotations_level,
+            annotations_are_elevated=elevate_outline_annotations,
+            min_text_line_height=min(text_lines_heights, default=None),
+        )
+
+    def compute_figure_height(
+        self, figure_width=8, x_lim=None, figure_height=None, **plot_params
+    ):
+        """Return the height of the figure created by ``plot()`` (when no ax
+        is provided), without creating any figure.
+
+        The parameters are the same as for ``plot()``. The parameters which
+        have no effect on the layout (``draw_line``, ``with_ruler``, etc.)
+        are ignored.
+        """
+        if figure_height is not None:
+            return figure_height
+        if x_lim is None:
+            start, end = self.span
+            x_lim = (start - 0.8, end - 0.2)
+        layout_params = {
+            key: value
+            for key, value in plot_params.items()
+            if key in LAYOUT_PARAMETERS
+        }
+        geometry = PlotGeometry.from_figure_width(figure_width, x_lim)
+        layout = self.compute_layout(geometry, **layout_params)
+        ymax = self._compute_natural_ymax(
+            features_levels=max([1] + list(layout["features_levels"].values())),
+            annotations_max_level=layout["max_annotations_level"],
+            annotations_are_elevated=layout["annotations_are_elevated"],
+        )
+        return self._auto_figure_height(ymax)
 
     def plot(
         self,
@@ -354,6 +908,10 @@ class MatplotlibPlottableMixin(MultilinePlottableMixin, SequenceAndTranslationMi
         x_lim=None,
         figure_height=None,
         sequence_params=None,
+        batch_artists="default",
+        level_of_detail="default",
+        label_pixel_threshold="default",
+        profiler=None,
     ):
         """Plot all the features in the same Matplotlib ax.
 
@@ -416,43 +974,137 @@ class MatplotlibPlottableMixin(MultilinePlottableMixin, SequenceAndTranslationMi
 
         sequence_params
           parameters for plot_sequence.
+
+        batch_artists
+          If True, all feature arrows are drawn as a single Matplotlib
+          collection (see ``plot_features_batch``) and all label-to-feature
+          links as a single LineCollection. The result looks the same but is
+          much faster to draw, and SVG/PDF exports are much smaller, for
+          records with many features. Note that ``plot_feature`` is then not
+          called. The default is the record's ``default_batch_artists``
+          (False for GraphicRecord, True for CircularGraphicRecord unless its
+          ``plot_feature`` is overridden).
+
+        level_of_detail
+          Number N such that, when provided, every feature with a graphical
+          width in pixels below N is not drawn individually (and not
+          annotated). These features are instead aggregated into a density
+          strip drawn under the base line (see ``plot_features_density``).
+          True is the same as 1 (only sub-pixel features are aggregated).
+          Features outside of ``x_lim`` are also skipped. The width of the
+          features is evaluated for the final ``x_lim``, so zooming in on a
+          region brings back the details. This keeps the plotting time of
+          very long records bounded by the figure's resolution.
+
+        label_pixel_threshold
+          Number N such that, when provided, every feature with a graphical
+          width in pixels below N will not be annotated.
+
+        profiler
+          A PlotProfiler recording the wall time, number of calls and number
+          of created artists of the phases of the plot: "plot" (the whole
+          plot), "create_figure", "initialize_ax", "compute_layout" (itself
+          divided into "compute_features_levels", "measure_labels" and
+          "compute_annotations_levels"), "plot_features_density",
+          "plot_features", "plot_labels", "plot_sequence" and "finalize_ax".
+          Get the results with ``profiler.to_dict()``.
         """
 
-        if elevate_outline_annotations == "default":
-            default = self.default_elevate_outline_annotations
-            elevate_outline_annotations = default
-        if strand_in_label_threshold == "default":
-            default = self.default_strand_in_label_threshold
-            strand_in_label_threshold = default
+        with profile_phase(profiler, "plot"):
+            auto_figure_height = (ax is None) and (figure_height is None)
+            if ax is None:
+                with profile_phase(profiler, "create_figure"):
+                    import matplotlib.pyplot as plt
 
-        features_levels = compute_features_levels(self.features)
+                    # In auto-height mode, the height is set once the levels
+                    # are known
+                    fig, ax = plt.subplots(
+                        1, figsize=(figure_width, figure_height or 1)
+                    )
+            return self._plot_on_ax(
+                ax,
+                auto_figure_height=auto_figure_height,
+                figure_width=figure_width,
+                draw_line=draw_line,
+                with_ruler=with_ruler,
+                ruler_color=ruler_color,
+                plot_sequence=plot_sequence,
+                annotate_inline=annotate_inline,
+                max_label_length=max_label_length,
+                max_line_length=max_line_length,
+                level_offset=level_offset,
+                strand_in_label_threshold=strand_in_label_threshold,
+                elevate_outline_annotations=elevate_outline_annotations,
+                x_lim=x_lim,
+                sequence_params=sequence_params,
+                batch_artists=batch_artists,
+                level_of_detail=level_of_detail,
+                label_pixel_threshold=label_pixel_threshold,
+                profiler=profiler,
+            )
 
-        for f in features_levels:
-            features_levels[f] += level_offset
-        max_level = (
-            1 if (features_levels == {}) else max(1, max(features_levels.values()))
-        )
-        auto_figure_height = (ax is None) and (figure_height is None)
-        if ax is None:
-            height = figure_height or max_level
-            fig, ax = plt.subplots(1, figsize=(figure_width, height))
+    def _plot_on_ax(
+        self,
+        ax,
+        auto_figure_height=False,
+        figure_width=8,
+        draw_line=True,
+        with_ruler=True,
+        ruler_color=None,
+        plot_sequence=False,
+        annotate_inline=True,
+        max_label_length=50,
+        max_line_length=30,
+        level_offset=0,
+        strand_in_label_threshold="default",
+        elevate_outline_annotations="default",
+        x_lim=None,
+        sequence_params=None,
+        batch_artists="default",
+        level_of_detail="default",
+        label_pixel_threshold="default",
+        profiler=None,
+    ):
+        """Plot all the features in the given ax (see ``plot()``). If
+        ``auto_figure_height`` is True, the ax's figure is resized to fit the
+        plot.
 
-        def strand_in_label(f):
-            """Anything under 0.1 inches in the figure."""
-            if strand_in_label_threshold is None:
-                return False
-            width_pixel = self._get_ax_width(ax, unit="pixel")
-            f_pixels = 1.0 * width_pixel * f.length / self.sequence_length
-            return f_pixels < strand_in_label_threshold
+        The geometry of the ax (see ``AxGeometry``) is computed once and
+        shared by all the steps of the plot, until the figure is resized.
+        """
+        def count_artists():
+            return len(ax.get_children())
+
+        if batch_artists == "default":
+            batch_artists = self.default_batch_artists
 
-        self.initialize_ax(ax, draw_line=draw_line, with_ruler=with_ruler)
-        if x_lim is not None:
-            ax.set_xlim(*x_lim)
-        overflowing_annotations = []
-        renderer = ax.figure.canvas.get_renderer()
-        bbox = ax.get_window_extent(renderer)
-        ax_height = bbox.height
-        ideal_yspan = 0
+        with profile_phase(profiler, "initialize_ax", count_artists):
+            self.initialize_ax(ax, draw_line=draw_line, with_ruler=with_ruler)
+            if x_lim is not None:
+                ax.set_xlim(*x_lim)
+        geometry = AxGeometry(ax)
+
+        with profile_phase(profiler, "compute_layout"):
+            layout = self.compute_layout(
+                geometry,
+                annotate_inline=annotate_inline,
+                max_label_length=max_label_length,
+                max_line_length=max_line_length,
+                level_offset=level_offset,
+                strand_in_label_threshold=strand_in_label_threshold,
+                elevate_outline_annotations=elevate_outline_annotations,
+                level_of_detail=level_of_detail,
+                label_pixel_threshold=label_pixel_threshold,
+                profiler=profiler,
+            )
+        features_levels = layout["features_levels"]
+        if len(layout["aggregated_features"]):
+            with profile_phase(profiler, "plot_features_density", count_artists):
+                self.plot_features_density(
+                    ax, layout["aggregated_features"], geometry=geometry
+                )
+        if auto_figure_height:
+            ax.figure.set_size_inches(figure_width, layout["max_level"])
 
         # sorting features from larger to smaller to make smaller features
         # appear "on top" of smaller ones, in case it happens. May be useless
@@ -460,110 +1112,134 @@ class MatplotlibPlottableMixin(MultilinePlottableMixin, SequenceAndTranslationMi
         sorted_features_levels = sorted(
             features_levels.items(), key=lambda o: -o[0].length
         )
-        for feature, level in sorted_features_levels:
-            self.plot_feature(ax=ax, feature=feature, level=level)
-            if feature.label is None:
-                continue
-            (text, overflowing, nlines, (x1, x2,), height,) = self.place_annotation(
-                feature=feature,
-                ax=ax,
-                level=level,
-                annotate_inline=annotate_inline,
-                max_line_length=max_line_length,
-                max_label_length=max_label_length,
-                indicate_strand_in_label=strand_in_label(feature),
-            )
-            line_height = height / nlines
-            n_text_lines_in_axis = ax_height / line_height
-            min_y_height = self.min_y_height_of_text_line
-            feature_ideal_span = min_y_height * n_text_lines_in_axis
-            ideal_yspan = max(ideal_yspan, feature_ideal_span)
-            if overflowing or not annotate_inline:
-                # trick here: we are representing text annotations as
-                # GraphicFeatures so we can place them using
-                # compute_features_levels().
-                # We are also storing all the info necessary for label plotting
-                # in these pseudo-graphic-features.
-                overflowing_annotations.append(
-                    GraphicFeature(
-                        start=x1,
-                        end=x2,
-                        feature=feature,
-                        text=text,
-                        feature_level=level,
-                        nlines=nlines,
-                        color=feature.color,
-                        label_link_color=feature.label_link_color,
-                    )
+        with profile_phase(profiler, "plot_features", count_artists):
+            if batch_artists:
+                self.plot_features_batch(
+                    ax=ax, features_levels=sorted_features_levels, geometry=geometry
                 )
-
-        # There are two ways to plot annotations: evelated, all above all the
-        # graphic feature. Or at the same levels as the graphic features (
-        # every annotation above its respective feature, but some annotations
-        # can be below some features).
-        if elevate_outline_annotations:
-
-            base_feature = GraphicFeature(
-                start=-self.sequence_length,
-                end=self.sequence_length,
-                fixed_level=0,
-                nlines=1,
-                is_base=True,
-            )
-            overflowing_annotations.append(base_feature)
-            annotations_levels = compute_features_levels(overflowing_annotations)
-        else:
-            for f in self.features:
-                f.data.update(dict(nlines=1, fixed_level=features_levels[f]))
-            annotations_levels = compute_features_levels(
-                overflowing_annotations + self.features
-            )
-            annotations_levels = {
-                f: annotations_levels[f] for f in overflowing_annotations
-            }
-
-        max_annotations_level = max([0] + list(annotations_levels.values()))
-        annotation_height = self.determine_annotation_height(max_level)
-        annotation_height = max(self.min_y_height_of_text_line, annotation_height)
-        labels_data = {}
-        for feature, level in annotations_levels.items():
-            if "is_base" in feature.data:
-                continue
-            text = feature.data["text"]
-            x, y = text.get_position()
-            if elevate_outline_annotations:
-                new_y = (max_level) * self.feature_level_height + (
-                    level
-                ) * annotation_height
             else:
-                new_y = annotation_height * level
-            text.set_position((x, new_y))
-            fx, fy = self.coordinates_in_plot(
-                feature.data["feature"].x_center, feature.data["feature_level"]
-            )
+                for feature, level in sorted_features_levels:
+                    self.plot_feature(
+                        ax=ax, feature=feature, level=level, geometry=geometry
+                    )
 
-            # PLOT THE LABEL-TO-FEATURE LINK
-            link_color = feature.label_link_color
-            if link_color == "auto":
-                link_color = change_luminosity(feature.color, luminosity=0.2)
-            ax.plot([x, fx], [new_y, fy], c=link_color, lw=0.5, zorder=-10)
-            labels_data[feature.data["feature"]] = dict(
-                feature_y=fy, annotation_y=new_y
-            )
+        with profile_phase(profiler, "plot_labels", count_artists):
+            for text_params in layout["inline_annotations"]:
+                ax.text(**text_params)
+
+            labels_data = {}
+            links_segments, links_colors = [], []
+            for annotation in layout["outline_annotations"]:
+                feature = annotation["feature"]
+                ax.text(**annotation["text_params"])
+                (x, y), (fx, fy) = annotation["link"]
+                link_color = annotation["link_color"]
+                if batch_artists:
+                    links_segments.append([(x, y), (fx, fy)])
+                    links_colors.append(link_color)
+                else:
+                    ax.plot([x, fx], [y, fy], c=link_color, lw=0.5, zorder=-10)
+                labels_data[feature] = dict(feature_y=fy, annotation_y=y)
+
+            if len(links_segments):
+                links = LineCollection(
+                    links_segments, colors=links_colors, linewidths=0.5, zorder=-10
+                )
+                ax.add_collection(links)
 
         if plot_sequence:
-            self.plot_sequence(ax, **(sequence_params or {}))
-
-        self.finalize_ax(
-            ax=ax,
-            features_levels=max([1] + list(features_levels.values())),
-            annotations_max_level=max_annotations_level,
-            auto_figure_height=auto_figure_height,
-            ideal_yspan=ideal_yspan,
-            annotations_are_elevated=elevate_outline_annotations,
-        )
+            with profile_phase(profiler, "plot_sequence", count_artists):
+                self.plot_sequence(ax, **(sequence_params or {}))
+
+        with profile_phase(profiler, "finalize_ax", count_artists):
+            ideal_yspan = 0
+            if layout["min_text_line_height"] is not None:
+                ax_height = ax.get_window_extent().height
+                n_text_lines_in_axis = ax_height / layout["min_text_line_height"]
+                ideal_yspan = self.min_y_height_of_text_line * n_text_lines_in_axis
+
+            self.finalize_ax(
+                ax=ax,
+                features_levels=max([1] + list(features_levels.values())),
+                annotations_max_level=layout["max_annotations_level"],
+                auto_figure_height=auto_figure_height,
+                ideal_yspan=ideal_yspan,
+                annotations_are_elevated=layout["annotations_are_elevated"],
+            )
+        if profiler is not None:
+            profiler.add_geometry_stats(geometry.stats)
         return ax, (features_levels, labels_data)
 
+    def render(
+        self,
+        fmt="png",
+        dpi=None,
+        figure_width=8,
+        figure_height=None,
+        bbox_inches="tight",
+        profiler=None,
+        **plot_params
+    ):
+        """Plot the graphic record and return the image file's content.
+
+        Unlike ``plot()`` (when no ax is provided), the figure is created
+        without pyplot: it is a bare Matplotlib Figure with an Agg canvas,
+        which is not registered in pyplot's figures manager, so it doesn't
+        need to be closed and is freed once the image is returned. Records
+        can be rendered concurrently in different threads.
+
+        Parameters
+        ----------
+
+        fmt
+          Format of the image, e.g. "png", "svg", "pdf".
+
+        dpi
+          Resolution of the image. Leave to None for Matplotlib's default
+          (``rcParams["savefig.dpi"]``).
+
+        figure_width, figure_height
+          Dimensions of the figure, in inches. Leave figure_height to None to
+          have it adjusted to the plot, as in ``plot()``.
+
+        bbox_inches
+          Passed to Matplotlib's ``savefig``. "tight" crops the image to the
+          plot.
+
+        profiler
+          A PlotProfiler, see ``plot()``. The whole rendering is recorded as a
+          "render" phase, and the image's encoding as a "savefig" phase.
+
+        **plot_params
+          Other parameters of ``plot()`` (``with_ruler``, ``annotate_inline``,
+          ``x_lim``, etc.).
+
+        Examples
+        --------
+
+        >>> png_data = graphic_record.render("png", dpi=100)
+        >>> svg_data = graphic_record.render("svg", figure_width=10)
+        """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        with profile_phase(profiler, "render"):
+            with profile_phase(profiler, "create_figure"):
+                figure = Figure(figsize=(figure_width, figure_height or 1))
+                FigureCanvasAgg(figure)
+                ax = figure.add_subplot(1, 1, 1)  # Same ax as plt.subplots(1)
+            self._plot_on_ax(
+                ax,
+                auto_figure_height=figure_height is None,
+                figure_width=figure_width,
+                profiler=profiler,
+                **plot_params
+            )
+            with profile_phase(profiler, "savefig"):
+                target = BytesIO()
+                figure.savefig(target, format=fmt, dpi=dpi, bbox_inches=bbox_inches)
+        return target.getvalue()
+
     def plot_legend(
         self, ax, allow_ambiguity=False, include_edge=True, **legend_kwargs
     ):
@@ -623,15 +1299,98 @@ def change_luminosity(color, luminosity=None, min_luminosity=None, factor=None):
     return colorsys.hls_to_rgb(h, new_l, s)
 
 
-def get_text_box(text, margin=0):
+def _format_tick(x, pos):
+    """Format the ruler's ticks (module-level so figures can be pickled)."""
+    return "{:,}".format(int(x))
+
+
+def _freeze(fontdict):
+    """Return a hashable version of a fontdict, or None if not possible."""
+    frozen = tuple(sorted(fontdict.items()))
+    try:
+        hash(frozen)
+    except TypeError:
+        return None
+    return frozen
+
+
+def _get_measurement_renderer(dpi):
+    """Return a figure and an Agg renderer used only to measure texts.
+
+    Each thread gets its own renderer, so texts can be measured in parallel
+    (see ``render()``)."""
+    return _get_thread_measurement_renderer(dpi, threading.get_ident())
+
+
+@lru_cache(maxsize=16)
+def _get_thread_measurement_renderer(dpi, thread_id):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure(dpi=dpi)
+    canvas = FigureCanvasAgg(figure)
+    return figure, canvas.get_renderer()
+
+
+def _measure_text(text, fontdict, dpi):
+    figure, renderer = _get_measurement_renderer(dpi)
+    text = Text(0, 0, text, horizontalalignment="center", verticalalignment="center")
+    text.update(fontdict)
+    text.set_figure(figure)
+    bbox = text.get_window_extent(renderer)
+    return bbox.width, bbox.height
+
+
+TEXT_RC_PARAMS = tuple(
+    key
+    for key in sorted(rcParams)
+    if key.startswith(("font.", "mathtext.", "text."))
+    and key not in ("text.color", "text.antialiased")
+)
+
+
+def _text_rc_params():
+    """Return a hashable version of the Matplotlib rcParams which change the
+    size of texts (default font family, size, weight, style..., math text and
+    TeX settings)."""
+    values = (rcParams[key] for key in TEXT_RC_PARAMS)
+    return tuple(tuple(v) if isinstance(v, list) else v for v in values)
+
+
+@lru_cache(maxsize=50000)
+def _measure_text_cached(text, frozen_fontdict, dpi, rc_params):
+    return _measure_text(text, dict(frozen_fontdict), dpi)
+
+
+def measure_text(text, fontdict, dpi):
+    """Return the (width, height) in pixels of a text, without drawing it.
+
+    The result is the size that ``ax.text(x, y, text, fontdict=fontdict)``
+    would have in a figure of the given dpi. Results are cached by
+    (text, fontdict, dpi, text-related rcParams), so repeated labels are only
+    measured once, and changing e.g. ``rcParams["font.family"]`` doesn't
+    return stale sizes.
+    """
+    frozen_fontdict = _freeze(fontdict)
+    if frozen_fontdict is None:
+        return _measure_text(text, fontdict, dpi)
+    return _measure_text_cached(text, frozen_fontdict, dpi, _text_rc_params())
+
+
+def get_text_box(text, margin=0, geometry=None):
     """Return the coordinates of a Matplotlib Text.
 
     `text` is a Matplotlib text obtained with ax.text().
     This returns `(x1,y1, x2, y2)` where (x1,y1) is the lower left corner
     and (x2, y2) is the upper right corner of the text, in data coordinates.
     If a margin m is supplied, the returned result is (x1-m, y1-m, x2+m, y2+m).
+    If the AxGeometry of the text's ax is provided, its cached renderer is
+    used, which is faster when measuring many texts.
     """
-    renderer = text.axes.figure.canvas.get_renderer()
+    if geometry is None:
+        renderer = text.axes.figure.canvas.get_renderer()
+    else:
+        renderer = geometry.renderer
     bbox = text.get_window_extent(renderer)  # bounding box
     __x1, y1, __x2, y2 = bbox.get_points().flatten()
     bbox = bbox.transformed(text.axes.transData.inverted())
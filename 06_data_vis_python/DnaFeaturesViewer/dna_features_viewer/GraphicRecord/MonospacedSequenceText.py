@@ -0,0 +1,101 @@
+"""Implements a Matplotlib text drawing a sequence of letters aligned on
+consecutive positions of the x axis."""
+
+from matplotlib.text import Text
+
+# Glyphs narrower than this (in pixels) are considered unreadable
+MIN_GLYPH_PIXELS = 4
+
+
+class MonospacedSequenceText(Text):
+    """Single text artist drawing letters (e.g. nucleotides) centered on
+    regularly spaced positions of the x axis, in a monospaced font.
+
+    The font size is recomputed at draw time so that the advance of each
+    glyph matches the current horizontal space of one letter in the plot.
+    When this size exceeds ``max_size`` (i.e. the plot is zoomed in), the
+    letters in the view are drawn one by one at ``max_size``. When the glyphs
+    would be narrower than ``MIN_GLYPH_PIXELS``, nothing is drawn.
+
+    Parameters
+    ----------
+
+    x_start
+      Left edge (in data coordinates) of the space of the first letter.
+
+    y
+      Vertical position of the text, in data coordinates.
+
+    text
+      The letters to draw.
+
+    letter_span
+      Horizontal space (in data coordinates) of each letter, e.g. 1 for
+      nucleotides, 3 for the letters of 3-letter amino acids names.
+
+    max_size
+      Maximal font size, in points.
+
+    **kwargs
+      Other Text properties (color, weight, zorder...).
+    """
+
+    def __init__(self, x_start, y, text, letter_span=1, max_size=11, **kwargs):
+        x_center = x_start + 0.5 * letter_span * len(text)
+        kwargs.update(ha="center", va="center", family="monospace", size=max_size)
+        kwargs.setdefault("clip_on", False)  # as for ax.text()
+        Text.__init__(self, x_center, y, text, **kwargs)
+        self.x_start = x_start
+        self.letter_span = letter_span
+        self.max_size = max_size
+
+    def _fitting_size(self, renderer):
+        """Return the font size (in points) for which the glyphs' advance
+        matches the space of one letter."""
+        transform = self.axes.transData
+        x0 = transform.transform((self.x_start, 0))[0]
+        x1 = transform.transform((self.x_start + self.letter_span, 0))[0]
+        letter_pixels = abs(x1 - x0)
+        properties = self.get_fontproperties().copy()
+        properties.set_size(100)
+        width, _, _ = renderer.get_text_width_height_descent(
+            10 * "0", properties, ismath=False
+        )
+        pixels_per_point = width / 1000.0
+        return letter_pixels / pixels_per_point, letter_pixels
+
+    def _drawing_copy(self):
+        """Return a Text with the same properties as this artist, but not
+        added to any ax, whose size, text and position can be changed at draw
+        time without marking the plot as stale."""
+        copy = Text()
+        copy.update_from(self)
+        copy.set_figure(self.figure)
+        copy.set_position(self.get_position())
+        copy.set_text(self.get_text())
+        copy.set_gid(self.get_gid())
+        copy.set_url(self.get_url())
+        copy.set_rasterized(self.get_rasterized())
+        return copy
+
+    def draw(self, renderer):
+        if (not self.get_visible()) or (not self.get_text()):
+            return
+        size, letter_pixels = self._fitting_size(renderer)
+        if letter_pixels < MIN_GLYPH_PIXELS:
+            return
+        copy = self._drawing_copy()
+        if size <= self.max_size:
+            copy.set_fontsize(size)
+            copy.draw(renderer)
+            return
+        # The letters are more spaced than the glyphs of a max_size font:
+        # only the (few) letters in the view are drawn, one by one.
+        copy.set_fontsize(self.max_size)
+        xmin, xmax = sorted(self.axes.get_xlim())
+        for i, letter in enumerate(self.get_text()):
+            x = self.x_start + (i + 0.5) * self.letter_span
+            if xmin - self.letter_span <= x <= xmax + self.letter_span:
+                copy.set_text(letter)
+                copy.set_x(x)
+                copy.draw(renderer)
@@ -1,9 +1,159 @@
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
 import numpy
 
+from ..PlotProfiler import profile_phase
+from ..RenderCache import graphic_record_hash
+
+
+def _freeze_params(params):
+    """Return a hashable version of (nested) plot parameters, or None if
+    some parameter values are not hashable."""
+
+    def freeze(value):
+        if isinstance(value, dict):
+            return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+        if isinstance(value, (list, tuple)):
+            return tuple(freeze(v) for v in value)
+        return value
+
+    frozen = freeze(params)
+    try:
+        hash(frozen)
+    except TypeError:
+        return None
+    return frozen
+
+
+def _init_worker():
+    """Make sure the worker processes don't use an interactive backend."""
+    import matplotlib.pyplot as plt
+
+    plt.switch_backend("Agg")
+
+
+def _plot_line(
+    line_record,
+    line_start,
+    line_virtual_end,
+    figure_width,
+    plot_sequence,
+    translation_params,
+    plot_params,
+    ax=None,
+    profiler=None,
+):
+    """Plot one line of a multi-line plot and return the line's ax."""
+    line_ax, _ = line_record.plot(
+        figure_width=figure_width,
+        x_lim=(line_start, line_virtual_end),
+        ax=ax,
+        plot_sequence=plot_sequence,
+        profiler=profiler,
+        **plot_params
+    )
+    if translation_params is not None:
+        with profile_phase(profiler, "plot_translation"):
+            line_record.plot_translation(ax=line_ax, **translation_params)
+    return line_ax
+
+
+def _compute_line_height(
+    line_record,
+    line_start,
+    line_virtual_end,
+    figure_width,
+    plot_sequence,
+    translation_params,
+    plot_params,
+):
+    """Return the height of the figure of one line plotted on its own,
+    computed from the line's layout, without plotting."""
+    return line_record.compute_figure_height(
+        figure_width=figure_width,
+        x_lim=(line_start, line_virtual_end),
+        **plot_params
+    )
+
+
+def _plot_page(page_record, nucl_per_line, figure_width, params):
+    """Return the figure of one page of a multi-page plot."""
+    fig, axes = page_record.plot_on_multiple_lines(
+        nucl_per_line=nucl_per_line, figure_width=figure_width, **params
+    )
+    return fig
+
+
+def _plot_pickled_page(page_record, nucl_per_line, figure_width, params):
+    """Return the pickled figure of one page of a multi-page plot, plotted in
+    a worker process. The figure is closed in the worker, so figures don't
+    accumulate in the workers' pyplot."""
+    import matplotlib.pyplot as plt
+
+    fig = _plot_page(page_record, nucl_per_line, figure_width, params)
+    try:
+        return pickle.dumps(fig)
+    finally:
+        plt.close(fig)
+
 
 class MultilinePlottableMixin:
+    # Maximal number of lines heights kept in ``_lines_heights_cache``
+    lines_heights_cache_size = 1024
+
+    def compute_lines_heights(self, lines_plot_args, workers=None):
+        """Return the heights of the figures of separately-plotted lines.
+
+        The heights are computed from the lines' layouts (see
+        ``compute_figure_height``), without creating any figure. They are
+        cached in the record by line content (see ``graphic_record_hash``)
+        and plot parameters, so a same line is laid out only once. The cache
+        keeps the ``lines_heights_cache_size`` most recently used heights,
+        and is reset when the record's features are reassigned.
+
+        Parameters
+        ----------
+
+        lines_plot_args
+          List of tuples ``(line_record, line_start, line_virtual_end,
+          figure_width, plot_sequence, translation_params, plot_params)``.
+
+        workers
+          Number of processes used to lay out the lines. Leave to None (or 1)
+          to lay out all lines in the current process.
+        """
+        cache = self._lines_heights_cache
+        keys = [
+            _freeze_params((graphic_record_hash(args[0]),) + tuple(args[1:]))
+            for args in lines_plot_args
+        ]
+        missing = []
+        for i, key in enumerate(keys):
+            if (key is None) or (key not in cache):
+                missing.append(i)
+            else:
+                cache.move_to_end(key)
+        missing_args = [lines_plot_args[i] for i in missing]
+        if (workers is not None) and (workers > 1) and (len(missing) > 1):
+            with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+                measured = list(pool.map(_compute_line_height, *zip(*missing_args)))
+        else:
+            measured = [_compute_line_height(*args) for args in missing_args]
+        measured_heights = dict(zip(missing, measured))
+        heights = [
+            measured_heights[i] if i in measured_heights else cache[key]
+            for i, key in enumerate(keys)
+        ]
+        for i, height in measured_heights.items():
+            if keys[i] is not None:
+                cache[keys[i]] = height
+                cache.move_to_end(keys[i])
+        while len(cache) > self.lines_heights_cache_size:
+            cache.popitem(last=False)
+        return heights
+
     def plot_on_multiple_lines(
         self,
         n_lines=None,
@@ -11,6 +161,8 @@ class MultilinePlottableMixin:
         plot_sequence=False,
         figure_width="auto",
         translation_params=None,
+        workers=None,
+        profiler=None,
         **plot_params
     ):
         """Plot the features on different lines (one Matplotlib ax per line).
@@ -38,6 +190,18 @@ class MultilinePlottableMixin:
           Parameters for sequence translation. By default (``None``), it does
           not plot a translated sequence.
 
+        workers
+          Number of processes used to compute the layouts of the lines, which
+          determine the lines' heights. Leave to None (or 1) to lay out all
+          lines in the current process.
+
+        profiler
+          A PlotProfiler recording the phases of the plot:
+          "plot_on_multiple_lines" (the whole plot), "crop_lines",
+          "compute_lines_heights", "create_figure", "plot_lines" (which
+          includes the phases of the lines' ``plot()``, see ``plot()``, and
+          "plot_translation") and "tight_layout".
+
         **plot_params
           Parameters from ``graphic_record.plot()`` to be used in the plotting
           of the individual lines. This includes ``draw_line``, ``with_ruler``,
@@ -51,6 +215,30 @@ class MultilinePlottableMixin:
           The matplotlib figure and axes generated.
         """
 
+        with profile_phase(profiler, "plot_on_multiple_lines"):
+            return self._plot_on_multiple_lines(
+                n_lines=n_lines,
+                nucl_per_line=nucl_per_line,
+                plot_sequence=plot_sequence,
+                figure_width=figure_width,
+                translation_params=translation_params,
+                workers=workers,
+                profiler=profiler,
+                plot_params=plot_params,
+            )
+
+    def _plot_on_multiple_lines(
+        self,
+        n_lines,
+        nucl_per_line,
+        plot_sequence,
+        figure_width,
+        translation_params,
+        workers,
+        profiler,
+        plot_params,
+    ):
+        """Plot the lines (see ``plot_on_multiple_lines``)."""
         if n_lines is None:
             n_lines = int(numpy.ceil(self.sequence_length / nucl_per_line))
         else:
@@ -62,42 +250,48 @@ class MultilinePlottableMixin:
             else:
                 figure_width = 10
 
-        figures_heights = []
+        lines_plot_args = []
+        with profile_phase(profiler, "crop_lines"):
+            self._validate_features_index()
+            for line_index in range(n_lines):
+                first, last = self.first_index, self.last_index
+                line_start = first + line_index * nucl_per_line
+                line_virtual_end = first + (line_index + 1) * nucl_per_line
+                line_end = min(last, line_virtual_end)
+                line_record = self.crop((line_start, line_end))
+                lines_plot_args.append(
+                    (
+                        line_record,
+                        line_start,
+                        line_virtual_end,
+                        figure_width,
+                        plot_sequence,
+                        translation_params,
+                        plot_params,
+                    )
+                )
+        with profile_phase(profiler, "compute_lines_heights"):
+            figures_heights = self.compute_lines_heights(lines_plot_args, workers)
+        with profile_phase(profiler, "create_figure"):
+            import matplotlib.pyplot as plt
 
-        def plot_line(line_index, ax=None, translation_params=None):
-            first, last = self.first_index, self.last_index
-            line_start = first + line_index * nucl_per_line
-            line_virtual_end = first + (line_index + 1) * nucl_per_line
-            line_end = min(last, line_virtual_end)
-            line_record = self.crop((line_start, line_end))
-            line_ax, _ = line_record.plot(
-                figure_width=figure_width,
-                x_lim=(line_start, line_virtual_end),
-                ax=ax,
-                plot_sequence=plot_sequence,
-                **plot_params
+            fig, axes = plt.subplots(
+                n_lines,
+                1,
+                gridspec_kw={"height_ratios": figures_heights},
+                figsize=(figure_width, 0.9 * sum(figures_heights)),
             )
-
-            if translation_params is not None:
-                line_record.plot_translation(ax=line_ax, **translation_params)
-
-            return line_ax
-
-        for line_index in range(n_lines):
-            line_ax = plot_line(line_index, translation_params=translation_params)
-            figures_heights.append(line_ax.figure.get_figheight())
-            plt.close(line_ax.figure)
-        fig, axes = plt.subplots(
-            n_lines,
-            1,
-            gridspec_kw={"height_ratios": figures_heights},
-            figsize=(figure_width, 0.9 * sum(figures_heights)),
-        )
         if n_lines == 1:
             axes = [axes]
-        for line_index, ax in enumerate(axes):
-            plot_line(line_index, ax=ax, translation_params=translation_params)
-        fig.tight_layout()
+
+        def count_artists():
+            return sum(len(ax.get_children()) for ax in axes)
+
+        with profile_phase(profiler, "plot_lines", count_artists):
+            for line_plot_args, ax in zip(lines_plot_args, axes):
+                _plot_line(*line_plot_args, ax=ax, profiler=profiler)
+        with profile_phase(profiler, "tight_layout"):
+            fig.tight_layout()
         return fig, axes
 
     def plot_on_multiple_pages(
@@ -108,6 +302,7 @@ class MultilinePlottableMixin:
         lines_per_page=5,
         figure_width="auto",
         translation_params=None,
+        workers=None,
         **plot_params
     ):
         """Plot the features on different lines on different pages of a PDF.
@@ -143,26 +338,46 @@ class MultilinePlottableMixin:
           Parameters for sequence translation. By default (``None``), it does
           not plot a translated sequence.
 
+        workers
+          Number of processes used to plot the pages. The pages are then saved
+          in the PDF in order by the current process. Leave to None (or 1) to
+          plot all pages in the current process.
+
         **plot_params
           Parameters from ``graphic_record.plot()`` to be used in the plotting
           of the individual lines. This includes ``draw_line``, ``with_ruler``,
           ``annotate_inline``, ``plot_sequence``,
           ``evelate_outline_annotations``, ``strand_in_label_pixel_threshold``.
         """
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_pdf import PdfPages
+
         nucl_per_page = nucl_per_line * lines_per_page
         number_of_pages = int(numpy.ceil(self.sequence_length / nucl_per_page))
+        pages_records = []
+        self._validate_features_index()
+        for page_index in range(number_of_pages):
+            first, last = self.first_index, self.last_index
+            page_start = first + page_index * nucl_per_page
+            page_end = first + (page_index + 1) * nucl_per_page
+            page_end = min(last, page_end)
+            pages_records.append(self.crop((page_start, page_end)))
+        page_params = dict(
+            nucl_per_line=nucl_per_line,
+            figure_width=figure_width,
+            params=dict(plot_params, translation_params=translation_params),
+        )
         with PdfPages(pdf_target) as pdf:
-            for page_index in range(number_of_pages):
-                first, last = self.first_index, self.last_index
-                page_start = first + page_index * nucl_per_page
-                page_end = first + (page_index + 1) * nucl_per_page
-                page_end = min(last, page_end)
-                page_record = self.crop((page_start, page_end))
-                fig, axes = page_record.plot_on_multiple_lines(
-                    nucl_per_line=nucl_per_line,
-                    figure_width=figure_width,
-                    translation_params=translation_params,
-                    **plot_params
-                )
-                pdf.savefig(fig)
-                plt.close(fig)
+            if (workers is not None) and (workers > 1) and (number_of_pages > 1):
+                plot_page = partial(_plot_pickled_page, **page_params)
+                with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+                    # The figures are pickled back, in page order
+                    for pickled_fig in pool.map(plot_page, pages_records):
+                        fig = pickle.loads(pickled_fig)
+                        pdf.savefig(fig)
+                        plt.close(fig)
+            else:
+                for page_record in pages_records:
+                    fig = _plot_page(page_record, **page_params)
+                    pdf.savefig(fig)
+                    plt.close(fig)
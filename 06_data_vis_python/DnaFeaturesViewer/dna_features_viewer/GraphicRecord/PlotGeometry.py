@@ -0,0 +1,141 @@
+"""Implements the PlotGeometry class, describing the horizontal geometry of a
+plot so that it can be laid out without drawing anything, and the AxGeometry
+class, which caches the geometry of a Matplotlib ax during a plot."""
+
+import matplotlib
+
+
+class PlotGeometry:
+    """Horizontal geometry of a Matplotlib ax, as needed to lay out a record's
+    features and annotations (see ``GraphicRecord.compute_layout``).
+
+    Parameters
+    ----------
+
+    x_lim
+      The (xmin, xmax) horizontal limits of the ax, in data coordinates.
+
+    ax_width
+      Width of the ax, in pixels.
+
+    dpi
+      Resolution of the figure, used to measure the texts' dimensions.
+    """
+
+    def __init__(self, x_lim, ax_width, dpi):
+        self.x_lim = tuple(x_lim)
+        self.ax_width = ax_width
+        self.dpi = dpi
+
+    @staticmethod
+    def from_ax(ax):
+        """Return the current geometry of a Matplotlib ax."""
+        return PlotGeometry(
+            x_lim=ax.get_xlim(),
+            ax_width=ax.get_window_extent().width,
+            dpi=ax.figure.dpi,
+        )
+
+    @staticmethod
+    def from_figure_width(figure_width, x_lim, dpi=None):
+        """Return the geometry of the ax of a new ``plt.subplots(1)`` figure.
+
+        The ax width is computed from Matplotlib's default subplot parameters
+        (``rcParams["figure.subplot.left"]`` and ``["figure.subplot.right"]``)
+        so no figure needs to be created.
+        """
+        rc = matplotlib.rcParams
+        if dpi is None:
+            dpi = rc["figure.dpi"]
+        fraction = rc["figure.subplot.right"] - rc["figure.subplot.left"]
+        return PlotGeometry(x_lim, ax_width=figure_width * dpi * fraction, dpi=dpi)
+
+    @property
+    def data_per_pixel(self):
+        """Horizontal span in data coordinates of one pixel of the ax."""
+        xmin, xmax = self.x_lim
+        return abs(xmax - xmin) / self.ax_width
+
+    def __repr__(self):
+        return "PlotGeometry(x_lim=%s, ax_width=%.1f, dpi=%s)" % (
+            self.x_lim,
+            self.ax_width,
+            self.dpi,
+        )
+
+
+class AxGeometry(PlotGeometry):
+    """Geometry of a Matplotlib ax, shared by all the steps of a plot.
+
+    The horizontal limits, width in pixels, resolution, data-to-pixel scale
+    and canvas renderer of the ax are computed on first use, and only
+    recomputed after the ax's horizontal limits (``x_lim``), the figure's
+    size or its dpi have changed. This replaces the queries to the renderer
+    and window extent which would otherwise be made for every feature and
+    label of the plot.
+
+    Parameters
+    ----------
+
+    ax
+      The Matplotlib ax the record is plotted on.
+
+    Attributes
+    ----------
+
+    stats
+      A dict counting the geometry ``queries`` and the ``updates`` (actual
+      computations from the ax), which can be used to profile the plots.
+    """
+
+    def __init__(self, ax):
+        self.ax = ax
+        self.stats = dict(queries=0, updates=0)
+        self._values = None
+        self._figure_state = None
+        ax.callbacks.connect("xlim_changed", self._on_xlim_changed)
+
+    def _on_xlim_changed(self, ax):
+        self._values = None
+
+    def _get(self, name):
+        self.stats["queries"] += 1
+        figure = self.ax.figure
+        figure_state = (figure.bbox_inches.x1, figure.bbox_inches.y1, figure.dpi)
+        if (self._values is None) or (figure_state != self._figure_state):
+            self.stats["updates"] += 1
+            self._figure_state = figure_state
+            x_lim = self.ax.get_xlim()
+            ax_width = self.ax.get_window_extent().width
+            self._values = dict(
+                x_lim=x_lim,
+                ax_width=ax_width,
+                dpi=figure.dpi,
+                data_per_pixel=abs(x_lim[1] - x_lim[0]) / ax_width,
+                renderer=None,
+            )
+        value = self._values[name]
+        if (name == "renderer") and (value is None):
+            value = self._values[name] = figure.canvas.get_renderer()
+        return value
+
+    @property
+    def x_lim(self):
+        return self._get("x_lim")
+
+    @property
+    def ax_width(self):
+        return self._get("ax_width")
+
+    @property
+    def dpi(self):
+        return self._get("dpi")
+
+    @property
+    def data_per_pixel(self):
+        return self._get("data_per_pixel")
+
+    @property
+    def renderer(self):
+        """Renderer of the ax's figure canvas, used to measure drawn texts."""
+        return self._get("renderer")
@@ -1,9 +1,20 @@
+from matplotlib.collections import LineCollection
+
 from ..biotools import extract_graphical_translation
+from .MonospacedSequenceText import MonospacedSequenceText, MIN_GLYPH_PIXELS
+from .PlotGeometry import PlotGeometry
 
 
 class SequenceAndTranslationMixin:
     def plot_sequence(
-        self, ax, location=None, y_offset=1, fontdict=None, guides_intensity=0
+        self,
+        ax,
+        location=None,
+        y_offset=1,
+        fontdict=None,
+        guides_intensity=0,
+        skip_unreadable=False,
+        monospaced_text=False,
     ):
         """Plot a sequence of nucleotides at the bottom of the plot.
 
@@ -32,7 +43,21 @@ class SequenceAndTranslationMixin:
 
         guides_intensity
           Intensity of the vertical guides marking the different nucleotides
-          (0 = no guides).
+          (0 = no guides). The guides are drawn as a single LineCollection.
+
+        skip_unreadable
+          If True, the nucleotides are not drawn when the space of one
+          nucleotide in the plot (at the time of plotting) is narrower than
+          ``MIN_GLYPH_PIXELS`` pixels, as they would be unreadable. The guides
+          are still drawn.
+
+        monospaced_text
+          If True, the sequence is drawn as a single text artist, in a
+          monospaced font whose size (up to the fontdict's size) is adjusted
+          at draw time so that every letter is centered on its nucleotide.
+          This is much faster than one text per nucleotide for long sequences.
+          The text is not drawn when the nucleotides get narrower than
+          ``MIN_GLYPH_PIXELS`` pixels.
         """
         if self.sequence is None:
             raise ValueError("No sequence in the graphic record")
@@ -40,21 +65,23 @@ class SequenceAndTranslationMixin:
             location = self.span
         location_start, location_end = location
         fontdict = {"size": 11, **(fontdict or {})}
-        for i, nucleotide in enumerate(self.sequence):
-            index = i + location_start
-            if location_start <= index <= location_end:
+        y = -0.7 * self.feature_level_height * y_offset
+        sequence = str(self.sequence[: location_end - location_start + 1])
+        if monospaced_text:
+            self._plot_monospaced_text(ax, location_start - 0.5, y, sequence, fontdict)
+        elif not (skip_unreadable and self._glyphs_are_unreadable(ax, 1)):
+            for i, nucleotide in enumerate(sequence):
                 ax.text(
-                    index,
-                    -0.7 * self.feature_level_height * y_offset,
+                    location_start + i,
+                    y,
                     nucleotide,
                     ha="center",
                     va="center",
                     fontdict=fontdict,
                 )
         if guides_intensity:
-            color = (0, 0, 0, guides_intensity)
-            for i in range(location_start, location_end + 1):
-                ax.axvline(i - 0.5, linewidth=0.1, color=color, zorder=-10000)
+            positions = range(location_start, location_end + 1)
+            self._plot_guides(ax, [i - 0.5 for i in positions], guides_intensity)
         ymin = ax.get_ylim()[0]
         if ymin < -500:
             ymin = 0
@@ -69,6 +96,8 @@ class SequenceAndTranslationMixin:
         guides_intensity=0.5,
         translation=None,
         long_form_translation=True,
+        skip_unreadable=False,
+        monospaced_text=False,
     ):
         """Plot a sequence of amino-acids at the bottom of the plot.
 
@@ -97,6 +126,10 @@ class SequenceAndTranslationMixin:
         translation
           Sequence of amino acids either as a string ``'MAKG...'`` or as a list
           ``['Met', 'Ala', ...]``
+
+        skip_unreadable, monospaced_text
+          See ``plot_sequence``. With ``monospaced_text``, the 3-letter names
+          of the amino acids are drawn with one letter per nucleotide.
         """
         start, end = location[0], location[1]
         strand = location[2] if (len(location) == 3) else 1
@@ -108,28 +141,61 @@ class SequenceAndTranslationMixin:
             translation = extract_graphical_translation(
                 self.sequence, location=new_loc, long_form=long_form_translation,
             )
-        texts = [
-            ((start + 3 * i, start + 3 * (i + 1)), aa)
-            for i, aa in enumerate(translation)
-        ]
 
         y = -0.7 * y_offset * self.feature_level_height
         ymin = ax.get_ylim()[0]
         ax.set_ylim(bottom=min(ymin, -y_offset * self.feature_level_height))
         fontdict = {"size": 11, **(fontdict or {})}
-        guides_color = (0, 0, 0, guides_intensity)
-        for i, ((start, end), text) in enumerate(texts):
-            ax.text(
-                0.5 * (start + end - 1),
-                y,
-                text,
-                ha="center",
-                va="center",
-                fontdict=fontdict,
-            )
-            if guides_intensity:
-                ax.axvline(
-                    start - 0.5, linewidth=0.1, color=guides_color, zorder=-10000,
+        # 3-letter names have one letter per nucleotide, 1-letter names one
+        # letter per codon.
+        long_names = any(len(aa) > 1 for aa in translation)
+        letter_span = 1 if long_names else 3
+        if monospaced_text:
+            text = "".join(aa.center(3) if long_names else aa for aa in translation)
+            self._plot_monospaced_text(ax, start - 0.5, y, text, fontdict, letter_span)
+        elif not (skip_unreadable and self._glyphs_are_unreadable(ax, letter_span)):
+            for i, text in enumerate(translation):
+                ax.text(
+                    start + 3 * i + 1,
+                    y,
+                    text,
+                    ha="center",
+                    va="center",
+                    fontdict=fontdict,
                 )
         if guides_intensity:
-            ax.axvline(end - 0.5, linewidth=0.1, color=guides_color, zorder=-10000)
+            if len(translation):
+                end = start + 3 * len(translation)
+            positions = [start + 3 * i - 0.5 for i in range(len(translation))]
+            positions.append(end - 0.5)
+            self._plot_guides(ax, positions, guides_intensity)
+
+    @staticmethod
+    def _plot_guides(ax, positions, intensity):
+        """Plot vertical lines spanning the whole height of the ax, at the
+        given x positions, as a single LineCollection."""
+        guides = LineCollection(
+            [[(x, 0), (x, 1)] for x in positions],
+            linewidths=0.1,
+            colors=[(0, 0, 0, intensity)],
+            transform=ax.get_xaxis_transform(),
+            zorder=-10000,
+        )
+        ax.add_collection(guides, autolim=False)
+
+    def _glyphs_are_unreadable(self, ax, letter_span):
+        """Return whether letters spaced by ``letter_span`` nucleotides would
+        be narrower than MIN_GLYPH_PIXELS in the ax."""
+        geometry = PlotGeometry.from_ax(ax)
+        return letter_span / geometry.data_per_pixel < MIN_GLYPH_PIXELS
+
+    @staticmethod
+    def _plot_monospaced_text(ax, x_start, y, text, fontdict, letter_span=1):
+        fontdict = dict(fontdict)
+        max_size = fontdict.pop("size", fontdict.pop("fontsize", 11))
+        artist = MonospacedSequenceText(
+            x_start, y, text, letter_span=letter_span, max_size=max_size
+        )
+        artist.update(fontdict)
+        ax.add_artist(artist)
+        return artist
@@ -1,3 +1,4 @@
 from .GraphicRecord import GraphicRecord
+from .PlotGeometry import PlotGeometry, AxGeometry
 
-__all__ = ['GraphicRecord']
+__all__ = ['GraphicRecord', 'PlotGeometry', 'AxGeometry']
@@ -0,0 +1,111 @@
+"""Implements the PlotProfiler, which records the time spent in the different
+phases of a plot (layout computation, drawing of the features and labels...)
+so slow plots can be diagnosed, or monitored by exporting the timings as
+metrics."""
+
+import time
+from contextlib import contextmanager
+
+
+class PlotProfiler:
+    """Record the wall time, number of calls and number of created artists of
+    each phase of a plot.
+
+    A profiler is passed as ``profiler=`` to ``GraphicRecord.plot()``,
+    ``plot_on_multiple_lines()`` or ``plot_with_bokeh()``. Several plots can
+    be profiled with the same profiler, in which case the phases' timings
+    and counts are summed.
+
+    Parameters
+    ----------
+
+    callback
+      Function called as ``callback(phase, duration, n_artists)`` at the end
+      of every phase, e.g. to forward the timings to a metrics system.
+
+    Examples
+    --------
+
+    >>> profiler = PlotProfiler()
+    >>> ax, _ = graphic_record.plot(profiler=profiler)
+    >>> profiler.to_dict()["phases"]["compute_layout"]["time"]
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.phases = {}
+        self.geometry_stats = dict(queries=0, updates=0)
+
+    @contextmanager
+    def phase(self, name, count_artists=None):
+        """Context manager recording the time of a phase.
+
+        Phases can be nested, in which case the time of the inner phase is
+        also counted in the time of the outer phase.
+
+        Parameters
+        ----------
+
+        name
+          Name of the phase, e.g. "compute_layout".
+
+        count_artists
+          Function returning the current number of artists of the plot (e.g.
+          of Matplotlib artists in the ax), used to count the artists created
+          during the phase.
+        """
+        stats = self.phases.setdefault(name, dict(time=0, calls=0, artists=0))
+        artists_before = 0 if count_artists is None else count_artists()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - t0
+            n_artists = 0
+            if count_artists is not None:
+                n_artists = count_artists() - artists_before
+            stats["time"] += duration
+            stats["calls"] += 1
+            stats["artists"] += n_artists
+            if self.callback is not None:
+                self.callback(name, duration, n_artists)
+
+    def add_geometry_stats(self, stats):
+        """Add the ``stats`` (queries and updates) of an AxGeometry."""
+        for key, value in stats.items():
+            self.geometry_stats[key] += value
+
+    def to_dict(self):
+        """Return the timings as a dict (which can be exported in JSON).
+
+        The dict has a ``phases`` entry, giving for each phase (in their order
+        of first occurrence) a dict with the total ``time`` in seconds, the
+        number of ``calls`` and the number of ``artists`` created (0 for the
+        phases which don't count artists, such as the whole plot), and a
+        ``geometry`` entry with the numbers of ``queries`` and ``updates`` of
+        the plots' AxGeometry (see ``AxGeometry.stats``).
+        """
+        return dict(
+            phases={name: dict(stats) for name, stats in self.phases.items()},
+            geometry=dict(self.geometry_stats),
+        )
+
+    def __str__(self):
+        lines = ["%-28s %10s %7s %8s" % ("phase", "time (s)", "calls", "artists")]
+        for name, stats in self.phases.items():
+            lines.append(
+                "%-28s %10.4f %7d %8d"
+                % (name, stats["time"], stats["calls"], stats["artists"])
+            )
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile_phase(profiler, name, count_artists=None):
+    """Record a phase with ``profiler.phase()``, or do nothing if the
+    profiler is None."""
+    if profiler is None:
+        yield
+    else:
+        with profiler.phase(name, count_artists=count_artists):
+            yield
@@ -0,0 +1,200 @@
+"""Implements the RecordsIndex class, an on-disk index of the records of
+multi-record GenBank and GFF files."""
+
+import json
+import os
+from io import StringIO
+
+INDEX_SUFFIX = ".dfvindex"
+INDEX_VERSION = 1
+
+
+class RecordsIndex:
+    """Index of the byte offsets of the records in a multi-record GenBank or
+    GFF file, used to parse only one record of the file.
+
+    The index is built at the first use by scanning the file once, then
+    saved next to the file (``path + ".dfvindex"``) and reloaded from there
+    as long as the file's modification time and size are unchanged. If the
+    index can't be saved (e.g. read-only directory) it is simply rebuilt
+    every time.
+
+    In GenBank files, records can be fetched by LOCUS name, accession or
+    versioned accession (the ``id`` given by Biopython). In GFF files,
+    records are the sequence IDs (first column), whose lines can be spread
+    in several blocks of the file, plus their entry in the ##FASTA section.
+
+    Parameters
+    ----------
+
+    path
+      Path to a GenBank or GFF file.
+
+    filetype
+      Filetype; one of "genbank" or "gff". Default None infers from extension.
+
+    use_cache
+      If False, the index is rebuilt and not saved.
+    """
+
+    def __init__(self, path, filetype=None, use_cache=True):
+        if filetype is None:
+            extension = os.path.splitext(path)[1].lower()
+            filetype = "gff" if extension in (".gff", ".gff3") else "genbank"
+        if filetype not in ("genbank", "gff"):
+            raise ValueError("'Filetype' must be one of 'genbank' or 'gff'.")
+        self.path = path
+        self.filetype = filetype
+        self.index_path = path + INDEX_SUFFIX
+        stat = os.stat(path)
+        self.file_signature = [stat.st_mtime, stat.st_size]
+        self.data = self._load_cached_index() if use_cache else None
+        if self.data is None:
+            self.data = self._build_index()
+            if use_cache:
+                self._save_index()
+
+    def _load_cached_index(self):
+        """Return the cached index data, or None if missing or outdated."""
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (
+            data.get("version") != INDEX_VERSION
+            or data.get("file_signature") != self.file_signature
+            or data.get("filetype") != self.filetype
+        ):
+            return None
+        return data
+
+    def _save_index(self):
+        try:
+            with open(self.index_path, "w") as f:
+                json.dump(self.data, f)
+        except OSError:
+            pass
+
+    def _build_index(self):
+        if self.filetype == "genbank":
+            records, aliases = self._scan_genbank()
+            headers, sequences = {}, {}
+        else:
+            records, headers, sequences = self._scan_gff()
+            aliases = {}
+        return dict(
+            version=INDEX_VERSION,
+            file_signature=self.file_signature,
+            filetype=self.filetype,
+            records=records,
+            aliases=aliases,
+            headers=headers,
+            sequences=sequences,
+        )
+
+    def _scan_genbank(self):
+        """Return {LOCUS name: [[start, end]]} and {other ID: LOCUS name}."""
+        records, aliases = {}, {}
+        name, start = None, None
+        with open(self.path, "rb") as f:
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                if line.startswith(b"LOCUS"):
+                    name, start = line.split()[1].decode(), offset
+                elif name is None:
+                    continue
+                elif line.startswith((b"ACCESSION", b"VERSION")):
+                    words = line.split()
+                    if len(words) > 1:
+                        aliases.setdefault(words[1].decode(), name)
+                elif line.startswith(b"//"):
+                    records[name] = [[start, f.tell()]]
+                    name = None
+        return records, aliases
+
+    def _scan_gff(self):
+        """Return {seqid: [[start, end], ...]} for the blocks of feature lines
+        of each sequence, {seqid: ##sequence-region line} and
+        {seqid: [start, end]} for the entries of the FASTA section."""
+        records, headers, sequences = {}, {}, {}
+        current_id, fasta_id = None, None
+        with open(self.path, "rb") as f:
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                if fasta_id is not None or line.startswith(b">"):
+                    if line.startswith(b">"):
+                        fasta_id = line[1:].split()[0].decode()
+                        sequences[fasta_id] = [offset, f.tell()]
+                    elif fasta_id is not None:
+                        sequences[fasta_id][1] = f.tell()
+                    continue
+                if line.startswith(b"##sequence-region"):
+                    headers[line.split()[1].decode()] = line.decode()
+                if line.startswith(b"#") or not line.strip():
+                    current_id = None
+                    continue
+                seqid = line.split(b"\t", 1)[0].decode()
+                if seqid == current_id:
+                    records[seqid][-1][1] = f.tell()
+                else:
+                    records.setdefault(seqid, []).append([offset, f.tell()])
+                    current_id = seqid
+        for seqid in sequences:
+            records.setdefault(seqid, [])
+        return records, headers, sequences
+
+    @property
+    def records_ids(self):
+        """List of the IDs of the records, in the order of the file."""
+        return list(self.data["records"])
+
+    def __len__(self):
+        return len(self.data["records"])
+
+    def __contains__(self, record_id):
+        return (record_id in self.data["records"]) or (
+            record_id in self.data["aliases"]
+        )
+
+    def _read_chunk(self, f, start, end):
+        f.seek(start)
+        return f.read(end - start).decode()
+
+    def get_record_text(self, record_id):
+        """Return the text of the record in the file format (for GFF, a
+        standalone GFF text with the record's lines and sequence)."""
+        record_id = self.data["aliases"].get(record_id, record_id)
+        if record_id not in self.data["records"]:
+            raise KeyError("No record %s in %s" % (record_id, self.path))
+        blocks = self.data["records"][record_id]
+        with open(self.path, "rb") as f:
+            chunks = [self._read_chunk(f, start, end) for start, end in blocks]
+            if self.filetype == "gff":
+                chunks.insert(0, self.data["headers"].get(record_id, ""))
+                chunks.insert(0, "##gff-version 3\n")
+                if record_id in self.data["sequences"]:
+                    start, end = self.data["sequences"][record_id]
+                    chunks += ["##FASTA\n", self._read_chunk(f, start, end)]
+        return "".join(chunks)
+
+    def load_record(self, record_id):
+        """Parse and return the Biopython record with the given ID."""
+        text = self.get_record_text(record_id)
+        if self.filetype == "genbank":
+            from Bio import SeqIO
+
+            return SeqIO.read(StringIO(text), "genbank")
+        else:
+            from .biotools import GFF
+
+            return list(GFF.parse(StringIO(text)))[0]
+
+    def __repr__(self):
+        return "RecordsIndex(%s, %d records)" % (self.path, len(self))
@@ -0,0 +1,274 @@
+"""Implements the RenderCache class, a content-addressed cache of the images
+and layouts of GraphicRecords."""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from .GraphicFeatureArray import GraphicFeatureArray
+
+FEATURE_ATTRIBUTES = (
+    "start",
+    "end",
+    "strand",
+    "label",
+    "color",
+    "thickness",
+    "linewidth",
+    "linecolor",
+    "open_left",
+    "open_right",
+    "box_linewidth",
+    "box_color",
+    "legend_text",
+    "label_link_color",
+)
+# The only entries of feature.data used by the plots
+FEATURE_DATA_KEYS = ("fixed_level", "nlines")
+# Plot parameters which don't change the plots, left out of the cache keys
+UNCACHED_PARAMETERS = ("profiler",)
+# Names of the images of the disk tier, see RenderCache._disk_path
+DISK_FILENAME_REGEX = re.compile(r"^[0-9a-f]{64}\.\w+$")
+
+
+def _stable_repr(value):
+    return json.dumps(value, sort_keys=True, default=repr)
+
+
+def _cached_parameters(params):
+    """Return the parameters without those which don't change the plots."""
+    return {k: v for k, v in params.items() if k not in UNCACHED_PARAMETERS}
+
+
+def graphic_record_hash(record):
+    """Return a SHA-256 hash of everything defining a GraphicRecord's plots:
+    class, features, sequence, sequence_length, first_index and styling
+    attributes (including the class' ``default_*`` attributes).
+
+    Attributes values are hashed through their JSON representation, or their
+    ``repr()`` for non-JSON values, which must then be stable.
+    """
+    record_class = type(record)
+    class_name = "%s.%s" % (record_class.__module__, record_class.__name__)
+    hasher = hashlib.sha256(class_name.encode())
+    attributes = {
+        name: value
+        for name, value in vars(record).items()
+        if not name.startswith("_") and name != "sequence"
+    }
+    attributes.update(
+        (name, getattr(record_class, name))
+        for name in dir(record_class)
+        if name.startswith("default_") or name == "min_y_height_of_text_line"
+    )
+    hasher.update(_stable_repr(attributes).encode())
+    sequence = getattr(record, "sequence", None)
+    if sequence is not None:
+        hasher.update(b"sequence:" + str(sequence).encode())
+    features = record.features
+    if isinstance(features, GraphicFeatureArray):
+        for column in features._columns().values():
+            hasher.update(column.tobytes())
+        hasher.update(
+            _stable_repr(
+                [features.labels, features.colors, features.feature_properties]
+            ).encode()
+        )
+    else:
+        for feature in features:
+            description = [getattr(feature, name) for name in FEATURE_ATTRIBUTES]
+            description += [feature.fontdict]
+            description += [feature.data.get(key) for key in FEATURE_DATA_KEYS]
+            hasher.update(_stable_repr(description).encode())
+    return hasher.hexdigest()
+
+
+class RenderCache:
+    """Cache of the images (PNG, SVG...) and layouts of GraphicRecords,
+    indexed by a hash of the records' content and of the plot parameters.
+
+    Two records with the same features, sequence and styling share the same
+    cache entries, even if they are different objects. Images are kept in
+    memory with a least-recently-used eviction, and can also be saved in a
+    directory (the disk tier), which is useful to share the cache between
+    processes or to keep it across restarts.
+
+    A same cache can be used from several threads: the memory tier and the
+    disk tier's eviction are guarded by a lock, and the records are rendered
+    outside the lock.
+
+    Parameters
+    ----------
+
+    max_items
+      Maximal number of images (and of layouts) kept in memory.
+
+    cache_dir
+      Directory of the disk tier. Leave to None for a memory-only cache.
+
+    max_disk_size
+      Maximal total size in bytes of the images in ``cache_dir``. The least
+      recently used images are deleted when the size is exceeded. Leave to
+      None for no limit.
+
+    Examples
+    --------
+
+    >>> cache = RenderCache(max_items=256, cache_dir="/tmp/plots_cache")
+    >>> png_bytes = cache.render(graphic_record, "png", figure_width=10)
+
+    Attributes
+    ----------
+
+    stats
+      Dict counting the "memory_hits", "disk_hits" and "misses" of the cache.
+    """
+
+    def __init__(self, max_items=128, cache_dir=None, max_disk_size=None):
+        self.max_items = max_items
+        self.cache_dir = cache_dir
+        self.max_disk_size = max_disk_size
+        self._images = OrderedDict()
+        self._layouts = OrderedDict()
+        self.stats = dict(memory_hits=0, disk_hits=0, misses=0)
+        self._lock = threading.Lock()
+        if cache_dir is not None and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+    def render_key(self, record, file_format="png", dpi=None, **plot_params):
+        """Return the cache key of a record's image with the given parameters."""
+        if plot_params.get("ax") is not None:
+            raise ValueError("Plots on an existing ax can't be cached.")
+        parameters = _stable_repr([file_format, dpi, _cached_parameters(plot_params)])
+        hasher = hashlib.sha256(graphic_record_hash(record).encode())
+        hasher.update(parameters.encode())
+        return hasher.hexdigest()
+
+    def _remember(self, cache, key, value):
+        """Add an entry to a memory cache (to be called with the lock)."""
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.max_items:
+            cache.popitem(last=False)
+
+    def render(self, record, file_format="png", dpi=None, **plot_params):
+        """Return the bytes of the image of ``record.plot(**plot_params)``,
+        saved with ``bbox_inches="tight"``, from the cache if possible."""
+        key = self.render_key(record, file_format, dpi, **plot_params)
+        with self._lock:
+            if key in self._images:
+                self._images.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return self._images[key]
+        image = self._read_from_disk(key, file_format)
+        if image is not None:
+            stat = "disk_hits"
+        else:
+            stat = "misses"
+            image = self._render_image(record, file_format, dpi, plot_params)
+            self._write_to_disk(key, file_format, image)
+        with self._lock:
+            self.stats[stat] += 1
+            self._remember(self._images, key, image)
+        return image
+
+    @staticmethod
+    def _render_image(record, file_format, dpi, plot_params):
+        return record.render(file_format, dpi=dpi, **plot_params)
+
+    def compute_layout(self, record, geometry, **layout_params):
+        """Return ``record.compute_layout(geometry, **layout_params)``, from
+        the (memory) cache if possible.
+
+        The layout of a cached entry may refer to the features of another
+        (identical) record. It is shared by all callers and must not be
+        modified.
+        """
+        key = _stable_repr(
+            [
+                graphic_record_hash(record),
+                geometry.x_lim,
+                geometry.ax_width,
+                geometry.dpi,
+                _cached_parameters(layout_params),
+            ]
+        )
+        with self._lock:
+            if key in self._layouts:
+                self._layouts.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return self._layouts[key]
+        layout = record.compute_layout(geometry, **layout_params)
+        with self._lock:
+            self.stats["misses"] += 1
+            self._remember(self._layouts, key, layout)
+        return layout
+
+    def _disk_path(self, key, file_format):
+        return os.path.join(self.cache_dir, key + "." + file_format)
+
+    def _read_from_disk(self, key, file_format):
+        if self.cache_dir is None:
+            return None
+        path = self._disk_path(key, file_format)
+        try:
+            with open(path, "rb") as f:
+                image = f.read()
+            os.utime(path)  # marks the file as recently used
+        except OSError:
+            return None
+        return image
+
+    def _write_to_disk(self, key, file_format, image):
+        if self.cache_dir is None:
+            return
+        path = self._disk_path(key, file_format)
+        temporary_path = path + ".%d.%d.tmp" % (os.getpid(), threading.get_ident())
+        with open(temporary_path, "wb") as f:
+            f.write(image)
+        os.replace(temporary_path, path)
+        if self.max_disk_size is not None:
+            with self._lock:
+                self._evict_from_disk()
+
+    def _evict_from_disk(self):
+        """Delete the least recently used images until the disk tier is
+        within ``max_disk_size``.
+
+        Only the cache's images (named after their key) are considered, so
+        other files in ``cache_dir`` are neither counted nor deleted.
+        """
+        entries = [
+            entry
+            for entry in os.scandir(self.cache_dir)
+            if entry.is_file() and DISK_FILENAME_REGEX.match(entry.name)
+        ]
+        entries = [
+            (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+            for entry in entries
+        ]
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_disk_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total_size -= size
+
+    def clear(self):
+        """Empty the memory tier of the cache (the disk tier is kept)."""
+        with self._lock:
+            self._images.clear()
+            self._layouts.clear()
+
+    def __repr__(self):
+        return "RenderCache(%d images, %d layouts, cache_dir=%s)" % (
+            len(self._images),
+            len(self._layouts),
+            self.cache_dir,
+        )
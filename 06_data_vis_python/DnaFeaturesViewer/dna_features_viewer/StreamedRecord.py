@@ -0,0 +1,440 @@
+"""Streaming loading of the features of GenBank and GFF files.
+
+The features are parsed one at a time as they are iterated over, optionally
+filtered by region, and the record's sequence is only read from the file if
+it is actually used (for instance to plot the sequence or a translation).
+"""
+
+import os
+from urllib.parse import unquote
+
+GENBANK_QUALIFIER_INDENT = 21
+GFF_STRANDS = {"+": 1, "-": -1}
+
+
+class SequenceSource:
+    """Reads the full sequence of a record from a file, once, when first
+    needed.
+
+    Parameters
+    ----------
+
+    path
+      Path to the file.
+
+    offset
+      Byte offset in the file of the first line of the sequence.
+
+    file_format
+      Either "genbank" (sequence lines after ``ORIGIN``, until ``//``) or
+      "fasta" (sequence lines after a ``>`` header, until the next header).
+    """
+
+    def __init__(self, path, offset, file_format):
+        self.path = path
+        self.offset = offset
+        self.file_format = file_format
+        self._sequence = None
+
+    def get(self):
+        """Return the full sequence (as a string), reading it if needed."""
+        if self._sequence is None:
+            self._sequence = self._read()
+        return self._sequence
+
+    @property
+    def is_loaded(self):
+        return self._sequence is not None
+
+    def _read(self):
+        chunks = []
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            f.readline()  # the ORIGIN line, or the fasta header
+            for line in f:
+                line = line.decode()
+                if line.startswith("//") or line.startswith(">"):
+                    break
+                if self.file_format == "genbank":
+                    line = "".join(line.split()[1:]).upper()
+                chunks.append(line.strip())
+        return "".join(chunks)
+
+
+class LazySequence:
+    """A string-like view of a record's sequence, read from the file only
+    when the nucleotides are actually accessed.
+
+    Slicing a LazySequence returns another LazySequence (so cropping a
+    GraphicRecord doesn't read the sequence). ``str()``, iterating or
+    indexing with an integer read the sequence (once for all views).
+
+    Parameters
+    ----------
+
+    source
+      A SequenceSource.
+
+    start, end
+      Boundaries of this view in the full sequence.
+    """
+
+    def __init__(self, source, start, end):
+        self.source = source
+        self.start = start
+        self.end = end
+
+    def __str__(self):
+        return self.source.get()[self.start : self.end]
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __iter__(self):
+        return iter(str(self))
+
+    def __getitem__(self, key):
+        if isinstance(key, slice) and key.step in (None, 1):
+            start, end, _ = key.indices(len(self))
+            end = max(start, end)
+            return LazySequence(self.source, self.start + start, self.start + end)
+        return str(self)[key]
+
+    def __eq__(self, other):
+        return str(self) == str(other)
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __getattr__(self, name):
+        # Other string methods (upper, count, etc.) act on the sequence
+        if name in ("source", "start", "end"):
+            raise AttributeError(name)
+        return getattr(str(self), name)
+
+    def __repr__(self):
+        return "LazySequence(%s, %d, %d)" % (self.source.path, self.start, self.end)
+
+
+class StreamedRecord:
+    """Record whose features are parsed from a file as they are iterated
+    over. Create instances with ``stream_record()``.
+
+    A StreamedRecord can be given directly to
+    ``BiopythonTranslator.translate_record``. Its features (Biopython
+    SeqFeatures) can only be iterated over once.
+
+    Attributes
+    ----------
+
+    id
+      ID of the record (LOCUS name, or GFF sequence ID).
+
+    features
+      Iterator over the record's Biopython SeqFeatures.
+
+    seq
+      A LazySequence, or None if the file has no sequence. Only available
+      after the features have all been iterated over.
+    """
+
+    def __init__(self, path, filetype, region=None):
+        self.path = path
+        self.filetype = filetype
+        self.region = region
+        self.id = None
+        self._length = None
+        self._max_end = 0
+        self._sequence_source = None
+        self._exhausted = False
+        self.features = self._iter_features()
+
+    def __iter__(self):
+        return self.features
+
+    def _iter_features(self):
+        if self.filetype == "genbank":
+            features = self._iter_genbank_features()
+        else:
+            features = self._iter_gff_features()
+        for feature in features:
+            start, end = feature.location.start, feature.location.end
+            self._max_end = max(self._max_end, int(end))
+            if self.region is not None:
+                region_start, region_end = self.region
+                if (end < region_start) or (start > region_end):
+                    continue
+            yield feature
+        self._exhausted = True
+
+    def _iter_genbank_features(self):
+        from Bio.GenBank.Scanner import GenBankScanner
+
+        scanner = GenBankScanner()
+        features_end = tuple(GenBankScanner.SEQUENCE_HEADERS) + ("//",)
+        with open(self.path, "rb") as f:
+            line = f.readline().decode()
+            while line and not line.startswith("FEATURES"):
+                if line.startswith("LOCUS"):
+                    words = line.split()
+                    self.id = words[1]
+                    if len(words) > 2 and words[2].isdigit():
+                        self._length = int(words[2])
+                line = f.readline().decode()
+            key, lines = None, []
+            while True:
+                offset = f.tell()
+                line = f.readline().decode()
+                if (not line) or line.startswith(features_end):
+                    break
+                if line[:GENBANK_QUALIFIER_INDENT].strip() == "":
+                    lines.append(line[GENBANK_QUALIFIER_INDENT:].strip())
+                    continue
+                if key is not None:
+                    yield _genbank_feature(scanner, key, lines, self._length)
+                key = line[:GENBANK_QUALIFIER_INDENT].strip()
+                lines = [line[GENBANK_QUALIFIER_INDENT:].strip()]
+            if key is not None:
+                yield _genbank_feature(scanner, key, lines, self._length)
+            while line and not line.startswith(("ORIGIN", "//")):
+                offset = f.tell()
+                line = f.readline().decode()
+            if line.startswith("ORIGIN"):
+                self._sequence_source = SequenceSource(self.path, offset, "genbank")
+
+    def _iter_gff_features(self):
+        with open(self.path, "rb") as f:
+            while True:
+                offset = f.tell()
+                line = f.readline().decode()
+                if not line:
+                    break
+                if line.startswith("##FASTA"):
+                    self._find_fasta_sequence(f)
+                    break
+                if line.startswith("##sequence-region"):
+                    seqid, _, end = line.split()[1:4]
+                    if self.id in (None, seqid):
+                        self.id = seqid
+                        self._length = int(end)
+                    continue
+                if line.startswith("#") or not line.strip():
+                    continue
+                if line.startswith(">"):
+                    # FASTA section without ##FASTA directive
+                    f.seek(offset)
+                    self._find_fasta_sequence(f)
+                    break
+                columns = line.rstrip("\r\n").split("\t")
+                if self.id is None:
+                    self.id = columns[0]
+                if columns[0] != self.id:
+                    continue
+                if self.region is not None:
+                    # Skip the features out of the region before parsing them
+                    start, end = int(columns[3]) - 1, int(columns[4])
+                    self._max_end = max(self._max_end, end)
+                    if (end < self.region[0]) or (start > self.region[1]):
+                        continue
+                yield _gff_feature(columns)
+
+    def _find_fasta_sequence(self, f):
+        """Set the record's sequence source at the FASTA entry matching the
+        record ID, if any (``f`` is at the start of the FASTA section)."""
+        while True:
+            offset = f.tell()
+            line = f.readline().decode()
+            if not line:
+                return
+            if line.startswith(">") and line[1:].split()[0] == self.id:
+                self._sequence_source = SequenceSource(self.path, offset, "fasta")
+                return
+
+    def _consume(self):
+        if not self._exhausted:
+            for _ in self.features:
+                pass
+
+    @property
+    def seq(self):
+        """The record's LazySequence (None if the file has no sequence)."""
+        self._consume()
+        if self._sequence_source is None:
+            return None
+        return LazySequence(self._sequence_source, 0, len(self))
+
+    def __len__(self):
+        if self._length is None:
+            self._consume()
+            if self._sequence_source is not None:
+                self._length = len(self._sequence_source.get())
+            else:
+                self._length = self._max_end
+        return self._length
+
+    def __repr__(self):
+        return "StreamedRecord(%s, id=%s)" % (self.path, self.id)
+
+
+def _split_location_parts(text):
+    """Split the comma-separated parts of a join(...) or order(...) location,
+    ignoring the commas of nested parentheses."""
+    parts, depth, part_start = [], 0, 0
+    for i, character in enumerate(text):
+        if character == "(":
+            depth += 1
+        elif character == ")":
+            depth -= 1
+        elif character == "," and depth == 0:
+            parts.append(text[part_start:i])
+            part_start = i + 1
+    parts.append(text[part_start:])
+    return parts
+
+
+def _genbank_position(text, is_end):
+    """Return a Biopython position from a GenBank position like 12, <1 or >20
+    (converted to 0-based if it is a start)."""
+    from Bio.SeqFeature import AfterPosition, BeforePosition, ExactPosition
+
+    value = int(text.lstrip("<>")) - (0 if is_end else 1)
+    if text.startswith("<"):
+        return BeforePosition(value)
+    if text.startswith(">"):
+        return AfterPosition(value)
+    return ExactPosition(value)
+
+
+def _genbank_location_parts(text, strand, sequence_length):
+    """Return the list of FeatureLocations of a GenBank location string, in
+    the order of the (possibly complemented) location."""
+    from Bio.SeqFeature import FeatureLocation
+
+    if text.startswith("complement(") and text.endswith(")"):
+        parts = _genbank_location_parts(text[11:-1], -strand, sequence_length)
+        return parts[::-1]
+    for operator in ("join(", "order("):
+        if text.startswith(operator) and text.endswith(")"):
+            return [
+                location
+                for part in _split_location_parts(text[len(operator) : -1])
+                for location in _genbank_location_parts(
+                    part, strand, sequence_length
+                )
+            ]
+    ref = None
+    if ":" in text:
+        ref, text = text.split(":", 1)
+    if "^" in text:
+        # Site between two bases
+        position = int(text.split("^")[0])
+        return [FeatureLocation(position, position, strand, ref=ref)]
+    if ".." not in text:
+        start, end = _genbank_position(text, False), _genbank_position(text, True)
+        return [FeatureLocation(start, end, strand, ref=ref)]
+    start_text, end_text = text.split("..")
+    start = _genbank_position(start_text, is_end=False)
+    end = _genbank_position(end_text, is_end=True)
+    if (sequence_length is not None) and (start > end):
+        # Feature over the origin of a circular sequence
+        return [
+            FeatureLocation(start, sequence_length, strand, ref=ref),
+            FeatureLocation(0, end, strand, ref=ref),
+        ]
+    return [FeatureLocation(start, end, strand, ref=ref)]
+
+
+def _genbank_location(location_string, sequence_length=None):
+    """Return a FeatureLocation or CompoundLocation from a GenBank location
+    string like ``complement(join(<1..206,300..>400))``.
+
+    This parser is used instead of ``Location.fromstring`` which is only
+    available from Biopython 1.80.
+    """
+    from Bio.SeqFeature import CompoundLocation
+
+    text = "".join(location_string.split())
+    operator = "order" if "order(" in text else "join"
+    parts = _genbank_location_parts(text, 1, sequence_length)
+    if len(parts) == 1:
+        return parts[0]
+    return CompoundLocation(parts, operator=operator)
+
+
+def _genbank_feature(scanner, key, lines, sequence_length):
+    """Return a Biopython SeqFeature from the lines of a GenBank feature."""
+    from Bio.SeqFeature import SeqFeature
+
+    key, location_string, raw_qualifiers = scanner.parse_feature(key, lines)
+    qualifiers = {}
+    for name, value in raw_qualifiers:
+        if value is None:
+            value = ""
+        elif value.startswith('"') and value.endswith('"'):
+            value = value[1:-1].replace('""', '"')
+        joiner = "" if name == "translation" else " "
+        qualifiers.setdefault(name, []).append(value.replace("\n", joiner))
+    location = _genbank_location(location_string, sequence_length)
+    return SeqFeature(location, type=key, qualifiers=qualifiers)
+
+
+def _gff_feature(columns):
+    """Return a Biopython SeqFeature from the columns of a GFF line."""
+    from Bio.SeqFeature import FeatureLocation, SeqFeature
+
+    _, source, feature_type, start, end, score, strand, phase = columns[:8]
+    qualifiers = {"source": [source]}
+    if score != ".":
+        qualifiers["score"] = [score]
+    if phase != ".":
+        qualifiers["phase"] = [phase]
+    attributes = columns[8] if len(columns) > 8 else ""
+    for attribute in attributes.strip().split(";"):
+        if "=" not in attribute:
+            continue
+        name, values = attribute.split("=", 1)
+        qualifiers[unquote(name)] = [unquote(v) for v in values.split(",")]
+    location = FeatureLocation(int(start) - 1, int(end), GFF_STRANDS.get(strand))
+    feature = SeqFeature(location, type=feature_type, qualifiers=qualifiers)
+    if "ID" in qualifiers:
+        feature.id = qualifiers["ID"][0]
+    return feature
+
+
+def stream_record(path, filetype=None, region=None):
+    """Return a StreamedRecord parsing the features of a GenBank or GFF file
+    one at a time.
+
+    Unlike ``load_record``, the full record is never held in memory: the
+    features are parsed as they are iterated over, and the sequence is only
+    read from the file if the nucleotides are accessed.
+
+    For multi-record files, only the first record is streamed. GFF features
+    are returned flat (no sub-features hierarchy).
+
+    Parameters
+    ----------
+
+    path
+      Path to a GenBank or GFF file.
+
+    filetype
+      Filetype; one of "genbank" or "gff". Default None infers from extension.
+
+    region
+      Optional (start, end) window (zero-based). Only the features
+      overlapping the region are returned.
+
+    Examples
+    --------
+
+    >>> record = stream_record("genome.gff", region=(100000, 150000))
+    >>> graphic_record = BiopythonTranslator().translate_record(record)
+    >>> graphic_record.crop((100000, 150000)).plot(plot_sequence=True)
+    """
+    if filetype is None:
+        extension = os.path.splitext(path)[1].lower()
+        filetype = "gff" if extension in (".gff", ".gff3") else "genbank"
+    if filetype not in ("genbank", "gff"):
+        raise ValueError("'Filetype' must be one of 'genbank' or 'gff'.")
+    return StreamedRecord(path, filetype, region=region)
@@ -1,13 +1,19 @@
 """ dna_features_viewer/__init__.py """
 
-from .GraphicRecord import GraphicRecord
+from .GraphicRecord import GraphicRecord, PlotGeometry, AxGeometry
 from .CircularGraphicRecord import CircularGraphicRecord
 from .GraphicFeature import GraphicFeature
+from .GraphicFeatureArray import GraphicFeatureArray
 from .BiopythonTranslator import (
     BiopythonTranslator,
     BlackBoxlessLabelTranslator,
 )
 from .biotools import load_record, annotate_biopython_record
+from .StreamedRecord import stream_record, StreamedRecord, LazySequence
+from .RecordsIndex import RecordsIndex
+from .batch_rendering import render_records_files
+from .RenderCache import RenderCache, graphic_record_hash
+from .PlotProfiler import PlotProfiler
 
 from .version import __version__
 
@@ -15,8 +21,19 @@ __all__ = [
     "GraphicRecord",
     "CircularGraphicRecord",
     "GraphicFeature",
+    "GraphicFeatureArray",
+    "PlotGeometry",
+    "AxGeometry",
     "BiopythonTranslator",
     "BlackBoxlessLabelTranslator",
     "annotate_biopython_record",
+    "stream_record",
+    "StreamedRecord",
+    "LazySequence",
+    "RecordsIndex",
+    "render_records_files",
+    "RenderCache",
+    "graphic_record_hash",
+    "PlotProfiler",
     "__version__",
 ]
@@ -0,0 +1,79 @@
+"""Command line interface, rendering many GenBank/GFF files at once.
+
+Usage example::
+
+    python -m dna_features_viewer records_dir/ plots_dir/ --workers 8 --format svg
+"""
+
+import argparse
+import sys
+
+from .batch_rendering import render_records_files
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog="dna_features_viewer",
+        description="Plot the records of GenBank/GFF files into image files. "
+        "Files unchanged since their last rendering are skipped.",
+    )
+    parser.add_argument(
+        "source", help="Directory of GenBank/GFF files, or manifest file."
+    )
+    parser.add_argument("target_dir", help="Directory where to write the images.")
+    parser.add_argument("--format", default="png", help="Image format (png, svg...)")
+    parser.add_argument(
+        "--circular", action="store_true", help="Plot circular records."
+    )
+    parser.add_argument("--figure-width", type=float, default=10)
+    parser.add_argument("--dpi", type=float, default=None)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Number of worker processes."
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Also render the unchanged files."
+    )
+    parser.add_argument("--quiet", action="store_true", help="No per-file logs.")
+    params = parser.parse_args(args)
+
+    def logger(file_report):
+        print(
+            "%7.2fs  %-8s  %s%s"
+            % (
+                file_report["time"],
+                file_report["status"],
+                file_report["input"],
+                ("  (%s)" % file_report["error"]) if file_report["error"] else "",
+            )
+        )
+        sys.stdout.flush()
+
+    try:
+        report = render_records_files(
+            params.source,
+            params.target_dir,
+            file_format=params.format,
+            record_class="circular" if params.circular else "linear",
+            figure_width=params.figure_width,
+            dpi=params.dpi,
+            workers=params.workers,
+            force=params.force,
+            logger=None if params.quiet else logger,
+        )
+    except ValueError as error:
+        parser.error(str(error))
+    print(
+        "%d rendered, %d skipped, %d failed in %.1fs (%.2f files/s)"
+        % (
+            report["n_rendered"],
+            report["n_skipped"],
+            report["n_failed"],
+            report["total_time"],
+            report["throughput"],
+        )
+    )
+    return 1 if report["n_failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""Rendering of the plots of many GenBank/GFF files in one go, using a pool
+of worker processes which pay the Matplotlib/Biopython imports only once.
+
+Also available from the command line, see ``python -m dna_features_viewer -h``.
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .BiopythonTranslator import BiopythonTranslator
+from .version import __version__
+
+RECORD_EXTENSIONS = (".gb", ".gbk", ".genbank", ".gff", ".gff3")
+HASHES_FILENAME = ".dfv_batch_hashes.json"
+
+_worker_settings = None
+
+
+def list_records_files(source):
+    """Return the paths of the record files of a directory (GenBank and GFF
+    files, sorted by name), of a manifest (text file with one path per line,
+    relative to the manifest's directory), or of a list of paths."""
+    if not isinstance(source, str):
+        return list(source)
+    if os.path.isdir(source):
+        return [
+            os.path.join(source, name)
+            for name in sorted(os.listdir(source))
+            if name.lower().endswith(RECORD_EXTENSIONS)
+        ]
+    directory = os.path.dirname(source)
+    with open(source, "r") as f:
+        lines = [line.strip() for line in f]
+    return [
+        os.path.join(directory, line)
+        for line in lines
+        if line and not line.startswith("#")
+    ]
+
+
+def _output_names(paths, file_format):
+    """Return the names of the images of the record files, e.g.
+    ``name.gb.png`` for ``dir/name.gb``. Raise a ValueError if two files
+    would have the same image (e.g. files of the same name in different
+    directories)."""
+    names = [os.path.basename(path) + "." + file_format for path in paths]
+    inputs_by_name = {}
+    for path, name in zip(paths, names):
+        inputs_by_name.setdefault(name, []).append(path)
+    collisions = [
+        "%s (from %s)" % (name, ", ".join(inputs))
+        for name, inputs in inputs_by_name.items()
+        if len(inputs) > 1
+    ]
+    if collisions:
+        raise ValueError(
+            "Several record files would be rendered to the same image: "
+            + "; ".join(collisions)
+        )
+    return names
+
+
+def _settings_signature(settings):
+    """Return a string describing the rendering settings, for the hashes."""
+    translator = settings["translator"]
+    description = dict(
+        settings,
+        translator="%s.%s" % (type(translator).__module__, type(translator).__name__),
+        record_class=getattr(
+            settings["record_class"], "__name__", settings["record_class"]
+        ),
+        version=__version__,
+    )
+    return json.dumps(description, sort_keys=True, default=repr)
+
+
+def file_content_hash(path, settings_signature=""):
+    """Return the SHA-256 hash of the file's content and the settings."""
+    hasher = hashlib.sha256(settings_signature.encode())
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _init_worker(settings):
+    """Store the rendering settings in the worker."""
+    global _worker_settings
+    _worker_settings = settings
+
+
+def _render_file(path, target, settings=None):
+    """Render one record file. Return (duration, error message or None)."""
+    if settings is None:
+        settings = _worker_settings
+    t0 = time.perf_counter()
+    try:
+        graphic_record = settings["translator"].translate_record(
+            path, record_class=settings["record_class"]
+        )
+        image = graphic_record.render(
+            fmt=settings["file_format"],
+            dpi=settings["dpi"],
+            figure_width=settings["figure_width"],
+            **settings["plot_params"]
+        )
+        with open(target, "wb") as f:
+            f.write(image)
+        error = None
+    except Exception as exception:
+        error = "%s: %s" % (type(exception).__name__, exception)
+    return time.perf_counter() - t0, error
+
+
+def _render_files_in_process(paths, targets, settings):
+    for path, target in zip(paths, targets):
+        yield _render_file(path, target, settings)
+
+
+def render_records_files(
+    source,
+    target_dir,
+    file_format="png",
+    record_class=None,
+    translator=None,
+    figure_width=10,
+    dpi=None,
+    workers=None,
+    force=False,
+    logger=None,
+    **plot_params
+):
+    """Plot the records of many GenBank/GFF files into image files.
+
+    Each ``name.gb`` file is rendered as ``target_dir/name.gb.png`` (or other
+    format), so ``name.gb`` and ``name.gff`` get different images. A
+    ValueError is raised if several inputs have the same file name (e.g. from
+    different directories of a manifest). The inputs which haven't changed since their last rendering with
+    the same settings (as per a hash of the file's content and settings,
+    stored in ``target_dir/.dfv_batch_hashes.json``) are skipped.
+
+    Parameters
+    ----------
+
+    source
+      A directory (all its .gb, .gbk, .genbank, .gff, .gff3 files are
+      rendered), a manifest (text file with one record file path per line,
+      relative to the manifest's directory) or a list of file paths.
+
+    target_dir
+      Directory where to write the images. Created if needed.
+
+    file_format
+      Extension of the images, e.g. "png", "svg", "pdf".
+
+    record_class
+      GraphicRecord (default) or CircularGraphicRecord, or "linear" or
+      "circular".
+
+    translator
+      A BiopythonTranslator (or subclass) instance, by default
+      ``BiopythonTranslator()``. It is sent once to every worker, so it must
+      be picklable. Changes in a custom translator's code are not detected
+      by the hashes: use ``force=True`` in that case.
+
+    figure_width, dpi, **plot_params
+      Parameters of ``GraphicRecord.render()`` (see ``plot()``).
+
+    workers
+      Number of worker processes. Leave to None (or 1) to render all files in
+      the current process.
+
+    force
+      If True, all files are rendered, even the unchanged ones.
+
+    logger
+      Function called as ``logger(file_report)`` after each file, e.g. to
+      print progress (see the report's "files" entries below).
+
+    Returns
+    -------
+
+    report
+      A dict with a "files" list of dicts (one per input file, with keys
+      "input", "output", "status" which is one of "rendered", "skipped" or
+      "failed", "time" in seconds and "error"), and summary entries
+      "n_rendered", "n_skipped", "n_failed", "total_time" and "throughput"
+      (rendered files per second).
+    """
+    t0 = time.perf_counter()
+    paths = list_records_files(source)
+    names = _output_names(paths, file_format)
+    if translator is None:
+        translator = BiopythonTranslator()
+    settings = dict(
+        translator=translator,
+        record_class=record_class,
+        file_format=file_format,
+        figure_width=figure_width,
+        dpi=dpi,
+        plot_params=plot_params,
+    )
+    signature = _settings_signature(settings)
+    if not os.path.exists(target_dir):
+        os.makedirs(target_dir)
+    hashes_path = os.path.join(target_dir, HASHES_FILENAME)
+    hashes = {}
+    if os.path.exists(hashes_path):
+        with open(hashes_path, "r") as f:
+            hashes = json.load(f)
+
+    reports, to_render = [], []
+    for path, name in zip(paths, names):
+        target = os.path.join(target_dir, name)
+        report = dict(input=path, output=target, status="skipped", time=0, error=None)
+        reports.append(report)
+        report["hash"] = file_content_hash(path, signature)
+        if force or hashes.get(name) != report["hash"] or not os.path.exists(target):
+            to_render.append(report)
+        elif logger is not None:
+            logger(report)
+
+    paths = [report["input"] for report in to_render]
+    targets = [report["output"] for report in to_render]
+    pool = None
+    if (workers is not None) and (workers > 1) and (len(to_render) > 1):
+        pool = ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(settings,)
+        )
+        results = pool.map(_render_file, paths, targets)
+    else:
+        results = _render_files_in_process(paths, targets, settings)
+    try:
+        for report, (duration, error) in zip(to_render, results):
+            report.update(time=duration, error=error)
+            report["status"] = "failed" if error else "rendered"
+            name = os.path.basename(report["output"])
+            if error:
+                hashes.pop(name, None)
+            else:
+                hashes[name] = report["hash"]
+            if logger is not None:
+                logger(report)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        with open(hashes_path, "w") as f:
+            json.dump(hashes, f, indent=1, sort_keys=True)
+
+    for report in reports:
+        report.pop("hash")
+    total_time = time.perf_counter() - t0
+    counts = {
+        status: sum(report["status"] == status for report in reports)
+        for status in ("rendered", "skipped", "failed")
+    }
+    return dict(
+        files=reports,
+        n_rendered=counts["rendered"],
+        n_skipped=counts["skipped"],
+        n_failed=counts["failed"],
+        total_time=total_time,
+        throughput=counts["rendered"] / total_time if total_time else 0,
+    )
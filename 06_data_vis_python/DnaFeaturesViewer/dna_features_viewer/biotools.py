@@ -1,17 +1,43 @@
+import itertools
 import textwrap
-from Bio.Seq import Seq
-from Bio.SeqFeature import SeqFeature, FeatureLocation
-from Bio.PDB.Polypeptide import aa1, aa3
-from Bio import SeqIO
-
-try:
-    from BCBio import GFF
-except ImportError:
-
-    class GFF:
-        def parse(*a):
-            """Not available. Please install bcbio-gff."""
+import warnings
+from functools import lru_cache
+
+import numpy as np
+
+from .RecordsIndex import RecordsIndex
+
+# Biopython and bcbio-gff are slow to import, so they are only imported in the
+# functions which use them.
+
+
+class GFF:
+    @staticmethod
+    def parse(*args, **kwargs):
+        """Return ``BCBio.GFF.parse(*args, **kwargs)``."""
+        try:
+            from BCBio import GFF
+        except ImportError:
             raise ImportError("Please install the bcbio-gff library to parse GFF data")
+        return GFF.parse(*args, **kwargs)
+
+
+TEXT_WRAP_CACHE_SIZE = 4096
+PARTIAL_CODON_WARNING = (
+    "Partial codon, len(sequence) not a multiple of three. Explicitly trim the "
+    "sequence or add trailing N before translation. This may become an error "
+    "in future."
+)
+
+
+@lru_cache(maxsize=None)
+def _complement_table():
+    """Return the str.translate table of the complements of all ASCII
+    characters, as computed by Biopython."""
+    from Bio.Seq import Seq
+
+    characters = [chr(i) for i in range(128)]
+    return str.maketrans({c: str(Seq(c).complement()) for c in characters})
 
 
 def complement(dna_sequence):
@@ -19,35 +45,100 @@ def complement(dna_sequence):
 
     For instance ``complement("ATGCCG")`` returns ``"TACGGC"``.
 
-    Uses BioPython for speed.
+    Uses a ``str.translate`` table computed once with Biopython, so the
+    result is the same as Biopython's (ambiguous nucleotides, lower case...).
     """
-    return str(Seq(dna_sequence).complement())
+    return str(dna_sequence).translate(_complement_table())
 
 
 def reverse_complement(sequence):
     """Return the reverse-complement of the DNA sequence.
 
     For instance ``complement("ATGCCG")`` returns ``"GCCGTA"``.
-
-    Uses BioPython for speed.
     """
     return complement(sequence)[::-1]
 
 
-if type(aa1) is str and type(aa3) is list:
-    # biopython before 1.80
-    aa_short_to_long_form_dict = {
-        _aa1: _aa3[0] + _aa3[1:].lower() for (_aa1, _aa3) in zip(aa1 + "*", aa3 + ["*"])
-    }
-else:
-    # type is tuple
-    # biopython 1.80 and later
-    # See issue #73
-    # relevant biopython commit: https://github.com/biopython/biopython/commit/257143be9196b77619d3d8cadc22039212681e08
-    aa_short_to_long_form_dict = {
-        _aa1: _aa3[0] + _aa3[1:].lower()
-        for (_aa1, _aa3) in zip(aa1 + ("*",), aa3 + ("*",))
-    }
+@lru_cache(maxsize=None)
+def _aa_short_to_long_form_dict():
+    """Return the dict {"A": "Ala", "C": "Cys", ..., "*": "*"}."""
+    from Bio.PDB.Polypeptide import aa1, aa3
+
+    if type(aa1) is str and type(aa3) is list:
+        # biopython before 1.80
+        return {
+            _aa1: _aa3[0] + _aa3[1:].lower()
+            for (_aa1, _aa3) in zip(aa1 + "*", aa3 + ["*"])
+        }
+    else:
+        # type is tuple
+        # biopython 1.80 and later
+        # See issue #73
+        # relevant biopython commit: https://github.com/biopython/biopython/commit/257143be9196b77619d3d8cadc22039212681e08
+        return {
+            _aa1: _aa3[0] + _aa3[1:].lower()
+            for (_aa1, _aa3) in zip(aa1 + ("*",), aa3 + ("*",))
+        }
+
+
+def __getattr__(name):
+    # aa_short_to_long_form_dict is only computed (with Biopython) when used
+    if name == "aa_short_to_long_form_dict":
+        return _aa_short_to_long_form_dict()
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+NUCLEOTIDES = "TCAG"
+# Under this number of codons, a dict lookup is faster than NumPy
+SHORT_SEQUENCE_CODONS = 100
+_NUCLEOTIDES_INDICES = np.full(256, 4, dtype="uint8")
+for _index, _nucleotide in enumerate(NUCLEOTIDES):
+    _NUCLEOTIDES_INDICES[ord(_nucleotide)] = _index
+
+
+class _CodonTable(dict):
+    """Dict {codon: amino acid} computing (with Biopython) and storing the
+    translation of any codon at its first use, e.g. ambiguous codons."""
+
+    def __missing__(self, codon):
+        from Bio.Seq import Seq
+
+        self[codon] = str(Seq(codon).translate())
+        return self[codon]
+
+
+@lru_cache(maxsize=None)
+def _codon_table():
+    """Return the codon table, and the array of the amino acids of the 64
+    unambiguous codons in the order of the indices computed by
+    ``_translate_codons`` (the standard table, computed with Biopython)."""
+    from Bio.Seq import Seq
+
+    codons = ["".join(codon) for codon in itertools.product(NUCLEOTIDES, repeat=3)]
+    amino_acids = str(Seq("".join(codons)).translate())
+    codon_table = _CodonTable(zip(codons, amino_acids))
+    return codon_table, np.frombuffer(amino_acids.encode(), dtype="uint8")
+
+
+def _translate_codons(dna_sequence):
+    """Translate the full codons of an upper-case sequence (a partial codon
+    at the end is ignored)."""
+    codon_table, amino_acids = _codon_table()
+    n_codons = len(dna_sequence) // 3
+    if n_codons < SHORT_SEQUENCE_CODONS:
+        codons = [dna_sequence[i : i + 3] for i in range(0, 3 * n_codons, 3)]
+        return "".join(map(codon_table.__getitem__, codons))
+    encoded = np.frombuffer(dna_sequence.encode("ascii"), dtype="uint8")
+    indices = _NUCLEOTIDES_INDICES[encoded[: 3 * n_codons]].reshape(-1, 3)
+    codons_indices = (indices[:, 0] << 4) | (indices[:, 1] << 2) | indices[:, 2]
+    result = amino_acids[codons_indices & 63]
+    ambiguous = np.flatnonzero((indices == 4).any(axis=1))
+    if len(ambiguous):
+        result = result.copy()
+        for i in ambiguous:
+            codon = dna_sequence[3 * i : 3 * i + 3]
+            result[i] = ord(codon_table[codon])
+    return result.tobytes().decode()
 
 
 def translate(dna_sequence, long_form=False):
@@ -55,13 +146,44 @@ def translate(dna_sequence, long_form=False):
 
     If long_form is true, a list of 3-letter amino acid representations
     is returned instead (['Ala', 'Ser', ...]).
+
+    The codons are translated with a lookup table (computed once with
+    Biopython), the result is the same as Biopython's ``Seq.translate()``.
     """
-    result = str(Seq(dna_sequence).translate())
+    dna_sequence = str(dna_sequence).upper()
+    if len(dna_sequence) % 3:
+        from Bio import BiopythonWarning
+
+        warnings.warn(PARTIAL_CODON_WARNING, BiopythonWarning)
+    result = _translate_codons(dna_sequence)
     if long_form:
-        result = [aa_short_to_long_form_dict[aa] for aa in result]
+        result = list(map(_aa_short_to_long_form_dict().__getitem__, result))
     return result
 
 
+def translate_six_frames(dna_sequence, long_form=False):
+    """Return the translations of the DNA sequence in its six reading frames.
+
+    The result is a dict {1: ..., 2: ..., 3: ..., -1: ..., -2: ..., -3: ...}
+    where frame ``f > 0`` is the translation of ``dna_sequence[f - 1:]`` and
+    frame ``-f`` the translation of ``reverse_complement(dna_sequence)[f - 1:]``
+    (the partial codons at the ends of the frames are ignored).
+    """
+    dna_sequence = str(dna_sequence).upper()
+    reverse = reverse_complement(dna_sequence)
+    translations = {}
+    for strand, sequence in [(1, dna_sequence), (-1, reverse)]:
+        for shift in range(3):
+            translations[strand * (shift + 1)] = _translate_codons(sequence[shift:])
+    if long_form:
+        long_forms = _aa_short_to_long_form_dict()
+        translations = {
+            frame: list(map(long_forms.__getitem__, translation))
+            for frame, translation in translations.items()
+        }
+    return translations
+
+
 def extract_graphical_translation(sequence, location, long_form=False):
     """Return a string of the "graphical" translation of a sequence's subsegment.
 
@@ -91,7 +213,7 @@ def extract_graphical_translation(sequence, location, long_form=False):
     else:
         start, end = location
         strand = 1
-    subsequence = sequence[start:end]
+    subsequence = str(sequence[start:end])
     if strand == -1:
         subsequence = reverse_complement(subsequence)
     translation = translate(subsequence, long_form=long_form)
@@ -100,7 +222,7 @@ def extract_graphical_translation(sequence, location, long_form=False):
     return translation
 
 
-def load_record(path, filetype=None):
+def load_record(path, filetype=None, record_id=None):
     """Load a Genbank file.
 
     Parameters
@@ -110,7 +232,19 @@ def load_record(path, filetype=None):
 
     filetype
       Filetype; one of "genbank" or "gff". Default None infers from extension.
+
+    record_id
+      ID of the record to load, for multi-record files (by default the first
+      record is loaded). When ``path`` is a file path, an index of the records'
+      positions in the file is used (see ``RecordsIndex``), so only the
+      requested record is parsed.
     """
+    from Bio import SeqIO
+
+    if record_id is not None:
+        if isinstance(path, str):
+            return RecordsIndex(path, filetype=filetype).load_record(record_id)
+        return _find_record(path, filetype, record_id)
     if filetype is None:
         if isinstance(path, str):
             # Input is a file path
@@ -133,6 +267,22 @@ def load_record(path, filetype=None):
         raise ValueError("'Filetype' must be one of 'genbank' or 'gff'.")
 
 
+def _find_record(handle, filetype, record_id):
+    """Return the record with the given ID (or name) in a file-like object."""
+    from Bio import SeqIO
+
+    if filetype == "gff":
+        records = GFF.parse(handle)
+    elif filetype in ("genbank", None):
+        records = SeqIO.parse(handle, "genbank")
+    else:
+        raise ValueError("'Filetype' must be one of 'genbank' or 'gff'.")
+    for record in records:
+        if record_id in (record.id, record.name):
+            return record
+    raise KeyError("No record %s in the file." % record_id)
+
+
 def annotate_biopython_record(
     seqrecord, location="full", feature_type="misc_feature", margin=0, **qualifiers
 ):
@@ -156,6 +306,8 @@ def annotate_biopython_record(
     qualifiers
       Dictionary that will be the Biopython feature's `qualifiers` attribute.
     """
+    from Bio.SeqFeature import SeqFeature, FeatureLocation
+
     if location == "full":
         location = (margin, len(seqrecord) - margin)
 
@@ -169,22 +321,29 @@ def annotate_biopython_record(
     )
 
 
+@lru_cache(maxsize=TEXT_WRAP_CACHE_SIZE)
 def find_narrowest_text_wrap(text, max_line_length):
     """Wrap the text into a multi-line text minimizing the longest line length.
 
     This is done by first wrapping the text using max_line_length, then
     attempt new wraps by iteratively decreasing the line_length, as long as the
     number of lines stays the same as with max_line_length.
+
+    A wrap whose longest line has width ``w`` is also the wrap obtained with
+    any line length between ``w`` and the line length used, so the line
+    lengths in between are skipped. The results are memoized (in a LRU cache
+    of the last ``TEXT_WRAP_CACHE_SIZE`` texts), as labels are often repeated.
     """
     narrowest_wrap = textwrap.wrap(text, max_line_length)
     narrowest_width = max([len(l) for l in narrowest_wrap])
-    for line_length in range(max_line_length - 1, 0, -1):
+    line_length = narrowest_width - 1
+    while line_length > 0:
         wrap = textwrap.wrap(text, line_length)
-        if len(wrap) <= len(narrowest_wrap):
-            width = max([len(l) for l in wrap])
-            if width < narrowest_width:
-                narrowest_wrap = wrap
-                narrowest_width = width
-        else:
+        if len(wrap) > len(narrowest_wrap):
             break
+        width = max([len(l) for l in wrap])
+        if width < narrowest_width:
+            narrowest_wrap = wrap
+            narrowest_width = width
+        line_length = min(line_length, width) - 1
     return "\n".join(narrowest_wrap)
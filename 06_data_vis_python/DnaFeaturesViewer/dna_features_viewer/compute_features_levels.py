@@ -1,8 +1,10 @@
 """Implements the method used for deciding which feature goes to which level
 when plotting."""
 
-import itertools
-import math
+import heapq
+
+# Margin on the comparisons of levels, to stay robust to rounding errors
+LEVELS_TOLERANCE = 1e-9
 
 
 class Graph:
@@ -27,47 +29,287 @@ class Graph:
             self.neighbors[n2].append(n1)
 
 
-def compute_features_levels(features):
-    """Compute the vertical levels on which the features should be displayed
-    in order to avoid collisions.
+def find_overlapping_intervals(starts, ends):
+    """Return the list of all pairs of indices (i, j), with i < j, of
+    overlapping intervals, given the intervals' starts and ends.
 
-    `features` must be a list of `dna_features_viewer.GraphicFeature`.
+    The intervals are found with a sort-and-sweep over the coordinates, in
+    O(n.log(n) + k) where k is the number of overlapping pairs. Intervals
+    overlap as per ``GraphicFeature.overlaps_with``.
+    """
+    # Intervals are swept by increasing start, then by index.
+    intervals = sorted(
+        (min(start, end), i, max(start, end))
+        for i, (start, end) in enumerate(zip(starts, ends))
+    )
+    pairs = []
+    active = {}  # indices of the intervals still "open" in the sweep
+    active_ends = []  # heap of (end, index) used to evict the closed intervals
+    for start, i, end in intervals:
+        # An interval already swept overlaps the new one if and only if it
+        # ends strictly after the new one starts (including when both start
+        # at the same position, as overlaps_with() tests the end of the
+        # first feature of the list).
+        while active_ends and active_ends[0][0] <= start:
+            del active[heapq.heappop(active_ends)[1]]
+        for j in active:
+            pairs.append((j, i) if j < i else (i, j))
+        active[i] = True
+        heapq.heappush(active_ends, (end, i))
+    return pairs
 
-    The method used is basically a graph coloring:
-    - The nodes of the graph are features and they will be colored with a level.
-    - Two nodes are neighbors if and only if their features's locations overlap.
-    - Levels are attributed to nodes iteratively starting with the nodes
-      corresponding to the largest features.
-    - A node receives the lowest level (starting at 0) that is not already
-      the level of one of its neighbors.
+
+def find_overlapping_pairs(features):
+    """Return the list of all pairs of overlapping features.
+
+    The result is the same as filtering ``itertools.combinations(features, 2)``
+    with ``GraphicFeature.overlaps_with``, but it is obtained with a
+    sort-and-sweep over the features coordinates (see
+    ``find_overlapping_intervals``).
+
+    Each pair ``(f1, f2)`` is given in the order of the ``features`` list.
     """
-    edges = [
-        (f1, f2)
-        for f1, f2 in itertools.combinations(features, 2)
-        if f1.overlaps_with(f2)
+    starts = [f.start for f in features]
+    ends = [f.end for f in features]
+    return [
+        (features[i], features[j])
+        for i, j in find_overlapping_intervals(starts, ends)
     ]
-    graph = Graph(features, edges)
-    levels = {n: n.data.get("fixed_level", None) for n in graph.nodes}
+
+
+def compute_intervals_levels(starts, ends, fixed_levels=None, nlines=None):
+    """Compute the levels of intervals given by their starts and ends (see
+    ``compute_features_levels``), and return them as a list.
+
+    ``fixed_levels`` and ``nlines`` are optional lists giving for each
+    interval its fixed level (or None) and its number of lines.
+    """
+    n_intervals = len(starts)
+    neighbors = [[] for _ in range(n_intervals)]
+    for i, j in find_overlapping_intervals(starts, ends):
+        neighbors[i].append(j)
+        neighbors[j].append(i)
+    if fixed_levels is None:
+        levels = n_intervals * [None]
+    else:
+        levels = list(fixed_levels)
+    if nlines is None:
+        half_lines = n_intervals * [0.5]
+    else:
+        half_lines = [0.5 * n for n in nlines]
 
     def collision(node, level):
         """Return whether the node placed at base_level collides with its
         neighbors in the graph."""
-        line_factor = 0.5
-        nlines = node.data.get("nlines", 1)
-        for neighbor in graph.neighbors[node]:
+        for neighbor in neighbors[node]:
             neighbor_level = levels[neighbor]
             if neighbor_level is None:
                 continue
-            neighbor_lines = neighbor.data.get("nlines", 1)
-            min_distance = line_factor * (nlines + neighbor_lines)
+            min_distance = half_lines[node] + half_lines[neighbor]
             if abs(level - neighbor_level) < min_distance:
                 return True
         return False
 
-    for node in sorted(graph.nodes, key=lambda f: -f.length):
-        if levels[node] is None:
-            level = 0
-            while collision(node, level):
+    lengths = [abs(end - start) for start, end in zip(starts, ends)]
+    for node in sorted(range(n_intervals), key=lambda i: -lengths[i]):
+        if levels[node] is not None:
+            continue
+        # Spans (low, level, min_distance) of the levels occupied by the
+        # neighbors, i.e. the levels l such that abs(l - level) < min_distance
+        occupied = []
+        for neighbor in neighbors[node]:
+            neighbor_level = levels[neighbor]
+            if neighbor_level is not None:
+                min_distance = half_lines[node] + half_lines[neighbor]
+                occupied.append(
+                    (neighbor_level - min_distance, neighbor_level, min_distance)
+                )
+        occupied.sort()
+        level = 0
+        for low, neighbor_level, min_distance in occupied:
+            if low > level + LEVELS_TOLERANCE:
+                break  # this span and the next ones are all above the level
+            while abs(level - neighbor_level) < min_distance:
                 level += 0.5
-            levels[node] = level
+        # A span skipped at its lower bound can still occupy the new level
+        while collision(node, level):
+            level += 0.5
+        levels[node] = level
     return levels
+
+
+def compute_features_levels(features):
+    """Compute the vertical levels on which the features should be displayed
+    in order to avoid collisions.
+
+    `features` must be a list of `dna_features_viewer.GraphicFeature`.
+
+    The method used is basically a graph coloring:
+    - The nodes of the graph are features and they will be colored with a level.
+    - Two nodes are neighbors if and only if their features's locations overlap.
+    - Levels are attributed to nodes iteratively starting with the nodes
+      corresponding to the largest features.
+    - A node receives the lowest level (starting at 0, by steps of 0.5) that
+      is not already occupied by one of its neighbors. A neighbor at level
+      ``l`` occupies all levels strictly closer to ``l`` than
+      ``0.5 * (nlines + neighbor_nlines)``, where ``nlines`` is the number of
+      lines of a feature (``feature.data["nlines"]``, default 1).
+
+    The levels occupied by the neighbors of a node are swept in increasing
+    order, so that a node with d placed neighbors is placed in O(d.log(d)),
+    instead of testing all neighbors at every candidate level.
+    """
+    levels = compute_intervals_levels(
+        starts=[f.start for f in features],
+        ends=[f.end for f in features],
+        fixed_levels=[f.data.get("fixed_level", None) for f in features],
+        nlines=[f.data.get("nlines", 1) for f in features],
+    )
+    return dict(zip(features, levels))
+
+
+def _sweep_overlap(feature, rank, other, other_rank):
+    """Return whether two features overlap, exactly as they would be paired
+    by ``find_overlapping_pairs`` for the given ranks in the features list."""
+    start, end = min(feature.start, feature.end), max(feature.start, feature.end)
+    other_start = min(other.start, other.end)
+    other_end = max(other.start, other.end)
+    if (other_start, other_rank) < (start, rank):
+        return other_end > start
+    return end > other_start
+
+
+def _layout_properties(feature):
+    """Return the properties of a feature that determine its level."""
+    return (
+        feature.start,
+        feature.end,
+        feature.data.get("nlines", 1),
+        feature.data.get("fixed_level", None),
+    )
+
+
+class IncrementalLayout:
+    """Levels of a list of features, updated when features are added or
+    removed by recomputing only the levels of the affected features.
+
+    The level of a feature only depends on the features of its connected
+    component in the overlap graph (features overlapping it, the features
+    overlapping these, etc.). When a feature is added or removed, only the
+    levels of its component(s) are recomputed, and the levels are always
+    the same as ``compute_features_levels(features)`` on the current list.
+
+    The features must not be modified in place (coordinates, ``nlines`` or
+    ``fixed_level``) while they are in the layout. Remove them and add them
+    back instead. ``is_up_to_date`` detects such edits.
+
+    Parameters
+    ----------
+
+    features
+      The initial list of GraphicFeatures.
+
+    Attributes
+    ----------
+
+    levels
+      Dict {feature: level} for the current features.
+    """
+
+    def __init__(self, features=()):
+        features = list(features)
+        self._ranks = {feature: rank for rank, feature in enumerate(features)}
+        self._next_rank = len(features)
+        self._properties = {f: _layout_properties(f) for f in features}
+        self.neighbors = {feature: set() for feature in features}
+        for f1, f2 in find_overlapping_pairs(features):
+            self.neighbors[f1].add(f2)
+            self.neighbors[f2].add(f1)
+        self.levels = compute_features_levels(features)
+
+    @property
+    def features(self):
+        """List of the features, in the order in which they were added."""
+        return sorted(self._ranks, key=self._ranks.__getitem__)
+
+    def __len__(self):
+        return len(self._ranks)
+
+    def __contains__(self, feature):
+        return feature in self._ranks
+
+    def is_up_to_date(self, features):
+        """Return whether the levels are still those of the given features
+        list, i.e. the list holds the features of the layout, in the same
+        order, with the same coordinates, ``nlines`` and ``fixed_level`` as
+        when they were added.
+
+        This check is linear in the number of features. It catches the
+        in-place edits of the list (``features.append(...)``) or of the
+        features (``feature.start = ...``).
+        """
+        if len(features) != len(self._ranks):
+            return False
+        previous_rank = -1
+        for feature in features:
+            rank = self._ranks.get(feature)
+            if (rank is None) or (rank <= previous_rank):
+                return False
+            if _layout_properties(feature) != self._properties[feature]:
+                return False
+            previous_rank = rank
+        return True
+
+    def _component(self, seeds):
+        """Return the set of features connected to the seeds features."""
+        component, stack = set(seeds), list(seeds)
+        while stack:
+            for neighbor in self.neighbors[stack.pop()]:
+                if neighbor not in component:
+                    component.add(neighbor)
+                    stack.append(neighbor)
+        return component
+
+    def _update_levels(self, component):
+        """Recompute the levels of a set of features. Return the dict
+        {feature: new level} of the features whose level changed."""
+        features = sorted(component, key=self._ranks.__getitem__)
+        changed = {}
+        for feature, level in compute_features_levels(features).items():
+            if self.levels.get(feature) != level:
+                changed[feature] = level
+            self.levels[feature] = level
+        return changed
+
+    def add_feature(self, feature):
+        """Add a feature (after all others in the features order). Return the
+        dict {feature: new level} of the features whose level changed
+        (including the new feature)."""
+        if feature in self._ranks:
+            raise ValueError("The feature is already in the layout.")
+        rank = self._next_rank
+        self._next_rank += 1
+        neighbors = set(
+            other
+            for other, other_rank in self._ranks.items()
+            if _sweep_overlap(feature, rank, other, other_rank)
+        )
+        self._ranks[feature] = rank
+        self._properties[feature] = _layout_properties(feature)
+        self.neighbors[feature] = neighbors
+        for neighbor in neighbors:
+            self.neighbors[neighbor].add(feature)
+        return self._update_levels(self._component([feature]))
+
+    def remove_feature(self, feature):
+        """Remove a feature. Return the dict {feature: new level} of the
+        remaining features whose level changed."""
+        if feature not in self._ranks:
+            raise ValueError("The feature is not in the layout.")
+        neighbors = self.neighbors.pop(feature)
+        for neighbor in neighbors:
+            self.neighbors[neighbor].discard(feature)
+        del self._ranks[feature]
+        del self._properties[feature]
+        del self.levels[feature]
+        return self._update_levels(self._component(neighbors))
@@ -17,4 +17,7 @@ setup(
     keywords="DNA Sequence Feature Genbank Biopython Matplotlib",
     packages=find_packages(exclude="docs"),
     install_requires=["matplotlib>=3", "Biopython", "packaging"],
+    entry_points={
+        "console_scripts": ["dna_features_viewer=dna_features_viewer.__main__:main"]
+    },
 )
@@ -1,16 +1,31 @@
 """Basic tests to check that the main examples work."""
 
+import gc
 import os
+import pickle
+import pytest
 import matplotlib
 import matplotlib.pyplot as plt
 from dna_features_viewer import (
     BiopythonTranslator,
     BlackBoxlessLabelTranslator,
     GraphicFeature,
+    GraphicFeatureArray,
     GraphicRecord,
     CircularGraphicRecord,
+    PlotGeometry,
+    AxGeometry,
+    PlotProfiler,
+    RecordsIndex,
+    RenderCache,
     annotate_biopython_record,
     load_record,
+    render_records_files,
+    stream_record,
+)
+from dna_features_viewer.compute_features_levels import compute_features_levels
+from dna_features_viewer.GraphicRecord.MultilinePlottableMixin import (
+    _plot_pickled_page,
 )
 from bokeh.resources import CDN
 from bokeh.embed import file_html
@@ -23,6 +38,13 @@ example_genbank = os.path.join("tests", "data", "example_sequence.gb")
 example_gff = os.path.join("tests", "data", "example_record.gff")
 
 
+@pytest.fixture(autouse=True)
+def close_figures():
+    """Close the figures created by each test, so they don't accumulate."""
+    yield
+    plt.close("all")
+
+
 def test_by_hand(tmpdir):
     """Test building a GraphicRecord "by hand" """
     features = [
@@ -82,6 +104,71 @@ def test_from_genbank_to_circular(tmpdir):
     ax.figure.savefig(target_file)
 
 
+def test_plot_with_batch_artists(tmpdir):
+    graphic_record = BiopythonTranslator().translate_record(example_genbank)
+    ax, _ = graphic_record.plot(figure_width=10, batch_artists=True)
+    assert len(ax.patches) == 0
+    assert len(ax.collections) == 2  # all arrows + all label links
+    target_file = os.path.join(str(tmpdir), "batch_artists.svg")
+    ax.figure.savefig(target_file)
+
+
+def test_circular_plot_with_batch_artists():
+    from dna_features_viewer.CircularGraphicRecord.ArrowWedge import (
+        ArrowWedge,
+        arrow_wedges_paths,
+    )
+
+    graphic_record = BiopythonTranslator().translate_record(
+        example_genbank, record_class=CircularGraphicRecord
+    )
+    # Circular records batch their features by default
+    ax, _ = graphic_record.plot(figure_width=7)
+    assert len(ax.patches) == 1  # the circle
+    ax, _ = graphic_record.plot(figure_width=7, batch_artists=False)
+    assert len(ax.patches) == 1 + len(graphic_record.features)
+
+    # Subclasses overriding plot_feature draw one patch per feature by default
+    class CustomCircularGraphicRecord(CircularGraphicRecord):
+        def plot_feature(self, ax, feature, level, geometry=None):
+            feature.data["plotted"] = True
+            return super().plot_feature(ax, feature, level, geometry=geometry)
+
+    custom_record = CustomCircularGraphicRecord(
+        sequence_length=graphic_record.sequence_length,
+        features=graphic_record.features,
+    )
+    ax, _ = custom_record.plot(figure_width=7)
+    assert len(ax.patches) == 1 + len(graphic_record.features)
+    assert all(f.data.get("plotted") for f in custom_record.features)
+    radii = [1, 1.5, 1, 2, 1, 1]
+    thetas1, thetas2 = [0, 10, -50, 30, 0, 20], [3, 100, 300, 360, 360, 20]
+    directions = [1, -1, 1, 0, 0, -1]
+    paths = arrow_wedges_paths((0, -1), radii, thetas1, thetas2, 6 * [0.1], directions)
+    for path, params in zip(paths, zip(radii, thetas1, thetas2, directions)):
+        radius, theta1, theta2, direction = params
+        wedge = ArrowWedge((0, -1), radius, theta1, theta2, 0.1, direction)
+        assert (path.codes == wedge.get_path().codes).all()
+        assert np.allclose(path.vertices, wedge.get_path().vertices)
+
+
+def test_render():
+    from concurrent.futures import ThreadPoolExecutor
+
+    record = BiopythonTranslator().translate_record(example_genbank)
+    n_figures = len(plt.get_fignums())
+    png = record.render("png", dpi=50, figure_width=6)
+    assert png.startswith(b"\x89PNG")
+    assert record.render("svg").startswith(b"<?xml")
+    assert record.render("pdf").startswith(b"%PDF")
+    assert len(plt.get_fignums()) == n_figures
+    with ThreadPoolExecutor(4) as pool:
+        images = list(
+            pool.map(lambda r: r.render("png", dpi=50, figure_width=6), 4 * [record])
+        )
+    assert images == 4 * [png]
+
+
 def test_plot_with_gc_content(tmpdir):
 
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(8, 4), sharex=True)
@@ -138,6 +225,45 @@ def test_plot_with_bokeh_no_labels(tmpdir):
         assert len(f.read()) > 5000
 
 
+def test_plot_with_bokeh_without_matplotlib_figure():
+    record = BiopythonTranslator().translate_record(example_genbank)
+    n_figures = len(plt.get_fignums())
+    plot = record.plot_with_bokeh(figure_width=8)
+    assert len(plt.get_fignums()) == n_figures
+    patches_data = plot.renderers[0].data_source.data
+    assert len(patches_data["xs"]) == len(record.features)
+    feature = record.features[0]
+    xs, ys = record.bokeh_features_patches(
+        [feature.start], [feature.end], [feature.strand], [2], figure_width=8
+    )
+    patch = record.bokeh_feature_patch(
+        feature.start, feature.end, feature.strand, figure_width=8, level=2
+    )
+    assert np.allclose(xs[0], patch["xs"], atol=1)
+    assert np.allclose(ys[0], patch["ys"])
+
+
+def test_heavy_dependencies_are_imported_lazily():
+    import subprocess
+    import sys
+
+    modules = [
+        "bokeh",
+        "pandas",
+        "Bio",
+        "BCBio",
+        "matplotlib.pyplot",
+        "matplotlib.figure",
+        "matplotlib.backends.backend_pdf",
+    ]
+    script = "import sys, dna_features_viewer; print([m in sys.modules for m in %s])"
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.check_output(
+        [sys.executable, "-c", script % modules], cwd=project_root
+    )
+    assert output.decode().strip() == str(len(modules) * [False])
+
+
 def test_split_overflowing_features():
     features = [
         GraphicFeature(start=10, end=20, strand=+1, label="a"),
@@ -182,6 +308,124 @@ def test_cropping():
     assert len(cropped_record.features) == 3
 
 
+def test_cropped_feature_is_a_shallow_copy():
+    parent = GraphicFeature(start=0, end=10)
+    feature = GraphicFeature(start=5, end=20, label="a", feature=parent)
+    cropped = feature.crop((10, 30))
+    assert (cropped.start, cropped.end, cropped.open_left) == (10, 20, True)
+    assert (feature.start, feature.open_left) == (5, False)
+    assert cropped.data["feature"] is parent
+    assert cropped.fontdict == feature.fontdict
+    cropped.fontdict["size"] = 5
+    assert "size" not in feature.fontdict
+    cropped.data["fixed_level"] = 2
+    assert "fixed_level" not in feature.data
+
+
+def test_features_in():
+    features = [
+        GraphicFeature(start=400, end=700, strand=-1, label="Gene 2"),
+        GraphicFeature(start=5, end=20, strand=+1, label="Small feature"),
+        GraphicFeature(start=20, end=500, strand=+1, label="Gene 1"),
+        GraphicFeature(start=600, end=900, strand=+1, label="Gene 3"),
+    ]
+    record = GraphicRecord(sequence_length=1000, features=features)
+    assert record.features_in(425, 650) == [features[0], features[2], features[3]]
+    assert record.features_in(20, 20) == [features[1], features[2]]
+    assert record.features_in(950, 1000) == []
+
+    # The index must be reset when the features are reassigned
+    record.features = features[:2]
+    assert record.features_in(425, 650) == [features[0]]
+
+
+def test_crop_after_editing_features_in_place():
+    features = [
+        GraphicFeature(start=5, end=20, label="A"),
+        GraphicFeature(start=400, end=700, label="B"),
+    ]
+    record = GraphicRecord(sequence_length=1000, features=features)
+    assert [f.label for f in record.crop((0, 50)).features] == ["A"]
+    record.features[0] = GraphicFeature(start=100, end=120, label="C")
+    record.invalidate_features_index()
+    assert record.crop((0, 50)).features == []
+    assert [f.label for f in record.crop((90, 130)).features] == ["C"]
+    record.features[1].start = 10
+    record.invalidate_features_index()
+    assert [f.label for f in record.crop((0, 50)).features] == ["B"]
+    ax, _ = record.crop((0, 50)).plot()
+    plt.close(ax.figure)
+
+    # Multi-line plots check the index once, before cropping the lines
+    record.features[1].start, record.features[1].end = 800, 900
+    record.invalidate_features_index()
+    assert record.crop((0, 500)).features[0].label == "C"
+    record.features[1].start, record.features[1].end = 200, 300
+    fig, axes = record.plot_on_multiple_lines(n_lines=2)
+    assert sorted(t.get_text() for t in axes[0].texts) == ["B", "C"]
+    plt.close(fig)
+
+
+def test_graphic_feature_array():
+    features = GraphicFeatureArray(
+        starts=[5, 20, 400, 600],
+        ends=[20, 500, 700, 900],
+        strands=[1, 1, -1, None],
+        labels=["Small feature", "Gene 1", "Gene 2", None],
+        colors=["#ffd700", "#ffcccc", "#cffccc", "#ffd700"],
+        levels=[None, None, None, 2],
+        thickness=10,
+    )
+    assert len(features) == 4
+    assert features[1] is features[1]
+    assert (features[1].start, features[1].end) == (20, 500)
+    assert features[1].label == "Gene 1"
+    assert features[3].data["fixed_level"] == 2
+    assert features[3].thickness == 10
+    record = GraphicRecord(sequence_length=1000, features=features)
+    assert record.features_in(425, 650) == [features[1], features[2], features[3]]
+    cropped_record = record.crop((425, 650))
+    assert isinstance(cropped_record.features, GraphicFeatureArray)
+    cropped = [
+        (f.start, f.end, f.open_left, f.open_right) for f in cropped_record.features
+    ]
+    assert cropped == [
+        (425, 500, True, False),
+        (425, 650, True, True),
+        (600, 650, False, True),
+    ]
+    ax, (levels, labels_data) = record.plot(figure_width=5)
+    assert levels[features[3]] == 2
+    assert features.compute_levels() == [
+        levels[f] for f in compute_features_levels(list(features))
+    ]
+
+    # The views of the rows are not kept alive after use
+    del levels, labels_data
+    plt.close(ax.figure)
+    gc.collect()
+    assert len(features._views) == 0
+
+    # Splitting the features overflowing over the origin of a circle
+    circular_features = dict(starts=[-50, 10, 950], ends=[20, 30, 1030])
+    array_record = GraphicRecord(
+        sequence_length=1000, features=GraphicFeatureArray(**circular_features)
+    )
+    list_record = GraphicRecord(
+        sequence_length=1000,
+        features=[
+            GraphicFeature(start=start, end=end)
+            for start, end in zip(*circular_features.values())
+        ],
+    )
+    for graphic_record in (array_record, list_record):
+        graphic_record.split_overflowing_features_circularly()
+    assert isinstance(array_record.features, GraphicFeatureArray)
+    assert [(f.start, f.end) for f in array_record.features] == [
+        (f.start, f.end) for f in list_record.features
+    ]
+
+
 def test_cropping_on_the_edge():
     repeated_sequence = "ATGCATGCAT"
     graphic_record = GraphicRecord(
@@ -228,6 +472,20 @@ def test_sequence_and_translation_plotting():
     record.plot_translation(ax, (8, 23), fontdict={"weight": "bold"})
 
 
+def test_vectorized_sequence_and_translation_plotting():
+    record = GraphicRecord(sequence=500 * "ATGC", features=[])
+    ax, _ = record.plot(figure_width=5)
+    record.plot_sequence(ax, guides_intensity=0.2, skip_unreadable=True)
+    record.plot_translation(ax, (8, 1508), skip_unreadable=True)
+    assert len(ax.texts) == 0  # 2000 nucleotides on 5 inches are unreadable
+    assert len(ax.collections) == 2  # one LineCollection of guides per call
+    ax, _ = record.plot(figure_width=5)
+    record.plot_sequence(ax, monospaced_text=True)
+    record.plot_translation(ax, (8, 1508), monospaced_text=True)
+    assert len(ax.texts) == 2
+    ax.figure.canvas.draw()
+
+
 def test_BlackBoxlessLabelTranslator(tmpdir):
     translator = BlackBoxlessLabelTranslator()
     graphic_record = translator.translate_record(example_genbank)
@@ -244,6 +502,217 @@ def test_gff():
     assert len(graphic_record.features) == 3
 
 
+def test_stream_record():
+    biopython_record = SeqIO.read(example_genbank, "genbank")
+    record = stream_record(example_genbank)
+    features = list(record.features)
+    assert [str(f.location) for f in features] == [
+        str(f.location) for f in biopython_record.features
+    ]
+    assert [f.qualifiers for f in features] == [
+        f.qualifiers for f in biopython_record.features
+    ]
+    assert str(record.seq) == str(biopython_record.seq)
+
+    record = stream_record(example_genbank, region=(1000, 2000))
+    graphic_record = BiopythonTranslator().translate_record(record)
+    assert len(graphic_record.features) == 4
+    assert graphic_record.sequence_length == len(biopython_record)
+    assert not graphic_record.sequence.source.is_loaded
+    cropped_record = graphic_record.crop((1500, 1600))
+    assert not graphic_record.sequence.source.is_loaded
+    cropped_record.plot(plot_sequence=True)
+    assert str(cropped_record.sequence) == str(biopython_record.seq[1500:1600])
+
+    record = stream_record(example_gff)
+    graphic_record = BlackBoxlessLabelTranslator().translate_record(record)
+    assert len(graphic_record.features) == 3
+    assert graphic_record.sequence_length == 176
+    assert graphic_record.sequence is None
+
+
+def test_stream_record_with_crlf_line_endings(tmpdir):
+    crlf_gff = os.path.join(str(tmpdir), "crlf.gff")
+    with open(crlf_gff, "wb") as f:
+        f.write(
+            b"##gff-version 3\r\n"
+            b"seq1\tsource\tgene\t1\t100\t.\t+\t.\tID=g1;Name=first\r\n"
+            b"seq1\tsource\tCDS\t10\t50\t.\t-\t0\r\n"
+        )
+    features = list(stream_record(crlf_gff).features)
+    assert features[0].qualifiers["Name"] == ["first"]
+    assert features[1].qualifiers["phase"] == ["0"]
+    assert [f.location.strand for f in features] == [1, -1]
+
+
+def test_load_record_from_multirecord_file(tmpdir):
+    with open(example_genbank, "r") as f:
+        genbank_text = f.read()
+    multi_genbank = os.path.join(str(tmpdir), "multi.gb")
+    with open(multi_genbank, "w") as f:
+        for name in ["first", "second", "third"]:
+            f.write(genbank_text.replace("Example", name))
+    record = load_record(multi_genbank, record_id="second")
+    assert record.id == "second"
+    assert len(record.features) == len(SeqIO.read(example_genbank, "genbank").features)
+    assert os.path.exists(multi_genbank + ".dfvindex")
+    index = RecordsIndex(multi_genbank)
+    assert index.records_ids == ["first", "second", "third"]
+    graphic_record = BiopythonTranslator().translate_record(
+        multi_genbank, record_id="third"
+    )
+    assert graphic_record.sequence_length == 4720
+
+    # The cached index is rebuilt when the file changes
+    with open(multi_genbank, "a") as f:
+        f.write(genbank_text.replace("Example", "fourth"))
+    assert load_record(multi_genbank, record_id="fourth").id == "fourth"
+
+    with open(example_gff, "r") as f:
+        gff_text = f.read()
+    multi_gff = os.path.join(str(tmpdir), "multi.gff")
+    with open(multi_gff, "w") as f:
+        f.write(gff_text)
+        f.write(gff_text.replace("##gff-version 3\n", "").replace("P12345", "Q9"))
+    record = load_record(multi_gff, record_id="Q9")
+    assert record.id == "Q9"
+    assert len(record) == 176
+    assert len(record.features) == len(load_record(example_gff).features)
+
+
+def test_render_records_files(tmpdir):
+    target_dir = os.path.join(str(tmpdir), "plots")
+    sources = [example_genbank, example_gff]
+    report = render_records_files(sources, target_dir, workers=2)
+    assert report["n_rendered"] == 2
+    assert sorted(os.listdir(target_dir))[1:] == [
+        "example_record.gff.png",
+        "example_sequence.gb.png",
+    ]
+    report = render_records_files(sources, target_dir)
+    assert report["n_skipped"] == 2
+    report = render_records_files(sources, target_dir, record_class="circular")
+    assert report["n_rendered"] == 2
+    assert all(f["time"] > 0 for f in report["files"])
+
+    # Files of a same name would overwrite each other's images
+    copy_dir = os.path.join(str(tmpdir), "copy")
+    os.mkdir(copy_dir)
+    copy = os.path.join(copy_dir, os.path.basename(example_genbank))
+    with open(example_genbank) as f_in, open(copy, "w") as f_out:
+        f_out.write(f_in.read())
+    with pytest.raises(ValueError):
+        render_records_files([example_genbank, copy], target_dir)
+
+
+def test_render_cache(tmpdir):
+    cache_dir = os.path.join(str(tmpdir), "cache")
+    cache = RenderCache(max_items=2, cache_dir=cache_dir)
+    translator = BiopythonTranslator()
+    record = translator.translate_record(example_genbank)
+    png = cache.render(record, "png", figure_width=6)
+    assert png.startswith(b"\x89PNG")
+    # Another record with the same content hits the cache
+    same_record = translator.translate_record(example_genbank)
+    assert cache.render(same_record, "png", figure_width=6) is png
+    assert cache.stats == dict(memory_hits=1, disk_hits=0, misses=1)
+    cache.render(record, "svg", figure_width=6)
+    cache.render(record, "png", figure_width=8)
+    assert len(cache._images) == 2
+    assert cache.render(record, "png", figure_width=6) == png
+    assert cache.stats["disk_hits"] == 1
+    record.features[0].color = "red"
+    cache.render(record, "png", figure_width=6)
+    assert cache.stats["misses"] == 4
+
+    geometry = PlotGeometry.from_figure_width(6, (0, record.sequence_length))
+    layout = cache.compute_layout(record, geometry)
+    assert cache.compute_layout(record, geometry) is layout
+    # Profiling doesn't change the plots, so it doesn't change the keys
+    profiled_layout = cache.compute_layout(record, geometry, profiler=PlotProfiler())
+    assert profiled_layout is layout
+    assert cache.render(record, "png", figure_width=8, profiler=PlotProfiler()) == (
+        cache.render(record, "png", figure_width=8)
+    )
+
+    # The disk tier's eviction only deletes the cache's own images
+    other_file = os.path.join(cache_dir, "notes.txt")
+    with open(other_file, "w") as f:
+        f.write("not an image")
+    cache = RenderCache(max_items=2, cache_dir=cache_dir, max_disk_size=1)
+    cache.render(record, "png", figure_width=5)
+    assert os.listdir(cache_dir) == ["notes.txt"]
+
+
+def test_render_cache_from_several_threads(tmpdir):
+    from concurrent.futures import ThreadPoolExecutor
+
+    records = [
+        GraphicRecord(
+            sequence_length=1000,
+            features=[GraphicFeature(start=10 * i, end=500, label="f%d" % i)],
+        )
+        for i in range(6)
+    ]
+    cache_dir = os.path.join(str(tmpdir), "cache")
+    cache = RenderCache(max_items=3, cache_dir=cache_dir, max_disk_size=3000)
+    expected = [record.render("png", dpi=30, figure_width=4) for record in records]
+    with ThreadPoolExecutor(4) as pool:
+        images = list(
+            pool.map(
+                lambda r: cache.render(r, "png", dpi=30, figure_width=4),
+                5 * records,
+            )
+        )
+    assert images == 5 * expected
+    assert sum(cache.stats.values()) == 30
+    assert len(cache._images) == 3
+    disk_size = sum(
+        os.path.getsize(os.path.join(cache_dir, name)) for name in os.listdir(cache_dir)
+    )
+    assert 0 < disk_size <= 3000
+
+
+def test_incremental_layout():
+    record = BiopythonTranslator().translate_record(example_genbank)
+    layout = record.incremental_layout
+    new_feature = GraphicFeature(start=1000, end=2500, strand=1, label="new")
+    changed = record.add_feature(new_feature)
+    assert new_feature in changed
+    geometry = PlotGeometry.from_figure_width(8, (0, record.sequence_length))
+    full_record = GraphicRecord(
+        sequence_length=record.sequence_length, features=list(record.features)
+    )
+    expected = full_record.compute_layout(geometry)["features_levels"]
+    assert record.compute_layout(geometry)["features_levels"] == expected
+    record.remove_feature(record.features[0])
+    assert len(layout) == len(record.features)
+    record.plot()
+
+
+def test_incremental_layout_after_in_place_edits():
+    features = [GraphicFeature(start=i * 100, end=i * 100 + 150) for i in range(5)]
+    record = GraphicRecord(sequence_length=1000, features=features)
+    layout = record.incremental_layout
+    geometry = PlotGeometry.from_figure_width(8, (0, record.sequence_length))
+
+    def expected_levels():
+        return compute_features_levels(record.features)
+
+    record.features.append(GraphicFeature(start=120, end=220))
+    assert not layout.is_up_to_date(record.features)
+    assert record.compute_layout(geometry)["features_levels"] == expected_levels()
+    assert record._incremental_layout is None
+
+    layout = record.incremental_layout
+    assert layout.is_up_to_date(record.features)
+    record.features[1].start = 800
+    record.features[1].end = 950
+    assert not layout.is_up_to_date(record.features)
+    assert record.compute_layout(geometry)["features_levels"] == expected_levels()
+    assert record._incremental_layout is None
+
+
 def test_multiline_plot():
 
     translator = BiopythonTranslator()
@@ -255,6 +724,84 @@ def test_multiline_plot():
     assert 9.5 < fig.get_figheight() < 10
 
 
+def test_compute_layout_and_figure_height():
+    translator = BiopythonTranslator()
+    graphic_record = translator.translate_record(example_genbank)
+    n_figures = len(plt.get_fignums())
+    height = graphic_record.compute_figure_height(figure_width=8, x_lim=(0, 3000))
+    assert len(plt.get_fignums()) == n_figures
+    ax, (features_levels, _) = graphic_record.plot(figure_width=8, x_lim=(0, 3000))
+    assert height == ax.figure.get_figheight()
+
+    geometry = PlotGeometry.from_ax(ax)
+    layout = graphic_record.compute_layout(geometry)
+    assert layout["features_levels"] == features_levels
+
+
+def test_ax_geometry():
+    fig, ax = plt.subplots(1, figsize=(8, 2))
+    ax.set_xlim(0, 1000)
+    geometry = AxGeometry(ax)
+    reference = PlotGeometry.from_ax(ax)
+    assert geometry.x_lim == reference.x_lim
+    assert geometry.ax_width == reference.ax_width
+    assert geometry.data_per_pixel == reference.data_per_pixel
+    assert geometry.renderer is fig.canvas.get_renderer()
+    assert geometry.stats == dict(queries=4, updates=1)
+
+    ax.set_xlim(0, 500)  # the new limits invalidate the cached geometry
+    assert geometry.data_per_pixel == 0.5 * reference.data_per_pixel
+    fig.set_size_inches(4, 2)  # so does the resizing of the figure
+    assert geometry.data_per_pixel == reference.data_per_pixel
+    assert geometry.stats["updates"] == 3
+    plt.close(fig)
+
+    translator = BiopythonTranslator()
+    graphic_record = translator.translate_record(example_genbank)
+    ax, (features_levels, _) = graphic_record.plot(figure_width=8)
+    fig, new_ax = plt.subplots(1, figsize=(8, 2))
+    graphic_record.initialize_ax(new_ax, draw_line=True, with_ruler=True)
+    geometry = AxGeometry(new_ax)
+    for feature, level in features_levels.items():
+        graphic_record.plot_feature(new_ax, feature, level, geometry=geometry)
+    assert geometry.stats["updates"] == 1
+    head_lengths = sorted(p.get_arrowstyle().head_length for p in new_ax.patches)
+    assert head_lengths == sorted(p.get_arrowstyle().head_length for p in ax.patches)
+
+
+def test_plot_profiler():
+    translator = BiopythonTranslator()
+    graphic_record = translator.translate_record(example_genbank)
+    ended_phases = []
+    profiler = PlotProfiler(callback=lambda phase, *_: ended_phases.append(phase))
+    ax, _ = graphic_record.plot(profiler=profiler)
+    plt.close(ax.figure)
+    report = profiler.to_dict()
+    phases = report["phases"]
+    assert list(phases)[:3] == ["plot", "create_figure", "initialize_ax"]
+    assert ended_phases[-1] == "plot"
+    assert phases["plot"]["time"] >= phases["compute_layout"]["time"] > 0
+    assert phases["plot_features"]["artists"] == len(ax.patches)
+    assert report["geometry"]["updates"] >= 1
+    assert "plot_sequence" not in phases
+
+    profiler = PlotProfiler()
+    subrecord = graphic_record.crop((1700, 2200))
+    fig, _ = subrecord.plot_on_multiple_lines(
+        nucl_per_line=100, plot_sequence=True, profiler=profiler
+    )
+    plt.close(fig)
+    phases = profiler.to_dict()["phases"]
+    assert phases["plot"]["calls"] == phases["plot_sequence"]["calls"] == 5
+    assert phases["plot_sequence"]["artists"] == 500
+
+    profiler = PlotProfiler()
+    graphic_record.plot_with_bokeh(profiler=profiler)
+    phases = profiler.to_dict()["phases"]
+    assert phases["plot_features"]["artists"] == 1
+    assert "measure_labels" in phases
+
+
 def test_multipage_plot(tmpdir):
     translator = BiopythonTranslator()
     graphic_record = translator.translate_record(example_genbank)
@@ -267,6 +814,60 @@ def test_multipage_plot(tmpdir):
     )
 
 
+def test_multiline_plot_heights_follow_feature_edits():
+    features = [GraphicFeature(start=i * 100, end=i * 100 + 50) for i in range(3)]
+    record = GraphicRecord(sequence_length=1000, features=features)
+    fig, _ = record.plot_on_multiple_lines(n_lines=2, figure_width=5)
+    height = fig.get_figheight()
+    plt.close(fig)
+    for i in range(6):
+        record.features.append(
+            GraphicFeature(start=100, end=150, label="a very long label %d" % i)
+        )
+    fig, _ = record.plot_on_multiple_lines(n_lines=2, figure_width=5)
+    assert fig.get_figheight() > height
+    plt.close(fig)
+
+
+def test_multiline_and_multipage_plots_with_workers(tmpdir):
+    translator = BiopythonTranslator()
+    graphic_record = translator.translate_record(example_genbank)
+    subrecord = graphic_record.crop((1700, 2200))
+    fig, axes = subrecord.plot_on_multiple_lines(
+        nucl_per_line=100, figure_width=12, plot_sequence=True, workers=2
+    )
+    assert 9.5 < fig.get_figheight() < 10
+    assert len(subrecord._lines_heights_cache) == 5
+    subrecord.plot_on_multiple_pages(
+        pdf_target=os.path.join(str(tmpdir), "test.pdf"),
+        nucl_per_line=100,
+        lines_per_page=2,
+        plot_sequence=True,
+        workers=2,
+    )
+    assert os.path.getsize(os.path.join(str(tmpdir), "test.pdf")) > 0
+
+
+def test_lines_heights_cache_is_bounded():
+    features = [GraphicFeature(start=i * 100, end=i * 100 + 50) for i in range(10)]
+    record = GraphicRecord(sequence_length=1000, features=features)
+    record.lines_heights_cache_size = 3
+    fig, _ = record.plot_on_multiple_lines(n_lines=5, figure_width=5)
+    plt.close(fig)
+    assert len(record._lines_heights_cache) == 3
+    fig, _ = record.plot_on_multiple_lines(n_lines=2, figure_width=5)
+    plt.close(fig)
+    assert len(record._lines_heights_cache) == 3
+
+
+def test_pages_plotted_in_workers_are_closed():
+    features = [GraphicFeature(start=i * 100, end=i * 100 + 50) for i in range(10)]
+    record = GraphicRecord(sequence_length=1000, features=features)
+    pickled_fig = _plot_pickled_page(record, 500, 5, {})
+    assert plt.get_fignums() == []
+    assert len(pickle.loads(pickled_fig).axes) == 2
+
+
 def test_multipage_plot_with_translation(tmpdir):
     # Github issue 61
     translator = BiopythonTranslator()
@@ -303,3 +904,53 @@ def test_legend():
     graphic_record = translator.translate_record(example_genbank)
     ax, _ = graphic_record.plot()
     graphic_record.plot_legend(ax=ax)
+
+
+def test_measure_text():
+    from dna_features_viewer.GraphicRecord.MatplotlibPlottableMixin import (
+        measure_text,
+    )
+
+    fig, ax = plt.subplots(1)
+    fontdict = {"fontsize": 11, "weight": "bold"}
+    text = ax.text(10, 10, "Gene 1 with\na long name", fontdict=fontdict)
+    bbox = text.get_window_extent(fig.canvas.get_renderer())
+    width, height = measure_text("Gene 1 with\na long name", fontdict, fig.dpi)
+    assert abs(width - bbox.width) < 1e-6
+    assert abs(height - bbox.height) < 1e-6
+
+    # The cached sizes must follow the default font set in the rcParams
+    with matplotlib.rc_context({"font.size": 20, "font.family": "monospace"}):
+        text = ax.text(10, 10, "Gene 1", fontdict={"weight": "bold"})
+        bbox = text.get_window_extent(fig.canvas.get_renderer())
+        width, _ = measure_text("Gene 1", {"weight": "bold"}, fig.dpi)
+        assert abs(width - bbox.width) < 1e-6
+    plt.close(fig)
+
+
+def test_plot_with_level_of_detail():
+    features = [
+        GraphicFeature(start=i, end=i + 5, strand=+1, label="small %d" % i)
+        for i in range(0, 100000, 10)
+    ] + [GraphicFeature(start=50000, end=70000, strand=+1, label="big")]
+    record = GraphicRecord(sequence_length=100000, features=features)
+    ax, _ = record.plot(figure_width=5, level_of_detail=True)
+    assert len(ax.patches) == 1
+    assert [t.get_text() for t in ax.texts] == ["big"]
+
+    # Zooming in brings back the small features
+    ax, _ = record.plot(figure_width=5, level_of_detail=True, x_lim=(0, 100))
+    assert len(ax.patches) == 11  # features starting at 0, 10, ..., 100
+
+    circular_record = CircularGraphicRecord(100000, features)
+    ax, _ = circular_record.plot(
+        figure_width=5, level_of_detail=True, batch_artists=False
+    )
+    assert len(ax.patches) == 3  # circle, density ring and big feature
+
+    # Features before the top_position are on the circle too
+    circular_record = CircularGraphicRecord(
+        2000, [GraphicFeature(start=100, end=300, label="A")], top_position=1000
+    )
+    ax, _ = circular_record.plot(figure_width=5, level_of_detail=1)
+    assert [t.get_text() for t in ax.texts] == ["A"]
@@ -1,7 +1,14 @@
+import random
 import textwrap
+import warnings
+
+from Bio.Seq import Seq
 from dna_features_viewer.biotools import (
+    complement,
     extract_graphical_translation,
     reverse_complement,
+    translate,
+    translate_six_frames,
     find_narrowest_text_wrap,
 )
 
@@ -15,6 +22,29 @@ def test_extract_graphical_translation():
     assert extract_graphical_translation(seq2, (4, 22, -1)) == "MDRTI*"[::-1]
 
 
+def test_kernels_same_as_biopython():
+    rng = random.Random(123)
+    for alphabet in ["ATGC", "ATGCatgc", "ATGCNRYKMSWBDHVnry"]:
+        sequence = "".join(rng.choice(alphabet) for _ in range(3001))
+        assert complement(sequence) == str(Seq(sequence).complement())
+        assert reverse_complement(sequence) == str(
+            Seq(sequence).reverse_complement()
+        )
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # partial codon warnings
+            assert translate(sequence) == str(Seq(sequence).translate())
+        frames = translate_six_frames(sequence)
+        reverse = str(Seq(sequence).reverse_complement())
+        for shift in range(3):
+            end = shift + 3 * ((len(sequence) - shift) // 3)
+            expected = str(Seq(sequence[shift:end]).translate())
+            assert frames[shift + 1] == expected
+            expected = str(Seq(reverse[shift:end]).translate())
+            assert frames[-shift - 1] == expected
+    assert translate("ATGTAA", long_form=True) == ["Met", "*"]
+    assert translate("atgNNNRAY") == str(Seq("atgNNNRAY").translate())
+
+
 def test_find_narrowest_text_wrap():
     text = "Chloramphenicol resistance marker"
     naive_wrap = textwrap.wrap(text, 30)
@@ -23,3 +53,25 @@ def test_find_narrowest_text_wrap():
     lines = narrow_wrap.split("\n")
     assert len(lines) == 2
     assert max(len(l) for l in lines) == 17
+
+
+def test_find_narrowest_text_wrap_same_as_exhaustive_search():
+    def exhaustive_search(text, max_line_length):
+        narrowest_wrap = textwrap.wrap(text, max_line_length)
+        narrowest_width = max([len(l) for l in narrowest_wrap])
+        for line_length in range(max_line_length - 1, 0, -1):
+            wrap = textwrap.wrap(text, line_length)
+            if len(wrap) > len(narrowest_wrap):
+                break
+            width = max([len(l) for l in wrap])
+            if width < narrowest_width:
+                narrowest_wrap, narrowest_width = wrap, width
+        return "\n".join(narrowest_wrap)
+
+    rng = random.Random(123)
+    words = ["AarI", "site", "Ampicillin-resistance", "lacZ-alpha", 20 * "x", "T7"]
+    for _ in range(200):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(1, 6)))
+        for max_line_length in range(1, 40):
+            expected = exhaustive_search(text, max_line_length)
+            assert find_narrowest_text_wrap(text, max_line_length) == expected
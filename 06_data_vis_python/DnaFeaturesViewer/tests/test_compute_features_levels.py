@@ -0,0 +1,111 @@
+import itertools
+import random
+from dna_features_viewer import GraphicFeature
+from dna_features_viewer.compute_features_levels import (
+    compute_features_levels,
+    find_overlapping_pairs,
+    Graph,
+    IncrementalLayout,
+)
+
+
+def random_features(n_features, rng):
+    features = []
+    for _ in range(n_features):
+        start = rng.randint(0, 100)
+        end = start + rng.choice([0, 1, 2, 5, 10, 40])
+        if rng.random() < 0.2:
+            start, end = end, start
+        features.append(GraphicFeature(start=start, end=end))
+    return features
+
+
+def test_find_overlapping_pairs():
+    rng = random.Random(123)
+    for _ in range(100):
+        features = random_features(rng.randint(0, 50), rng)
+        expected = [
+            (f1, f2)
+            for f1, f2 in itertools.combinations(features, 2)
+            if f1.overlaps_with(f2)
+        ]
+        pairs = [(id(f1), id(f2)) for f1, f2 in find_overlapping_pairs(features)]
+        assert sorted(pairs) == sorted([(id(f1), id(f2)) for f1, f2 in expected])
+
+
+def test_compute_features_levels_same_as_quadratic_graph():
+    rng = random.Random(123)
+    for _ in range(20):
+        features = random_features(50, rng)
+        edges = [
+            (f1, f2)
+            for f1, f2 in itertools.combinations(features, 2)
+            if f1.overlaps_with(f2)
+        ]
+        graph = Graph(features, edges)
+        levels = {f: None for f in features}
+        for node in sorted(features, key=lambda f: -f.length):
+            level = 0
+            while any(
+                abs(level - levels[n]) < 1
+                for n in graph.neighbors[node]
+                if levels[n] is not None
+            ):
+                level += 0.5
+            levels[node] = level
+        assert compute_features_levels(features) == levels
+
+
+def test_incremental_layout_same_as_full_recompute():
+    rng = random.Random(123)
+    for _ in range(20):
+        features = random_features(40, rng)
+        for feature in features:
+            if rng.random() < 0.2:
+                feature.data["nlines"] = rng.choice([1, 2, 3])
+            if rng.random() < 0.1:
+                feature.data["fixed_level"] = rng.choice([0, 1, 2.5])
+        current = features[:20]
+        layout = IncrementalLayout(current)
+        assert layout.levels == compute_features_levels(current)
+        for _ in range(40):
+            if (rng.random() < 0.5) and current:
+                feature = rng.choice(current)
+                current.remove(feature)
+                changed = layout.remove_feature(feature)
+            else:
+                feature = rng.choice(features)
+                if feature in layout:
+                    continue
+                current.append(feature)
+                changed = layout.add_feature(feature)
+            expected = compute_features_levels(current)
+            assert layout.levels == expected
+            assert all(expected[f] == level for f, level in changed.items())
+            assert layout.features == current
+
+
+def test_compute_features_levels_with_nlines_and_fixed_levels():
+    rng = random.Random(123)
+    for _ in range(20):
+        features = random_features(60, rng)
+        for feature in features:
+            if rng.random() < 0.3:
+                feature.data["nlines"] = rng.choice([1, 2, 3])
+            if rng.random() < 0.1:
+                feature.data["fixed_level"] = rng.choice([0, 1, 2.5, 4])
+        graph = Graph(features, find_overlapping_pairs(features))
+        levels = {f: f.data.get("fixed_level") for f in features}
+        for node in sorted(features, key=lambda f: -f.length):
+            if levels[node] is not None:
+                continue
+            level = 0
+            while any(
+                abs(level - levels[n])
+                < 0.5 * (node.data.get("nlines", 1) + n.data.get("nlines", 1))
+                for n in graph.neighbors[node]
+                if levels[n] is not None
+            ):
+                level += 0.5
+            levels[node] = level
+        assert compute_features_levels(features) == levels